@@ -0,0 +1,106 @@
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PlaylistCore import PlaylistJob, generate_playlist, scan_library
+from PlaylistWriter import DURABILITY_FILE, normalize_durability
+
+
+# Таблица и отсортированный порядок в процессе-воркере (только для чтения)
+_TABLE = None
+_ORDER = None
+
+
+def _init_worker(table, order):
+    """Инициализация воркера: таблица передается в процесс один раз, а не с каждым заданием"""
+    global _TABLE, _ORDER
+    _TABLE = table
+    _ORDER = order
+
+
+def _run_job(job, output_dir, date, iteration, duration, durability):
+    return generate_playlist(_TABLE, _ORDER, job, output_dir, date, iteration, duration, durability=durability)
+
+
+def run_batch(table, jobs, output_dir, workers=None, date=None, duration=None, durability=DURABILITY_FILE):
+    """Генерирует плейлисты для всех jobs по одной таблице в пуле процессов.
+
+    Таблица и отсортированный порядок считаются один раз и доступны воркерам
+    только для чтения. workers — число процессов (None — по числу ядер,
+    1 — без пула), durability — уровень fsync записи (none ускоряет большие
+    пакеты ценой надежности при сбое питания). Возвращает список PlaylistResult
+    в порядке jobs.
+    """
+    jobs = [job if isinstance(job, PlaylistJob) else PlaylistJob(**job) for job in jobs]
+    date = date or datetime.datetime.now()
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    order = table.sorted_order()
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(jobs)))
+
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(table, order)) as pool:
+                futures = [
+                    pool.submit(_run_job, job, output_dir, date, iteration, duration, durability)
+                    for iteration, job in enumerate(jobs)
+                ]
+                results = [future.result() for future in futures]
+        except (OSError, RuntimeError) as e:
+            print(f"[WARNING] Пул процессов недоступен ({e}), генерация в одном процессе")
+    if results is None:
+        results = [
+            generate_playlist(table, order, job, output_dir, date, iteration, duration, durability=durability)
+            for iteration, job in enumerate(jobs)
+        ]
+
+    report_batch(results, time.perf_counter() - started)
+    return results
+
+
+def report_batch(results, total_seconds):
+    """Печатает время каждого задания и общее время пакета"""
+    print(f"[DEBUG] ПАКЕТНАЯ ГЕНЕРАЦИЯ \n===================================================================")
+    for result in results:
+        status = f"ошибка: {result.error}" if result.error else ", ".join(map(os.path.basename, result.paths))
+        print(f" {result.name}: {result.seconds:.3f} с — {status}")
+    print(f" Заданий: {len(results)}, общее время: {total_seconds:.3f} с")
+    print("===================================================================")
+
+
+def main(argv=None):
+    """python BatchGenerator.py jobs.json — пакет из файла задания.
+
+    Формат файла: {"folders": [...], "output_dir": "...", "workers": null,
+    "with_durations": false, "durability": "file", "jobs": [{"name": "...", "seed": "...", ...}]}
+    Поля заданий — как у PlaylistJob.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage: BatchGenerator.py jobs.json")
+        return 2
+    with open(argv[0], 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    table, duration = scan_library(config["folders"], with_durations=config.get("with_durations", False))
+    print(f"[DEBUG] Треков в таблице: {len(table)}")
+    results = run_batch(
+        table, config["jobs"], config.get("output_dir", "."),
+        workers=config.get("workers"), duration=duration,
+        durability=normalize_durability(config.get("durability"))
+    )
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    # Нужно для пула процессов в собранном .exe
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,31 @@
+import os
+import sys
+
+
+# Папка программы в пользовательском каталоге кэша
+APP_FOLDER = "Playlist Generator"
+
+
+def cache_dir():
+    """Пользовательский каталог кэша: %LOCALAPPDATA%, ~/Library/Caches или $XDG_CACHE_HOME (~/.cache)"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_FOLDER)
+
+
+def cache_path(file_name):
+    """Путь к файлу кэша (индекс медиатеки, кэш длительностей); каталог создается при необходимости.
+
+    Если каталог создать нельзя, файл остается в текущей папке, как раньше.
+    """
+    folder = cache_dir()
+    try:
+        os.makedirs(folder, exist_ok=True)
+    except OSError as e:
+        print(f"[WARNING] Не удалось создать папку кэша {folder}: {e}")
+        return file_name
+    return os.path.join(folder, file_name)
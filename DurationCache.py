@@ -0,0 +1,77 @@
+import sqlite3
+
+from CacheDir import cache_path
+
+
+class DurationCache:
+    """Постоянный кэш длительностей медиафайлов в SQLite.
+
+    Запись считается актуальной, пока совпадают путь, размер и mtime файла.
+    Для нечитаемых файлов хранится NULL, чтобы не разбирать их при каждом запуске.
+    """
+
+    # Ограничение SQLite на число параметров в одном запросе
+    _BATCH = 500
+
+    def __init__(self, db_path=None):
+        # По умолчанию — в пользовательском каталоге кэша, а не в текущей папке
+        self.db_path = db_path or cache_path('duration_cache.db')
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        """Создает таблицу кэша, если её еще нет"""
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS durations (
+                        path TEXT PRIMARY KEY,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        duration REAL
+                    )
+                """)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Ошибка инициализации кэша длительностей {self.db_path}: {e}")
+
+    def lookup(self, records):
+        """Принимает (путь, размер, mtime_ns), возвращает найденные длительности и список промахов
+
+        Длительность None означает, что файл ранее не удалось прочитать.
+        """
+        cached = {}
+        with self._connect() as conn:
+            for start in range(0, len(records), self._BATCH):
+                paths = [record[0] for record in records[start:start + self._BATCH]]
+                placeholders = ",".join("?" * len(paths))
+                for path, size, mtime_ns, duration in conn.execute(
+                        f"SELECT path, size, mtime_ns, duration FROM durations WHERE path IN ({placeholders})",
+                        paths):
+                    cached[path] = (size, mtime_ns, duration)
+
+        found = {}
+        missing = []
+        for record in records:
+            path, size, mtime_ns = record[:3]
+            entry = cached.get(path)
+            if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+                found[path] = entry[2]
+            else:
+                missing.append(record)
+        return found, missing
+
+    def store(self, entries):
+        """Сохраняет (путь, размер, mtime_ns, длительность или None)"""
+        if not entries:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO durations (path, size, mtime_ns, duration) VALUES (?, ?, ?, ?)",
+                entries)
+
+    def clear(self):
+        """Полностью очищает кэш"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM durations")
@@ -0,0 +1,121 @@
+import hashlib
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(value, key):
+    """Раундовая функция: перемешивание splitmix64 половины блока с ключом раунда"""
+    z = (value + key) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class FeistelPermutation:
+    """Ленивая перестановка 0..n-1 на сети Фейстеля с циклическим обходом (cycle walking).
+
+    Ничего не хранит, кроме ключей раундов: permutation[k] (какой трек на позиции k)
+    и index(j) (где стоит трек j) считаются за O(1). Сеть переставляет блоки
+    из bits бит (2^bits < 2n), значения вне 0..n-1 прогоняются через сеть
+    повторно — в среднем не больше двух проходов. Реверс блоков по
+    reverse_step накладывается на номер позиции, тоже без материализации.
+    """
+
+    ROUNDS = 8
+
+    def __init__(self, seed, size, reverse_step=None, salt="feistel-v1"):
+        self.seed = str(seed)
+        self.size = size
+        self.reverse_step = reverse_step if reverse_step and reverse_step > 1 else None
+        self.salt = salt
+        self.bits = max(2, (size - 1).bit_length())
+        self.left_bits = self.bits // 2
+        self.right_bits = self.bits - self.left_bits
+        digest = hashlib.sha512(f"{salt}:{self.seed}".encode()).digest()
+        self.keys = [int.from_bytes(digest[i * 8:i * 8 + 8], 'little') for i in range(self.ROUNDS)]
+        # Маска раунда — разрядность левой половины, она чередуется от раунда к раунду
+        masks = [(1 << (self.left_bits if i % 2 == 0 else self.right_bits)) - 1 for i in range(self.ROUNDS)]
+        self._forward = list(zip(self.keys, masks))
+        self._backward = self._forward[::-1]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self.size
+        if not 0 <= position < self.size:
+            raise IndexError("position out of range")
+        value = self._encrypt(self._reverse(position))
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def __iter__(self):
+        for position in range(self.size):
+            yield self[position]
+
+    def index(self, track):
+        """Позиция трека track в перемешанном порядке (обратная перестановка)"""
+        if not 0 <= track < self.size:
+            raise ValueError(f"{track} is not in permutation")
+        value = self._decrypt(track)
+        while value >= self.size:
+            value = self._decrypt(value)
+        return self._reverse(value)
+
+    def with_reverse_step(self, reverse_step):
+        """Та же перестановка с реверсом блоков по reverse_step"""
+        return FeistelPermutation(self.seed, self.size, reverse_step, self.salt)
+
+    def view(self, items):
+        """Ленивое представление items в перемешанном порядке"""
+        return PermutedView(items, self)
+
+    def _reverse(self, position):
+        # Реверс блоков — инволюция: одна и та же формула в обе стороны
+        step = self.reverse_step
+        if not step:
+            return position
+        start = position - position % step
+        end = min(start + step, self.size)
+        return start + end - 1 - position
+
+    def _encrypt(self, value):
+        right_bits = self.right_bits
+        left, right = value >> right_bits, value & ((1 << right_bits) - 1)
+        for key, mask in self._forward:
+            # Несбалансированная сеть: половины меняются местами вместе с разрядностью
+            z = (right + key) & _MASK64
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+            left, right = right, left ^ ((z ^ (z >> 31)) & mask)
+        return left << right_bits | right
+
+    def _decrypt(self, value):
+        # Четное число раундов — разрядности половин на выходе те же, что на входе
+        right_bits = self.right_bits
+        left, right = value >> right_bits, value & ((1 << right_bits) - 1)
+        for key, mask in self._backward:
+            left, right = right ^ (_mix(left, key) & mask), left
+        return left << right_bits | right
+
+
+class PermutedView:
+    """items в порядке ленивой перестановки: индексация и повторный обход без копии списка"""
+
+    def __init__(self, items, permutation):
+        self.items = items
+        self.permutation = permutation
+
+    def __len__(self):
+        return len(self.permutation)
+
+    def __getitem__(self, position):
+        return self.items[self.permutation[position]]
+
+    def __iter__(self):
+        items = self.items
+        for track in self.permutation:
+            yield items[track]
@@ -0,0 +1,188 @@
+import os
+import sqlite3
+from pathlib import Path
+
+from CacheDir import cache_path
+from StageProfiler import count as profile_count
+
+
+# Поддерживаемые расширения медиафайлов
+AUDIO_EXTENSIONS = {
+    # Аудио
+    '.mp3', '.flac', '.ogg', '.wav', '.m4a', '.aac', '.wma', '.opus', '.aiff', '.aif', '.alac', '.dsf', '.dff', '.mka', '.ac3', '.dts',
+    # Видео
+    '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
+}
+
+
+class LibraryIndex:
+    """Постоянный индекс медиатеки в SQLite с инкрементальным пересканированием.
+
+    Для каждой папки хранится её mtime и порядок вложенных папок, для каждого
+    файла — путь, размер, mtime и расширение. При повторном сканировании
+    содержимое читается с диска только для папок, у которых изменился mtime,
+    остальные берутся из индекса. Порядок обхода совпадает с os.walk, поэтому
+    сиды, полученные до появления индекса, дают тот же результат.
+
+    Изменение файла «на месте» (без создания/удаления/переименования) не меняет
+    mtime папки, поэтому размер такого файла обновится только после изменения
+    самой папки или вызова clear(). Для длительностей LibraryScanner заново
+    вызывает stat для каждого файла, поэтому кэш длительностей так не устаревает.
+    """
+
+    def __init__(self, db_path=None):
+        # По умолчанию — в пользовательском каталоге кэша, а не в текущей папке
+        self.db_path = db_path or cache_path('library_index.db')
+        self._init_db()
+
+    def _connect(self):
+        # Отдельное соединение на каждый вызов — индекс можно использовать из любого потока
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        """Создает таблицы индекса, если их еще нет"""
+        try:
+            with self._connect() as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS dirs (
+                        path TEXT PRIMARY KEY,
+                        parent TEXT,
+                        seq INTEGER NOT NULL DEFAULT 0,
+                        mtime_ns INTEGER NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS dirs_parent ON dirs(parent);
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        dir TEXT NOT NULL,
+                        seq INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        ext TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+                """)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Ошибка инициализации индекса {self.db_path}: {e}")
+
+    def clear(self):
+        """Полностью очищает индекс"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM files")
+            conn.execute("DELETE FROM dirs")
+
+    def scan(self, folders):
+        """Обновляет индекс для папок и возвращает список (путь, размер, mtime_ns) в порядке os.walk"""
+        return list(self.iter_scan(folders))
+
+    def iter_scan(self, folders):
+        """Как scan(), но отдает записи по мере обхода папок"""
+        count = 0
+        rescanned = 0
+        visited = set()
+        with self._connect() as conn:
+            # Загружаем индекс папок целиком: mtime и дочерние папки
+            dir_mtimes = {}
+            children = {}
+            for path, parent, seq, mtime_ns in conn.execute(
+                    "SELECT path, parent, seq, mtime_ns FROM dirs ORDER BY parent, seq"):
+                dir_mtimes[path] = mtime_ns
+                children.setdefault(parent, []).append(path)
+
+            for folder in folders:
+                stack = [folder]
+                while stack:
+                    current = stack.pop()
+                    if current in visited:
+                        continue
+                    visited.add(current)
+                    try:
+                        profile_count("stat")
+                        mtime_ns = os.stat(current).st_mtime_ns
+                    except OSError as e:
+                        print(f"[WARNING] Папка недоступна {current}: {e}")
+                        self._forget_dir(conn, current)
+                        continue
+
+                    if dir_mtimes.get(current) == mtime_ns:
+                        # Папка не изменилась — берем содержимое из индекса
+                        subdirs = children.get(current, [])
+                        files = conn.execute(
+                            "SELECT path, size, mtime_ns FROM files WHERE dir = ? ORDER BY seq",
+                            (current,)).fetchall()
+                    else:
+                        rescanned += 1
+                        subdirs, files = self._rescan_dir(conn, current, mtime_ns, dir_mtimes.get(current) is None)
+
+                    count += len(files)
+                    yield from files
+                    # Обратный порядок, чтобы обход шел как в os.walk (сверху вниз)
+                    stack.extend(reversed(subdirs))
+
+        print(f"[DEBUG] Индекс медиатеки: папок {len(visited)}, пересканировано {rescanned}, файлов {count}")
+
+    def _rescan_dir(self, conn, path, mtime_ns, is_new):
+        """Читает одну папку с диска и обновляет её записи в индексе"""
+        subdirs = []
+        files = []
+        try:
+            profile_count("scandir")
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"[WARNING] Ошибка чтения папки {path}: {e}")
+            entries = []
+
+        stats = 0
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Как os.walk(followlinks=False): символические ссылки на папки не обходим
+                if not entry.is_symlink():
+                    subdirs.append(os.path.join(path, entry.name))
+                continue
+            ext = Path(entry.name).suffix.lower()
+            if ext not in AUDIO_EXTENSIONS:
+                continue
+            stats += 1
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # Битая ссылка или нет доступа
+            files.append((os.path.join(path, entry.name), st.st_size, st.st_mtime_ns, ext))
+
+        profile_count("stat", stats)
+
+        if not is_new:
+            # Удаляем исчезнувшие вложенные папки вместе с их содержимым
+            old_subdirs = {row[0] for row in conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))}
+            for gone in old_subdirs.difference(subdirs):
+                self._forget_dir(conn, gone)
+            conn.execute("DELETE FROM files WHERE dir = ?", (path,))
+
+        conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, parent, seq, mtime_ns) VALUES (?, ?, "
+            "COALESCE((SELECT seq FROM dirs WHERE path = ?), 0), ?)",
+            (path, os.path.dirname(path), path, mtime_ns))
+        # Вложенные папки заносим с -1: при первом заходе в них mtime обновится
+        for seq, subdir in enumerate(subdirs):
+            conn.execute(
+                "INSERT INTO dirs (path, parent, seq, mtime_ns) VALUES (?, ?, ?, -1) "
+                "ON CONFLICT(path) DO UPDATE SET parent = excluded.parent, seq = excluded.seq",
+                (subdir, path, seq))
+        conn.executemany(
+            "INSERT OR REPLACE INTO files (path, dir, seq, size, mtime_ns, ext) VALUES (?, ?, ?, ?, ?, ?)",
+            [(file_path, path, seq, size, mtime, ext) for seq, (file_path, size, mtime, ext) in enumerate(files)])
+
+        return subdirs, [(file_path, size, mtime) for file_path, size, mtime, _ in files]
+
+    def _forget_dir(self, conn, path):
+        """Удаляет папку и всё её поддерево из индекса"""
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            stack.extend(row[0] for row in conn.execute("SELECT path FROM dirs WHERE parent = ?", (current,)))
+            conn.execute("DELETE FROM files WHERE dir = ?", (current,))
+            conn.execute("DELETE FROM dirs WHERE path = ?", (current,))
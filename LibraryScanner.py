@@ -0,0 +1,147 @@
+import itertools
+import os
+import sqlite3
+from collections import namedtuple
+
+from MetadataProbe import MIN_PARALLEL_FILES, create_pool, probe_durations
+from StageProfiler import count as profile_count
+
+
+# Одна запись на трек: путь, размер, mtime и длительность (None — неизвестна/нечитаема)
+TrackRecord = namedtuple("TrackRecord", ["path", "size", "mtime_ns", "duration"])
+
+
+class ScanCancelled(Exception):
+    """Сканирование прервано пользователем"""
+
+
+class LibraryScanner:
+    """Однопроходный сканер медиатеки.
+
+    Один обход через индекс (os.scandir + stat из DirEntry) дает всё, что раньше
+    собиралось тремя отдельными обходами: список файлов, их размеры для сида и,
+    по запросу, длительности — из кэша или параллельным чтением через mutagen.
+
+    progress(done, total) вызывается из потока сканирования; total=None, пока
+    общее число файлов неизвестно. Установленный cancel_event прерывает обход
+    исключением ScanCancelled, изменения индекса при этом не сохраняются.
+    """
+
+    # Размер пачки для поиска в кэше и параллельного чтения длительностей
+    BATCH_SIZE = 1024
+    # Как часто сообщать о прогрессе при обходе папок
+    PROGRESS_STEP = 256
+
+    def __init__(self, library_index, duration_cache, probe_workers=None, probe_executor="process"):
+        self.library_index = library_index
+        self.duration_cache = duration_cache
+        self.probe_workers = probe_workers
+        self.probe_executor = probe_executor
+
+    def scan(self, folders, with_durations=False, progress=None, cancel_event=None, probe=True):
+        """Генератор TrackRecord в порядке обхода папок.
+
+        probe=False — длительности только из кэша, файлы не читаются (промахи — None).
+        """
+        records = self._iter_index(folders, progress, cancel_event)
+        if not with_durations:
+            for path, size, mtime_ns in records:
+                yield TrackRecord(path, size, mtime_ns, None)
+            return
+
+        if not probe:
+            # Без чтения файлов обход остается потоковым: кэш опрашивается пачками
+            while batch := list(itertools.islice(records, self.BATCH_SIZE)):
+                batch = self._restat(batch)
+                durations, _ = self._lookup_cached(batch)
+                for path, size, mtime_ns in batch:
+                    yield TrackRecord(path, size, mtime_ns, durations.get(path))
+            return
+
+        # Для длительностей сначала собираем список — так известен общий объем для прогресса
+        records = list(records)
+        total = len(records)
+        pool = None
+        try:
+            for start in range(0, total, self.BATCH_SIZE):
+                self._check_cancel(cancel_event)
+                batch = records[start:start + self.BATCH_SIZE]
+                batch, pool = self._with_durations(batch, pool)
+                yield from batch
+                if progress:
+                    progress(start + len(batch), total)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def _iter_index(self, folders, progress, cancel_event):
+        """Обход индекса с проверкой отмены и отчетом о прогрессе"""
+        records = self.library_index.iter_scan(folders)
+        try:
+            for count, record in enumerate(records, 1):
+                self._check_cancel(cancel_event)
+                if progress and count % self.PROGRESS_STEP == 0:
+                    progress(count, None)
+                yield record
+        finally:
+            # Закрываем обход явно: незавершенное сканирование откатывает изменения индекса
+            records.close()
+
+    def _check_cancel(self, cancel_event):
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+
+    def _restat(self, batch):
+        """Свежие размер и mtime файлов пачки.
+
+        Перекодирование файла на месте не меняет mtime папки, и индекс отдает старые
+        значения — по ним кэш вернул бы прежнюю длительность. Исчезнувший файл
+        остается с данными индекса: его чтение даст None.
+        """
+        profile_count("stat", len(batch))
+        records = []
+        for record in batch:
+            try:
+                st = os.stat(record[0])
+            except OSError:
+                records.append(record)
+            else:
+                records.append((record[0], st.st_size, st.st_mtime_ns))
+        return records
+
+    def _lookup_cached(self, batch):
+        """Длительности пачки из кэша и список промахов; недоступный кэш — всё промахи"""
+        try:
+            return self.duration_cache.lookup(batch)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Кэш длительностей недоступен: {e}")
+            return {}, batch
+
+    def _with_durations(self, batch, pool):
+        """Дополняет пачку записей длительностями: кэш, затем чтение промахов"""
+        batch = self._restat(batch)
+        durations, missing = self._lookup_cached(batch)
+
+        if missing:
+            print(f"[DEBUG] Длительности из кэша: {len(durations)}, требуют чтения: {len(missing)}")
+            if pool is None and len(missing) >= MIN_PARALLEL_FILES:
+                # Пул создается один раз на всё сканирование
+                pool = create_pool(self.probe_workers, self.probe_executor)
+            probed, _ = probe_durations(
+                [path for path, _, _ in missing],
+                workers=self.probe_workers,
+                executor=self.probe_executor,
+                pool=pool
+            )
+            new_entries = []
+            for (path, size, mtime_ns), duration in zip(missing, probed):
+                # Нечитаемые файлы тоже запоминаем (None), чтобы не разбирать их повторно
+                new_entries.append((path, size, mtime_ns, duration))
+                durations[path] = duration
+            try:
+                self.duration_cache.store(new_entries)
+            except sqlite3.Error as e:
+                print(f"[WARNING] Не удалось сохранить кэш длительностей: {e}")
+
+        records = [TrackRecord(path, size, mtime_ns, durations.get(path)) for path, size, mtime_ns in batch]
+        return records, pool
@@ -85,7 +85,8 @@ class Localization:
                 "error_adding_tracks": "Error adding tracks",
                 "editor_seed_info_intensity_step": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps} \nReverse step: {step}",
                 "editor_seed_info_intensity": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps}",
-                "total_duration": "Total duration: {duration}"
+                "total_duration": "Total duration: {duration}",
+                "scan_cancelled": "Scanning cancelled"
             },
             "ru-ru": {
                 "window_title_generator": "Генератор плейлистов",
@@ -166,7 +167,8 @@ class Localization:
                 "error_adding_tracks": "Ошибка при добавлении треков",
                 "editor_seed_info_intensity_step": "Перемешано!\nСид: {seed} \nПрименено перестановок: {num_swaps} \nРеверс: {step}",
                 "editor_seed_info_intensity": "Перемешано!\nСид: {seed} \nПрименено перестановок: {num_swaps}",
-                "total_duration": "Общая продолжительность: {duration}"
+                "total_duration": "Общая продолжительность: {duration}",
+                "scan_cancelled": "Сканирование отменено"
             },
             "es-es": {
                 "window_title_generator": "Generador de listas de reproducción",
@@ -247,7 +249,8 @@ class Localization:
                 "error_adding_tracks": "Error al agregar pistas",
                 "editor_seed_info_intensity_step": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps} \nPaso inverso: {step}",
                 "editor_seed_info_intensity": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps}",
-                "total_duration": "Duración total: {duration}"
+                "total_duration": "Duración total: {duration}",
+                "scan_cancelled": "Escaneo cancelado"
             },
             "fr-fr": {
                 "window_title_generator": "Générateur de playlists",
@@ -328,7 +331,8 @@ class Localization:
                 "error_adding_tracks": "Erreur lors de l'ajout de pistes",
                 "editor_seed_info_intensity_step": "Mélangé!\nGraine: {seed} \nÉchanges appliqués: {num_swaps} \nÉtape inverse: {step}",
                 "editor_seed_info_intensity": "Mélangé!\nGraine: {seed} \nÉchanges appliqués: {num_swaps}",
-                "total_duration": "Durée totale: {duration}"
+                "total_duration": "Durée totale: {duration}",
+                "scan_cancelled": "Analyse annulée"
             },
             "de-de": {
 				"window_title_generator": "Playlist-Generator",
@@ -409,7 +413,8 @@ class Localization:
                 "error_adding_tracks": "Fehler beim Hinzufügen von Tracks",
                 "editor_seed_info_intensity_step": "Gemischt!\nSeed: {seed} \nAngewandte Tausche: {num_swaps} \nRückwärtsschritt: {step}",
                 "editor_seed_info_intensity": "Gemischt!\nSeed: {seed} \nVertauschungen: {num_swaps}",
-                "total_duration": "Gesamtdauer: {duration}"
+                "total_duration": "Gesamtdauer: {duration}",
+                "scan_cancelled": "Scan abgebrochen"
             },
             "it-it": {
                 "window_title_generator": "Generatore di Playlist",
@@ -490,7 +495,8 @@ class Localization:
                 "error_adding_tracks": "Errore durante l'aggiunta dei brani",
                 "editor_seed_info_intensity_step": "Mescolato!\nSeme: {seed} \nScambi applicati: {num_swaps} \nPasso inverso: {step}",
                 "editor_seed_info_intensity": "Mescolato!\nSeme: {seed} \nScambi applicati: {num_swaps}",
-                "total_duration": "Durata totale: {duration}"
+                "total_duration": "Durata totale: {duration}",
+                "scan_cancelled": "Scansione annullata"
             },
             "pl-pl": {
                 "window_title_generator": "Generator playlist",
@@ -571,7 +577,8 @@ class Localization:
                 "error_adding_tracks": "Błąd podczas dodawania utworów",
                 "editor_seed_info_intensity_step": "Przetasowane!\nZiarno: {seed} \nZastosowane zamiany: {num_swaps} \nKrok wsteczny: {step}",
                 "editor_seed_info_intensity": "Przetasowane!\nZiarno: {seed} \nZastosowane zamiany: {num_swaps}",
-                "total_duration": "Całkowity czas trwania: {duration}"
+                "total_duration": "Całkowity czas trwania: {duration}",
+                "scan_cancelled": "Skanowanie anulowane"
             },
             "tr-tr": {
                 "window_title_generator": "Çalma Listesi Oluşturucu",
@@ -652,7 +659,8 @@ class Localization:
                 "error_adding_tracks": "Parça eklenirken hata oluştu",
                 "editor_seed_info_intensity_step": "Karıştırıldı!\nTohum: {seed} \nUygulanan takaslar: {num_swaps} \nTers adım: {step}",
                 "editor_seed_info_intensity": "Karıştırıldı!\nTohum: {seed} \nUygulanan takaslar: {num_swaps}",
-                "total_duration": "Toplam süre: {duration}"
+                "total_duration": "Toplam süre: {duration}",
+                "scan_cancelled": "Tarama iptal edildi"
             },
             "be-by": {
                 "window_title_generator": "Генератар плэйлістаў",
@@ -733,7 +741,8 @@ class Localization:
                 "error_adding_tracks": "Памылка пры даданні трэкаў",
                 "editor_seed_info_intensity_step": "Перамешана!\nСід: {seed} \nПрыменена перастановак: {num_swaps} \nАдваротны крок: {step}",
                 "editor_seed_info_intensity": "Перамешана!\nСід: {seed} \nАбменаў прыменена: {num_swaps}",
-                "total_duration": "Агульная працягласць: {duration}"
+                "total_duration": "Агульная працягласць: {duration}",
+                "scan_cancelled": "Сканаванне скасавана"
             },
               "uk-ua": {
                 "window_title_generator": "Генератор плейлистів",
@@ -814,7 +823,8 @@ class Localization:
                 "error_adding_tracks": "Помилка при додаванні треків",
                 "editor_seed_info_intensity_step": "Перемішано!\nСід: {seed} \nЗастосовано перестановок: {num_swaps} \nЗворотній крок: {step}",
                 "editor_seed_info_intensity": "Перемішано!\nНасіння: {seed} \nЗмін застосовано: {num_swaps}",
-                "total_duration": "Загальна тривалість: {duration}"
+                "total_duration": "Загальна тривалість: {duration}",
+                "scan_cancelled": "Сканування скасовано"
             },
             "kk-kz": {
                 "window_title_generator": "Плейлист генераторы",
@@ -895,7 +905,8 @@ class Localization:
                 "error_adding_tracks": "Тректерді қосу кезіндегі қате",
                 "editor_seed_info_intensity_step": "Араластырылды!\nТұқым: {seed} \nҚолданылған ауыстырулар: {num_swaps} \nКері қадам: {step}",
                 "editor_seed_info_intensity": "Араластырылды!\nТұқым: {seed} \nАуыстырулар саны: {num_swaps}",
-                "total_duration": "Жалпы ұзақтығы: {duration}"
+                "total_duration": "Жалпы ұзақтығы: {duration}",
+                "scan_cancelled": "Сканерлеу тоқтатылды"
             },
             "sr-rs": {
                 "window_title_generator": "Генератор плејлиста",
@@ -976,7 +987,8 @@ class Localization:
                 "error_adding_tracks": "Грешка при додавању нумера",
                 "editor_seed_info_intensity_step": "Измешано!\nСеме: {seed} \nПримењене замене: {num_swaps} \nОбратни корак: {step}",
                 "editor_seed_info_intensity": "Izmešano!\nSeme: {seed} \nPrimenjene zamene: {num_swaps}",
-                "total_duration": "Укупно трајање: {duration}"
+                "total_duration": "Укупно трајање: {duration}",
+                "scan_cancelled": "Скенирање је отказано"
             },
             "nl-nl": {
                 "window_title_generator": "Afspeellijst Generator",
@@ -1057,7 +1069,8 @@ class Localization:
                 "error_adding_tracks": "Fout bij toevoegen van nummers",
                 "editor_seed_info_intensity_step": "Geschud!\nZaad: {seed} \nToegepaste swaps: {num_swaps} \nTerugstap: {step}",
                 "editor_seed_info_intensity": "Geschud!\nSeed: {seed} \nToegepaste swaps: {num_swaps}",
-                "total_duration": "Totale duur: {duration}"
+                "total_duration": "Totale duur: {duration}",
+                "scan_cancelled": "Scannen geannuleerd"
             },
             "es-mx": {
                 "window_title_generator": "Generador de listas de reproducción",
@@ -1138,7 +1151,8 @@ class Localization:
                 "error_adding_tracks": "Error al agregar pistas",
                 "editor_seed_info_intensity_step": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps} \nPaso inverso: {step}",
                 "editor_seed_info_intensity": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps}",
-                "total_duration": "Duración total: {duration}"
+                "total_duration": "Duración total: {duration}",
+                "scan_cancelled": "Escaneo cancelado"
             },
             "pt-pt": {
                 "window_title_generator": "Gerador de Playlists",
@@ -1219,7 +1233,8 @@ class Localization:
                 "error_adding_tracks": "Erro ao adicionar faixas",
                 "editor_seed_info_intensity_step": "Embaralhado!\nSemente: {seed} \nTrocas aplicadas: {num_swaps} \nPasso inverso: {step}",
                 "editor_seed_info_intensity": "Embaralhado!\nSemente: {seed} \nTrocas aplicadas: {num_swaps}",
-                "total_duration": "Duração total: {duration}"
+                "total_duration": "Duração total: {duration}",
+                "scan_cancelled": "Análise cancelada"
             },
             "pt-br": {
                 "window_title_generator": "Gerador de Playlists",
@@ -1300,7 +1315,8 @@ class Localization:
                 "error_adding_tracks": "Erro ao adicionar faixas",
                 "editor_seed_info_intensity_step": "Embaralhado!\nSemente: {seed} \nTrocas aplicadas: {num_swaps} \nPasso reverso: {step}",
                 "editor_seed_info_intensity": "Embaralhado!\nSemente: {seed} \nTrocas aplicadas: {num_swaps}",
-                "total_duration": "Duração total: {duration}"
+                "total_duration": "Duração total: {duration}",
+                "scan_cancelled": "Verificação cancelada"
             },
             "zh-cn": {
                 "window_title_generator": "播放列表生成器",
@@ -1381,7 +1397,8 @@ class Localization:
                 "error_adding_tracks": "添加曲目时出错",
                 "editor_seed_info_intensity_step": "已洗牌!\n种子: {seed} \n应用交换: {num_swaps} \n反向步骤: {step}",
                 "editor_seed_info_intensity": "已洗牌!\n种子: {seed} \n应用交换: {num_swaps}",
-                "total_duration": "总时长: {duration}"
+                "total_duration": "总时长: {duration}",
+                "scan_cancelled": "扫描已取消"
             },
             "ko-kr": {
                 "window_title_generator": "플레이리스트 생성기",
@@ -1462,7 +1479,8 @@ class Localization:
                 "error_adding_tracks": "트랙 추가 중 오류 발생",
                 "editor_seed_info_intensity_step": "셔플됨!\n시드: {seed} \n적용된 교환: {num_swaps} \n역방향 단계: {step}",
                 "editor_seed_info_intensity": "셔플됨!\n시드: {seed} \n적용된 교환: {num_swaps}",
-                "total_duration": "총 재생 시간: {duration}"
+                "total_duration": "총 재생 시간: {duration}",
+                "scan_cancelled": "검색이 취소되었습니다"
             },
             "sl-si": {
                 "window_title_generator": "Generator seznamov predvajanja",
@@ -1543,7 +1561,8 @@ class Localization:
                 "error_adding_tracks": "Napaka pri dodajanju skladb",
                 "editor_seed_info_intensity_step": "Premešano!\nSeme: {seed} \nUporabljene zamenjave: {num_swaps} \nPovratni korak: {step}",
                 "editor_seed_info_intensity": "Premešano!\nSeme: {seed} \nUporabljene zamenjave: {num_swaps}",
-                "total_duration": "Skupni trajanje: {duration}"
+                "total_duration": "Skupni trajanje: {duration}",
+                "scan_cancelled": "Pregledovanje preklicano"
             },
             "sq-al": {
                 "window_title_generator": "Gjenerues i Listave të Këngëve",
@@ -1624,7 +1643,8 @@ class Localization:
                 "error_adding_tracks": "Gabim gjatë shtimit të këngëve",
                 "editor_seed_info_intensity_step": "Përzierë!\nFarë: {seed} \nShkëmbime të aplikuara: {num_swaps} \nHapi i kundërt: {step}",
                 "editor_seed_info_intensity": "Përzierë!\nFarë: {seed} \nShkëmbime të aplikuara: {num_swaps}",
-                "total_duration": "Kohëzgjatja totale: {duration}"
+                "total_duration": "Kohëzgjatja totale: {duration}",
+                "scan_cancelled": "Skanimi u anulua"
             },
             "hr-hr": {
                 "window_title_generator": "Generator playlisti",
@@ -1705,7 +1725,8 @@ class Localization:
                 "error_adding_tracks": "Greška pri dodavanju pjesama",
                 "editor_seed_info_intensity_step": "Promiješano!\nSjeme: {seed} \nPrimijenjene zamjene: {num_swaps} \nObrnuti korak: {step}",
                 "editor_seed_info_intensity": "Promiješano!\nSjeme: {seed} \nPrimijenjene zamjene: {num_swaps}",
-                "total_duration": "Ukupno trajanje: {duration}"
+                "total_duration": "Ukupno trajanje: {duration}",
+                "scan_cancelled": "Skeniranje otkazano"
             },
             "hu-hu": {
                 "window_title_generator": "Lejátszási lista generátor",
@@ -1786,7 +1807,8 @@ class Localization:
                 "error_adding_tracks": "Hiba a zeneszámok hozzáadásakor",
                 "editor_seed_info_intensity_step": "Megkeverve!\nMag: {seed} \nAlkalmazott cserék: {num_swaps} \nFordított lépés: {step}",
                 "editor_seed_info_intensity": "Keverve!\nMag: {seed} \nAlkalmazott cserék: {num_swaps}",
-                "total_duration": "Teljes időtartam: {duration}"
+                "total_duration": "Teljes időtartam: {duration}",
+                "scan_cancelled": "Beolvasás megszakítva"
             },
             "ro-ro": {
                 "window_title_generator": "Generator de playlist-uri",
@@ -1867,7 +1889,8 @@ class Localization:
                 "error_adding_tracks": "Eroare la adăugarea pieselor",
                 "editor_seed_info_intensity_step": "Amestecat!\nSămânță: {seed} \nSchimburi aplicate: {num_swaps} \nPas invers: {step}",
                 "editor_seed_info_intensity": "Amestecat!\nSămânță: {seed} \nSchimburi aplicate: {num_swaps}",
-                "total_duration": "Durată totală: {duration}"
+                "total_duration": "Durată totală: {duration}",
+                "scan_cancelled": "Scanare anulată"
             },
             "cs-cz": {
                 "window_title_generator": "Generátor playlistů",
@@ -1948,7 +1971,8 @@ class Localization:
                 "error_adding_tracks": "Chyba při přidávání skladeb",
                 "editor_seed_info_intensity_step": "Zamícháno!\nSemínko: {seed} \nPoužité prohození: {num_swaps} \nReverzní krok: {step}",
                 "editor_seed_info_intensity": "Zamícháno!\nSemínko: {seed} \nProhození aplikováno: {num_swaps}",
-                "total_duration": "Celková doba trvání: {duration}"
+                "total_duration": "Celková doba trvání: {duration}",
+                "scan_cancelled": "Prohledávání zrušeno"
             },
             "nl-be": {
                 "window_title_generator": "Afspeellijst Generator",
@@ -2029,7 +2053,8 @@ class Localization:
                 "error_adding_tracks": "Fout bij toevoegen van nummers",
                 "editor_seed_info_intensity_step": "Geschud!\nZaad: {seed} \nToegepaste swaps: {num_swaps} \nTerugstap: {step}",
                 "editor_seed_info_intensity": "Geschud!\nSeed: {seed} \nToegepaste swaps: {num_swaps}",
-                "total_duration": "Totale duur: {duration}"
+                "total_duration": "Totale duur: {duration}",
+                "scan_cancelled": "Scannen geannuleerd"
             },
             "fr-be": {
                 "window_title_generator": "Générateur de Playlist",
@@ -2110,7 +2135,8 @@ class Localization:
                 "error_adding_tracks": "Erreur lors de l'ajout de pistes",
                 "editor_seed_info_intensity_step": "Mélangé!\nGraine: {seed} \nÉchanges appliqués: {num_swaps} \nÉtape inverse: {step}",
                 "editor_seed_info_intensity": "Mélangé!\nGraine: {seed} \nÉchanges appliqués: {num_swaps}",
-                "total_duration": "Durée totale: {duration}"
+                "total_duration": "Durée totale: {duration}",
+                "scan_cancelled": "Analyse annulée"
             },
             "de-be": {
                 "window_title_generator": "Playlist Generator",
@@ -2191,7 +2217,8 @@ class Localization:
                 "error_adding_tracks": "Fehler beim Hinzufügen von Tracks",
                 "editor_seed_info_intensity_step": "Gemisch!\nSamen: {seed} \nAngewandte Tausche: {num_swaps} \nRückwärtsschritt: {step}",
                 "editor_seed_info_intensity": "Gemisch!\nSeed: {seed} \nVertauschungen: {num_swaps}",
-                "total_duration": "Gesamtdauer: {duration}"
+                "total_duration": "Gesamtdauer: {duration}",
+                "scan_cancelled": "Scan abgebrochen"
             },
             "ga-ie": {
                 "window_title_generator": "Gineadóir Liosta Ealaíon",
@@ -2272,7 +2299,8 @@ class Localization:
                 "error_adding_tracks": "Earráid agus rianta á gcur leis",
                 "editor_seed_info_intensity_step": "Measctha!\nSíol: {seed} \nMalartuithe curtha i bhfeidhm: {num_swaps} \nCéim chúl: {step}",
                 "editor_seed_info_intensity": "Measctha!\nSíol: {seed} \nMalartuithe curtha i bhfeidhm: {num_swaps}",
-                "total_duration": "Fad iomlán: {duration}"
+                "total_duration": "Fad iomlán: {duration}",
+                "scan_cancelled": "Cealaíodh an scanadh"
             },
             "is-is": {
                 "window_title_generator": "Spilunarlisti Generator",
@@ -2353,7 +2381,8 @@ class Localization:
                 "error_adding_tracks": "Villa við að bæta við lögum",
                 "editor_seed_info_intensity_step": "Stokkað!\nFræ: {seed} \nNotaðir skiptingar: {num_swaps} \nBakfæra skref: {step}",
                 "editor_seed_info_intensity": "Stokkað!\nFræ: {seed} \nViðskipti notuð: {num_swaps}",
-                "total_duration": "Heildartími: {duration}"
+                "total_duration": "Heildartími: {duration}",
+                "scan_cancelled": "Hætt við skönnun"
             },
             "et-ee": {
                 "window_title_generator": "Esitusloendite Generaator",
@@ -2434,7 +2463,8 @@ class Localization:
                 "error_adding_tracks": "Viga lugude lisamisel",
                 "editor_seed_info_intensity_step": "Segatud!\nSeeme: {seed} \nRakendatud vahetused: {num_swaps} \nTagurpidi samm: {step}",
                 "editor_seed_info_intensity": "Segatud!\nSeeme: {seed} \nRakendatud vahetused: {num_swaps}",
-                "total_duration": "Kogukestus: {duration}"
+                "total_duration": "Kogukestus: {duration}",
+                "scan_cancelled": "Skannimine katkestati"
             },
             "nb-no": {
                 "window_title_generator": "Spilleliste-generator",
@@ -2515,7 +2545,8 @@ class Localization:
                 "error_adding_tracks": "Feil ved tilføying av spor",
                 "editor_seed_info_intensity_step": "Blandet!\nFrø: {seed} \nBrukte bytter: {num_swaps} \nOmvendt steg: {step}",
                 "editor_seed_info_intensity": "Blandet!\nFrø: {seed} \nBytter utført: {num_swaps}",
-                "total_duration": "Total varighet: {duration}"
+                "total_duration": "Total varighet: {duration}",
+                "scan_cancelled": "Skanning avbrutt"
             },
             "es-cl": {
                 "window_title_generator": "Generador de Listas de Reproducción",
@@ -2596,7 +2627,8 @@ class Localization:
                 "error_adding_tracks": "Error al agregar pistas",
                 "editor_seed_info_intensity_step": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps} \nPaso inverso: {step}",
                 "editor_seed_info_intensity": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps}",
-                "total_duration": "Duración total: {duration}"
+                "total_duration": "Duración total: {duration}",
+                "scan_cancelled": "Escaneo cancelado"
             },
             "es-ar": {
                 "window_title_generator": "Generador de listas de reproducción",
@@ -2677,7 +2709,8 @@ class Localization:
                 "error_adding_tracks": "Error al agregar pistas",
                 "editor_seed_info_intensity_step": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps} \nPaso inverso: {step}",
                 "editor_seed_info_intensity": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps}",
-                "total_duration": "Duración total: {duration}"
+                "total_duration": "Duración total: {duration}",
+                "scan_cancelled": "Escaneo cancelado"
             },
             "es-bo": {
                 "window_title_generator": "Generador de Listas de Reproducción",
@@ -2758,7 +2791,8 @@ class Localization:
                 "error_adding_tracks": "Error al agregar pistas",
                 "editor_seed_info_intensity_step": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps} \nPaso inverso: {step}",
                 "editor_seed_info_intensity": "¡Mezclado!\nSemilla: {seed} \nIntercambios aplicados: {num_swaps}",
-                "total_duration": "Duración total: {duration}"
+                "total_duration": "Duración total: {duration}",
+                "scan_cancelled": "Escaneo cancelado"
             },
             "hi-in": {
                 "window_title_generator": "प्लेलिस्ट जनरेटर",
@@ -2839,7 +2873,8 @@ class Localization:
                 "error_adding_tracks": "ट्रैक जोड़ने में त्रुटि",
                 "editor_seed_info_intensity_step": "फेंटा गया!\nबीज: {seed} \nलागू की गई अदला-बदली: {num_swaps} \nउल्टा कदम: {step}",
                 "editor_seed_info_intensity": "फेंटा गया!\nबीज: {seed} \nलागू स्वैप: {num_swaps}",
-                "total_duration": "कुल अवधि: {duration}"
+                "total_duration": "कुल अवधि: {duration}",
+                "scan_cancelled": "स्कैन रद्द किया गया"
             },
             "en-au": {
                 "window_title_generator": "Playlist Generator",
@@ -2920,7 +2955,8 @@ class Localization:
                 "error_adding_tracks": "Error adding tracks",
                 "editor_seed_info_intensity_step": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps} \nReverse step: {step}",
                 "editor_seed_info_intensity": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps}",
-                "total_duration": "Total duration: {duration}"
+                "total_duration": "Total duration: {duration}",
+                "scan_cancelled": "Scanning cancelled"
             },
             "en-ca": {
                 "window_title_generator": "Playlist Generator",
@@ -3001,7 +3037,8 @@ class Localization:
                 "error_adding_tracks": "Error adding tracks",
                 "editor_seed_info_intensity_step": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps} \nReverse step: {step}",
                 "editor_seed_info_intensity": "Shuffled!\nSeed: {seed} \nSwaps applied: {num_swaps}",
-                "total_duration": "Total duration: {duration}"
+                "total_duration": "Total duration: {duration}",
+                "scan_cancelled": "Scanning canceled"
             },
             "ja-jp": {
                 "window_title_generator": "プレイリスト生成ツール",
@@ -3082,7 +3119,8 @@ class Localization:
                 "error_adding_tracks": "トラックの追加中にエラーが発生しました",
                 "editor_seed_info_intensity_step": "シャッフルされました!\nシード: {seed} \n適用された交換: {num_swaps} \n逆ステップ: {step}",
                 "editor_seed_info_intensity": "シャッフルされました！\nシード: {seed} \n適用された交換: {num_swaps}",
-                "total_duration": "合計時間: {duration}"
+                "total_duration": "合計時間: {duration}",
+                "scan_cancelled": "スキャンを中止しました"
             },
             "da-dk": {
                 "window_title_generator": "Playlist Generator",
@@ -3163,7 +3201,8 @@ class Localization:
                 "error_adding_tracks": "Fejl ved tilføjelse af spor",
                 "editor_seed_info_intensity_step": "Blandet!\nFrø: {seed} \nAnvendte bytter: {num_swaps} \nOmvendt trin: {step}",
                 "editor_seed_info_intensity": "Blandet!\nFrø: {seed} \nAnvendte byt: {num_swaps}",
-                "total_duration": "Samlet varighed: {duration}"
+                "total_duration": "Samlet varighed: {duration}",
+                "scan_cancelled": "Scanning annulleret"
             },
             "sv-se": {
                 "window_title_generator": "Spellista Generator",
@@ -3244,7 +3283,8 @@ class Localization:
                 "error_adding_tracks": "Fel vid tillägg av spår",
                 "editor_seed_info_intensity_step": "Blandad!\nFrö: {seed} \nTillämpade byten: {num_swaps} \nOmvänd steg: {step}",
                 "editor_seed_info_intensity": "Blandad!\nFrö: {seed} \nTillämpade byten: {num_swaps}",
-                "total_duration": "Total varaktighet: {duration}"
+                "total_duration": "Total varaktighet: {duration}",
+                "scan_cancelled": "Genomsökning avbruten"
             },
             "fi-fi": {
                 "window_title_generator": "Soittolistageneraattori",
@@ -3325,7 +3365,8 @@ class Localization:
                 "error_adding_tracks": "Virhe raidat lisättäessä",
                 "editor_seed_info_intensity_step": "Sekoitettu!\nSiemen: {seed} \nKäytetyt vaihdot: {num_swaps} \nKäänteinen askel: {step}",
                 "editor_seed_info_intensity": "Sekoitettu!\nSiemen: {seed} \nTehdyt vaihdot: {num_swaps}",
-                "total_duration": "Kokonaiskesto: {duration}"
+                "total_duration": "Kokonaiskesto: {duration}",
+                "scan_cancelled": "Tarkistus peruutettu"
             },
             "af-za": {
                 "window_title_generator": "Speellys Generator",
@@ -3406,7 +3447,8 @@ class Localization:
                 "error_adding_tracks": "Fout met byvoeging van snitte",
                 "editor_seed_info_intensity_step": "Geskuifel!\nSaad: {seed} \nToegepaste ruilings: {num_swaps} \nOmgekeerde stap: {step}",
                 "editor_seed_info_intensity": "Geskuifel!\nSaad: {seed} \nToegepaste ruilings: {num_swaps}",
-                "total_duration": "Totale duur: {duration}"
+                "total_duration": "Totale duur: {duration}",
+                "scan_cancelled": "Skandering gekanselleer"
             },
             "vi-vn": {
                 "window_title_generator": "Trình tạo playlist",
@@ -3487,7 +3529,8 @@ class Localization:
                 "error_adding_tracks": "Lỗi khi thêm bài hát",
                 "editor_seed_info_intensity_step": "Đã xáo trộn!\nHạt giống: {seed} \nHoán đổi áp dụng: {num_swaps} \nBước đảo ngược: {step}",
                 "editor_seed_info_intensity": "Đã xáo trộn!\nHạt giống: {seed} \nHoán đổi áp dụng: {num_swaps}",
-                "total_duration": "Tổng thời lượng: {duration}"
+                "total_duration": "Tổng thời lượng: {duration}",
+                "scan_cancelled": "Đã hủy quét"
             },
             "id-id": {
                 "window_title_generator": "Pembuat Daftar Putar",
@@ -3568,7 +3611,8 @@ class Localization:
                 "error_adding_tracks": "Kesalahan saat menambahkan trek",
                 "editor_seed_info_intensity_step": "Diacak!\nSeed: {seed} \nPertukaran diterapkan: {num_swaps} \nLangkah terbalik: {step}",
                 "editor_seed_info_intensity": "Diacak!\nSeed: {seed} \nPertukaran diterapkan: {num_swaps}",
-                "total_duration": "Durasi total: {duration}"
+                "total_duration": "Durasi total: {duration}",
+                "scan_cancelled": "Pemindaian dibatalkan"
             },
             "el-gr": {
                 "window_title_generator": "Δημιουργός Λιστών Αναπαραγωγής",
@@ -3649,7 +3693,8 @@ class Localization:
                 "error_adding_tracks": "Σφάλμα κατά την προσθήκη κομματιών",
                 "editor_seed_info_intensity_step": "Ανακάτεμα!\nΣπόρος: {seed} \nΕφαρμοσμένες ανταλλαγές: {num_swaps} \nΑντίστροφο βήμα: {step}",
                 "editor_seed_info_intensity": "Ανακάτεμα!\nΣπόρος: {seed} \nΕφαρμοσμένες ανταλλαγές: {num_swaps}",
-                "total_duration": "Συνολική διάρκεια: {duration}"
+                "total_duration": "Συνολική διάρκεια: {duration}",
+                "scan_cancelled": "Η σάρωση ακυρώθηκε"
             },
             "bg-bg": {
                 "window_title_generator": "Генератор на плейлисти",
@@ -3730,7 +3775,8 @@ class Localization:
                 "error_adding_tracks": "Грешка при добавяне на песни",
                 "editor_seed_info_intensity_step": "Разбъркано!\nСеме: {seed} \nПриложени размени: {num_swaps} \nОбратна стъпка: {step}",
                 "editor_seed_info_intensity": "Разбъркано!\nСеме: {seed} \nПриложени размени: {num_swaps}",
-                "total_duration": "Общо време: {duration}"
+                "total_duration": "Общо време: {duration}",
+                "scan_cancelled": "Сканирането е отменено"
             },
             "lt-lt": {
                 "window_title_generator": "Grojaraščių generatorius",
@@ -3811,7 +3857,8 @@ class Localization:
                 "error_adding_tracks": "Klaida pridedant takelius",
                 "editor_seed_info_intensity_step": "Išmaišyta!\nSėkla: {seed} \nPritaikyti sukeitimai: {num_swaps} \nAtvirkštinis žingsnis: {step}",
                 "editor_seed_info_intensity": "Sumaišyta!\nSėkla: {seed} \nTaikomi sukeitimai: {num_swaps}",
-                "total_duration": "Bendra trukmė: {duration}"
+                "total_duration": "Bendra trukmė: {duration}",
+                "scan_cancelled": "Nuskaitymas atšauktas"
             },
             "lv-lv": {
                 "window_title_generator": "Playlistu Ģenerators",
@@ -3892,7 +3939,8 @@ class Localization:
                 "error_adding_tracks": "Kļūda, pievienojot dziesmas",
                 "editor_seed_info_intensity_step": "Sajaukts!\nSēkla: {seed} \nPiemērotie mainījumi: {num_swaps} \nReversais solis: {step}",
                 "editor_seed_info_intensity": "Sajaikts!\nSēkla: {seed} \nPielietotie maiņi: {num_swaps}",
-                "total_duration": "Kopējais ilgums: {duration}"
+                "total_duration": "Kopējais ilgums: {duration}",
+                "scan_cancelled": "Skenēšana atcelta"
             },
             "mt-mt": {
                 "window_title_generator": "Ġeneratur ta' Playlist",
@@ -3973,7 +4021,8 @@ class Localization:
                 "error_adding_tracks": "Żball waqt iż-żid ta' trakki",
                 "editor_seed_info_intensity_step": "Imxarrab!\nŻerriegħa: {seed} \nSkambji applikati: {num_swaps} \nPass lura: {step}",
                 "editor_seed_info_intensity": "Imħawwad!\nŻerriegħa: {seed} \nSkambji applikati: {num_swaps}",
-                "total_duration": "Durata totali: {duration}"
+                "total_duration": "Durata totali: {duration}",
+                "scan_cancelled": "L-iskennjar ġie kkanċellat"
             },
             "mk-mk": {
                 "window_title_generator": "Генератор на плејлисти",
@@ -4054,7 +4103,8 @@ class Localization:
                 "error_adding_tracks": "Грешка при додавање песни",
                 "editor_seed_info_intensity_step": "Измешано!\nСеме: {seed} \nПрименети замены: {num_swaps} \nОбратен чекор: {step}",
                 "editor_seed_info_intensity": "Измешано!\nСеме: {seed} \nПрименети замени: {num_swaps}",
-                "total_duration": "Вкупно времетраење: {duration}"
+                "total_duration": "Вкупно времетраење: {duration}",
+                "scan_cancelled": "Скенирањето е откажано"
             },
             "sk-sk": {
                 "window_title_generator": "Generátor playlistu",
@@ -4135,7 +4185,8 @@ class Localization:
                 "error_adding_tracks": "Chyba pri pridávaní skladieb",
                 "editor_seed_info_intensity_step": "Zamiešané!\nSemeno: {seed} \nPoužité výmeny: {num_swaps} \nSpätný krok: {step}",
                 "editor_seed_info_intensity": "Zamiešané!\nSemeno: {seed} \nPoužité výmeny: {num_swaps}",
-                "total_duration": "Celkové trvanie: {duration}"
+                "total_duration": "Celkové trvanie: {duration}",
+                "scan_cancelled": "Prehľadávanie zrušené"
             },
             "he-il": {
                 "window_title_generator": "מחולל פלייליסט",
@@ -4216,7 +4267,8 @@ class Localization:
                 "error_adding_tracks": "שגיאה בהוספת רצועות",
                 "editor_seed_info_intensity_step": "עורבב!\nזרע: {seed} \nהחלפות שהוחלו: {num_swaps} \nצעד הפוך: {step}",
                 "editor_seed_info_intensity": "עורבב!\nזרע: {seed} \nהחלפות מיושמות: {num_swaps}",
-                "total_duration": "משך זמן כולל: {duration}"
+                "total_duration": "משך זמן כולל: {duration}",
+                "scan_cancelled": "הסריקה בוטלה"
             },
             "ta-in": {
                 "window_title_generator": "பிளேலிஸ்ட் ஜெனரேட்டர்",
@@ -4297,7 +4349,8 @@ class Localization:
                 "error_adding_tracks": "பாடல்களைச் சேர்க்கும்போது பிழை",
                 "editor_seed_info_intensity_step": "கலக்கப்பட்டது!\nவிதை: {seed} \nபயன்படுத்தப்பட்ட பரிமாற்றங்கள்: {num_swaps} \nதலைகீழ் படி: {step}",
                 "editor_seed_info_intensity": "கலக்கப்பட்டது!\nவிதை: {seed} \nபயன்படுத்தப்பட்ட பரிமாற்றங்கள்: {num_swaps}",
-                "total_duration": "மொத்த காலம்: {duration}"
+                "total_duration": "மொத்த காலம்: {duration}",
+                "scan_cancelled": "ஸ்கேன் ரத்து செய்யப்பட்டது"
             },
             "te-in": {
                 "window_title_generator": "ప్లేలిస్ట్ జనరేటర్",
@@ -4378,7 +4431,8 @@ class Localization:
                 "error_adding_tracks": "ట్రాక్స్ జోడించడంలో లోపం",
                 "editor_seed_info_intensity_step": "అద్దుకున్నాడు!\nవిత్తనం: {seed} \nఅమలు చేసిన మార్పిడులు: {num_swaps} \nరివర్స్ స్టెప్: {step}",
                 "editor_seed_info_intensity": "అద్దుపడింది!\nవిత్తనం: {seed} \nవర్తింపజేసిన మార్పిడులు: {num_swaps}",
-                "total_duration": "మొత్తం కాలం: {duration}"
+                "total_duration": "మొత్తం కాలం: {duration}",
+                "scan_cancelled": "స్కాన్ రద్దు చేయబడింది"
             },
             "ms-my": {
                 "window_title_generator": "Penjana Senarai Main",
@@ -4459,7 +4513,8 @@ class Localization:
                 "error_adding_tracks": "Ralat semasa menambah lagu",
                 "editor_seed_info_intensity_step": "Dikocak!\nBiji: {seed} \nPertukaran digunakan: {num_swaps} \nLangkah terbalik: {step}",
                 "editor_seed_info_intensity": "Dikocak!\nBiji: {seed} \nPertukaran digunakan: {num_swaps}",
-                "total_duration": "Jumlah masa: {duration}"
+                "total_duration": "Jumlah masa: {duration}",
+                "scan_cancelled": "Imbasan dibatalkan"
             },
             "am-et": {
                 "window_title_generator": "የፕሌይሊስት ጀነሬተር",
@@ -4540,7 +4595,8 @@ class Localization:
                 "error_adding_tracks": "ትራኮችን በማከል ላይ ስህተት",
                 "editor_seed_info_intensity_step": "ተቀላቅሏል!\nዘር: {seed} \nየተገለበጡ ለውጦች: {num_swaps} \nየተገለበጠ ደረጃ: {step}",
                 "editor_seed_info_intensity": "ተቀላቅሏል!\nዘር: {seed} \nተፈጽሞ የሚለዋወጥ: {num_swaps}",
-                "total_duration": "ጠቅላላ ቆይታ: {duration}"
+                "total_duration": "ጠቅላላ ቆይታ: {duration}",
+                "scan_cancelled": "ቅኝቱ ተሰርዟል"
             },
             "sw-ke": {
                 "window_title_generator": "Kizazi cha Orodha ya Nyimbo",
@@ -4621,7 +4677,8 @@ class Localization:
                 "error_adding_tracks": "Hitilafu wakati wa kuongeza nyimbo",
                 "editor_seed_info_intensity_step": "Imechanganywa!\nMbegu: {seed} \nKubadilishana kutumika: {num_swaps} \nHatua ya nyuma: {step}",
                 "editor_seed_info_intensity": "Imechanganywa!\nMbegu: {seed} \nBadilisha zilizotumika: {num_swaps}",
-                "total_duration": "Muda wa jumla: {duration}"
+                "total_duration": "Muda wa jumla: {duration}",
+                "scan_cancelled": "Uchanganuzi umeghairiwa"
             },
             "zu-za": {
                 "window_title_generator": "Umakhi Weplaylist",
@@ -4702,7 +4759,8 @@ class Localization:
                 "error_adding_tracks": "Iphutha ekwengezeni amathrekhi",
                 "editor_seed_info_intensity_step": "Kuhlanjululwe!\nImbewu: {seed} \nUkushintshana okusetshenzisiwe: {num_swaps} \nIsinyathelo sokuhlehla: {step}",
                 "editor_seed_info_intensity": "Kuhlanganisiwe!\nImbewu: {seed} \nUkushintshwa okusetshenzisiwe: {num_swaps}",
-                "total_duration": "Isikhathi esiphelele: {duration}"
+                "total_duration": "Isikhathi esiphelele: {duration}",
+                "scan_cancelled": "Ukuskena kukhanseliwe"
             }
         }
         self.lang_names = {code: data["language_name"] for code, data in self.languages.items()}
@@ -4716,8 +4774,11 @@ class Localization:
         self.current_lang = lang_code if self.is_language_supported(lang_code) else 'en-us'
     
     def tr(self, key):
-        """Возвращает переведённый текст по ключу"""
-        return self.languages.get(self.current_lang, {}).get(key, key)
+        """Возвращает переведённый текст по ключу (если перевода нет — английский вариант)"""
+        text = self.languages.get(self.current_lang, {}).get(key)
+        if text is None:
+            text = self.languages["en-us"].get(key, key)
+        return text
     
     def get_seed_format_options(self):
         """Возвращает варианты формата сида для текущего языка"""
@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# Ниже этого числа файлов пул не окупает затраты на запуск
+MIN_PARALLEL_FILES = 64
+
+
+def _probe_one(path):
+    """Читает длительность одного файла: возвращает (длительность или None, текст ошибки или None)"""
+    from mutagen import File
+    # Явные импорты форматов, чтобы PyInstaller включил их в сборку
+    from mutagen.flac import FLAC
+    from mutagen.mp3 import MP3
+    from mutagen.ogg import OggFileType
+    from mutagen.wave import WAVE
+    from mutagen.aiff import AIFF
+    from mutagen.mp4 import MP4
+    from mutagen.asf import ASF
+    try:
+        audio = File(path)
+        # Файл без тегов — пустой словарь, но длительность у него есть
+        if audio is not None and hasattr(audio, 'info'):
+            return audio.info.length, None
+        return None, None
+    except Exception as e:
+        return None, str(e)
+
+
+def probe_duration(path):
+    """Возвращает длительность файла в секундах или None, если файл не читается"""
+    return _probe_one(path)[0]
+
+
+def default_workers(executor="process"):
+    """Число воркеров по умолчанию: все ядра для процессов, больше — для потоков (ожидание диска)"""
+    cpus = os.cpu_count() or 1
+    return cpus if executor == "process" else min(32, cpus * 4)
+
+
+def create_pool(workers=None, executor="process"):
+    """Создает пул воркеров для probe_durations (None — если пул не нужен)"""
+    if workers is None:
+        workers = default_workers(executor)
+    workers = max(1, int(workers))
+    if workers == 1:
+        return None
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    try:
+        return pool_class(max_workers=workers)
+    except (OSError, RuntimeError) as e:
+        print(f"[WARNING] Пул воркеров недоступен ({e}), чтение в одном потоке")
+        return None
+
+
+def probe_durations(paths, workers=None, executor="process", pool=None):
+    """Параллельно читает длительности файлов через mutagen.
+
+    Возвращает (список длительностей в порядке paths, общую длительность).
+    Для нечитаемых файлов в списке стоит None. executor — "process" или "thread",
+    workers — число воркеров (None — по числу ядер, 1 — без пула).
+    Готовый пул можно передать в pool, чтобы не создавать его на каждый вызов.
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = default_workers(executor)
+    workers = max(1, int(workers))
+
+    own_pool = False
+    if pool is None and workers > 1 and len(paths) >= MIN_PARALLEL_FILES:
+        pool = create_pool(workers, executor)
+        own_pool = pool is not None
+
+    if pool is None or len(paths) < MIN_PARALLEL_FILES:
+        results = [_probe_one(path) for path in paths]
+    else:
+        # Крупные пачки снижают накладные расходы на передачу путей между процессами
+        is_process_pool = isinstance(pool, ProcessPoolExecutor)
+        chunksize = max(1, min(64, len(paths) // (workers * 8))) if is_process_pool else 1
+        try:
+            # map сохраняет порядок входных путей — результат детерминирован
+            results = list(pool.map(_probe_one, paths, chunksize=chunksize))
+        except (OSError, RuntimeError) as e:
+            print(f"[WARNING] Пул воркеров недоступен ({e}), чтение в одном потоке")
+            results = [_probe_one(path) for path in paths]
+        finally:
+            if own_pool:
+                pool.shutdown()
+
+    durations = []
+    total_seconds = 0.0
+    for path, (duration, error) in zip(paths, results):
+        if error:
+            print(f"[WARNING] Ошибка чтения {os.path.basename(path)}: {error}")
+        durations.append(duration)
+        if duration:
+            total_seconds += duration
+    return durations, total_seconds
@@ -0,0 +1,201 @@
+from array import array
+
+
+# Ниже этого размера диапазона делим на малые числа обычным циклом
+_LEAF = 32
+# Делители короче этого числа бит делим встроенным divmod
+_DIV_LIMIT = 4000
+
+
+def _div2n1n(a, b, n):
+    """Деление 2n-битного a на n-битное b (рекурсивная схема Бурникеля — Циглера)"""
+    if a.bit_length() - n <= _DIV_LIMIT:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half_n = n >> 1
+    mask = (1 << half_n) - 1
+    b1, b2 = b >> half_n, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half_n) & mask, b, b1, b2, half_n)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half_n)
+    if pad:
+        r >>= 1
+    return q1 << half_n | q2, r
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    """Шаг деления 3n-битного числа на 2n-битное через деление старших половин"""
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+
+def _split_chunks(value, count, bits, out):
+    """Делит value на count кусков по bits бит (старшие первыми) половинным делением"""
+    if count == 1:
+        out.append(value)
+        return
+    half = count >> 1
+    _split_chunks(value >> (half * bits), count - half, bits, out)
+    _split_chunks(value & ((1 << (half * bits)) - 1), half, bits, out)
+
+
+def _join_chunks(chunks, lo, hi, bits):
+    """Обратная операция к _split_chunks"""
+    if hi - lo == 1:
+        return chunks[lo]
+    mid = (lo + hi) // 2
+    return _join_chunks(chunks, lo, mid, bits) << ((hi - mid) * bits) | _join_chunks(chunks, mid, hi, bits)
+
+
+def big_divmod(a, b):
+    """divmod для неотрицательных длинных чисел за время порядка умножения, а не квадратичное"""
+    n = b.bit_length()
+    if n <= _DIV_LIMIT or a < 0 or b < 0:
+        return divmod(a, b)
+    chunks = []
+    _split_chunks(a, max(1, -(-a.bit_length() // n)), n, chunks)
+    remainder = 0
+    quotients = []
+    for chunk in chunks:
+        q, remainder = _div2n1n(remainder << n | chunk, b, n)
+        quotients.append(q)
+    return _join_chunks(quotients, 0, len(quotients), n), remainder
+
+
+def _product_tree(lo, hi):
+    """Дерево произведений lo*(lo+1)*...*(hi-1): (произведение, левое поддерево, правое поддерево)"""
+    if hi - lo <= _LEAF:
+        product = 1
+        for k in range(lo, hi):
+            product *= k
+        return product, None, None
+    mid = (lo + hi) // 2
+    left = _product_tree(lo, mid)
+    right = _product_tree(mid, hi)
+    return left[0] * right[0], left, right
+
+
+def _mixed_radix_digits(value, lo, hi, tree, out):
+    """Цифры value в смешанной системе с основаниями lo, lo+1, ..., hi-1 (младшие первыми).
+
+    Делим пополам: одно большое деление на произведение младшей половины
+    оснований, дальше рекурсивно по половинам. Числа на каждом уровне вдвое
+    короче, поэтому общая стоимость близка к стоимости одного умножения.
+    """
+    if tree[1] is None:
+        for k in range(lo, hi):
+            value, digit = divmod(value, k)
+            out.append(digit)
+        return
+    mid = (lo + hi) // 2
+    high, low = big_divmod(value, tree[1][0])
+    _mixed_radix_digits(low, lo, mid, tree[1], out)
+    _mixed_radix_digits(high, mid, hi, tree[2], out)
+
+
+def _fenwick_ones(n):
+    """Дерево Фенвика (1-based) над n единицами — все элементы еще свободны"""
+    tree = array('i', [0]) * (n + 1)
+    for i in range(1, n + 1):
+        tree[i] += 1
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+    return tree
+
+
+def unrank_permutation(rank, n):
+    """Перестановка 0..n-1 с номером rank (по модулю n!) в факториальной системе счисления.
+
+    Номер 0 — исходный порядок, n! - 1 — обратный.
+    """
+    if n <= 0:
+        return array('I')
+    tree = _product_tree(1, n + 1)
+    rank = big_divmod(rank, tree[0])[1]  # Корень дерева — это n!
+
+    # Цифры с основаниями 1..n; цифра с основанием k — код Лемера позиции n-k
+    digits = array('I')
+    _mixed_radix_digits(rank, 1, n + 1, tree, digits)
+
+    # Для каждой позиции выбираем digit-й по счету свободный элемент
+    fenwick = _fenwick_ones(n)
+    top = 1 << (n.bit_length() - 1)
+    permutation = array('I')
+    for position in range(n - 1, -1, -1):
+        remaining = digits[position] + 1
+        index = 0
+        step = top
+        while step:
+            candidate = index + step
+            if candidate <= n and fenwick[candidate] < remaining:
+                index = candidate
+                remaining -= fenwick[candidate]
+            step >>= 1
+        permutation.append(index)
+        i = index + 1
+        while i <= n:
+            fenwick[i] -= 1
+            i += i & -i
+    return permutation
+
+
+def _mixed_radix_value(digits, lo, hi, tree):
+    """Обратная операция к _mixed_radix_digits: сборка числа половинами через дерево произведений"""
+    if tree[1] is None:
+        value = 0
+        for k in range(hi - 1, lo - 1, -1):
+            value = value * k + digits[k - lo]
+        return value
+    mid = (lo + hi) // 2
+    low = _mixed_radix_value(digits[:mid - lo], lo, mid, tree[1])
+    high = _mixed_radix_value(digits[mid - lo:], mid, hi, tree[2])
+    return low + tree[1][0] * high
+
+
+def rank_permutation(permutation):
+    """Номер перестановки 0..n-1 в факториальной системе — обратная функция к unrank_permutation"""
+    n = len(permutation)
+    if n <= 1:
+        return 0
+
+    # Код Лемера: сколько еще не использованных элементов меньше текущего
+    fenwick = _fenwick_ones(n)
+    lehmer = array('I')
+    for element in permutation:
+        count = 0
+        i = element
+        while i > 0:
+            count += fenwick[i]
+            i -= i & -i
+        lehmer.append(count)
+        i = element + 1
+        while i <= n:
+            fenwick[i] -= 1
+            i += i & -i
+
+    # Цифра с основанием k — код Лемера позиции n-k
+    lehmer.reverse()
+    return _mixed_radix_value(lehmer, 1, n + 1, _product_tree(1, n + 1))
+
+
+def to_decimal(value, min_digits=0):
+    """Десятичная запись длинного числа половинным делением на степени 10 (без квадратичного str)"""
+    if value < 0:
+        return "-" + to_decimal(-value, min_digits)
+    if value.bit_length() <= 12_000:
+        return str(value).zfill(min_digits)
+    # Степень 10 примерно в половину длины числа
+    half_digits = int(value.bit_length() * 0.30103) // 2
+    high, low = big_divmod(value, 10 ** half_digits)
+    return to_decimal(high, min_digits - half_digits) + to_decimal(low, half_digits)
@@ -0,0 +1,123 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+
+from PlaylistCore import PlaylistJob, generate_playlist, scan_library
+from PlaylistWriter import DURABILITY_FILE, DURABILITY_LEVELS, PLAYLIST_FORMATS, parse_formats
+from ShuffleEngine import ALGORITHMS, LEGACY, SWAP_COMPAT, SWAP_MODES
+from StageProfiler import StageProfiler
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="PlaylistCLI",
+        description="VolfLife's Playlist Generator without GUI: scan folders, shuffle by seed, write a playlist."
+    )
+    parser.add_argument("folders", nargs="*", help="media folders to scan")
+    parser.add_argument("-n", "--name", default="Playlist", help="playlist name (file name without extension)")
+    parser.add_argument("-s", "--seed", default=None, help="seed; empty or 0 — automatic seed")
+    parser.add_argument("--shadow-seed", action="store_true", help="shuffle by a random shadow seed derived from the seed")
+    parser.add_argument("--swaps", type=int, default=0,
+                        help="extra swaps: 0 — none, 1 — from the seed (60-100%% of tracks), N — exactly N")
+    parser.add_argument("--reverse-step", type=int, default=0,
+                        help="block reverse step: 0 — none, 1 — random 2-21, N — blocks of N")
+    parser.add_argument("-f", "--format", default="m3u8",
+                        help=f"playlist format or several comma-separated, written from one ordering: {', '.join(PLAYLIST_FORMATS)}")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the playlist file")
+    parser.add_argument("--algorithm", default=LEGACY, choices=ALGORITHMS, help="shuffle algorithm")
+    parser.add_argument("--swap-mode", default=SWAP_COMPAT, choices=SWAP_MODES, help="extra swaps mode (legacy only)")
+    parser.add_argument("--alphanumeric", action="store_true", help="hex seeds instead of digits only")
+    parser.add_argument("--durability", default=DURABILITY_FILE, choices=DURABILITY_LEVELS,
+                        help="fsync after the atomic write: none, the file, or the file and its directory")
+    parser.add_argument("--durations", action="store_true", help="read durations for the #DURATION header and per-track lengths")
+    parser.add_argument("--relative", nargs="?", const=True, default=None, metavar="BASE",
+                        help="write track paths relative to the playlist directory or to BASE")
+    parser.add_argument("--jobs", default=None, help="batch job file (see BatchGenerator.py); other options are ignored")
+    parser.add_argument("--profile", action="store_true",
+                        help="print stage timings and save them to <playlist>.profile.json")
+    parser.add_argument("-q", "--quiet", action="store_true", help="hide debug output")
+    return parser
+
+
+def run(args, profiler):
+    """Одна генерация по аргументам командной строки: (код выхода, PlaylistResult или None)"""
+    if args.jobs:
+        # Пул процессов нужен только пакету — импортируем его по требованию
+        from BatchGenerator import main as batch_main
+        return batch_main([args.jobs]), None
+
+    # Абсолютные пути, как в кэше сервера: относительные пути в плейлисте считаются от них
+    folders = [os.path.abspath(folder) for folder in args.folders if os.path.isdir(folder)]
+    if not folders:
+        print("[ERROR] Нет существующих папок для сканирования", file=sys.stderr)
+        return 2, None
+    if args.swaps < 0 or args.reverse_step < 0:
+        print("[ERROR] Число перестановок и шаг реверса не могут быть отрицательными", file=sys.stderr)
+        return 2, None
+    try:
+        playlist_formats = parse_formats(args.format)
+    except ValueError as e:
+        print(f"[ERROR] Неверный формат: {e}", file=sys.stderr)
+        return 2, None
+
+    with profiler.span("scan"):
+        table, duration = scan_library(folders, with_durations=args.durations)
+    if not len(table):
+        print("[ERROR] В папках нет медиафайлов", file=sys.stderr)
+        return 1, None
+
+    job = PlaylistJob(
+        name=args.name,
+        seed=args.seed,
+        shadow_seed=args.shadow_seed,
+        intensity=args.swaps,
+        reverse_step=args.reverse_step,
+        playlist_format=",".join(playlist_formats),
+        algorithm=args.algorithm,
+        swap_mode=args.swap_mode,
+        digits_only=not args.alphanumeric,
+        relative_to=args.relative
+    )
+    os.makedirs(args.output_dir, exist_ok=True)
+    with profiler.span("sort"):
+        order = table.sorted_order()
+    result = generate_playlist(
+        table, order, job, args.output_dir, duration=duration, profiler=profiler, durability=args.durability
+    )
+    return (1 if result.error else 0), result
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    profiler = StageProfiler("PlaylistCLI", enabled=args.profile)
+    # Отладочный вывод (по строке на перестановку и трек) в тихом режиме уходит в никуда
+    with open(os.devnull, 'w') if args.quiet else contextlib.nullcontext(sys.stdout) as out:
+        with contextlib.redirect_stdout(out):
+            with profiler, profiler.span("total"):
+                code, result = run(args, profiler)
+            if result is not None and not result.error:
+                profiler.write_sidecar(result.path)
+    # Таблица этапов печатается и в тихом режиме: ее просили явно
+    profiler.report()
+    if result is None or result.error:
+        return code
+    # Итог печатается всегда: путь, сид и параметры, по которым плейлист можно повторить
+    for path in result.paths:
+        print(path)
+    print(f"SEED:{result.seed}")
+    if result.shadow_seed is not None:
+        print(f"SHADOW_SEED:{result.shadow_seed}")
+    if result.num_swaps:
+        print(f"NUM_SWAPS:{result.num_swaps}")
+    if result.reverse_step:
+        print(f"REVERSE_STEP:{result.reverse_step}")
+    print(f"TIME:{result.seconds:.3f}")
+    return code
+
+
+if __name__ == "__main__":
+    # Нужно для пула процессов в собранном .exe
+    multiprocessing.freeze_support()
+    sys.exit(main())
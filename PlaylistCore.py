@@ -0,0 +1,193 @@
+import datetime
+import math
+import os
+import random
+import time
+from array import array
+from collections import namedtuple
+
+from DurationCache import DurationCache
+from LibraryIndex import LibraryIndex
+from LibraryScanner import LibraryScanner
+from Permutation import rank_permutation, to_decimal
+from PlaylistWriter import DURABILITY_FILE, format_duration, parse_formats, write_playlist, write_playlists
+from SeedEngine import date_seed_value, factorial_digits, format_seed, mod_factorial, shadow_seed_value
+from ShuffleEngine import (
+    EXACT, LEGACY, SWAP_COMPAT, apply_permutation, expand_seed, normalize_algorithm, normalize_swap_mode,
+    reverse_blocks, shuffle_permutation
+)
+from StageProfiler import StageProfiler
+from TrackTable import TrackTable
+
+
+# Ядро генерации без интерфейса: используется консольным и пакетным генераторами и сервером
+
+# Одно задание генерации: reverse_step 1 — случайный шаг 2-21, 0 — без реверса (как в окне генератора);
+# playlist_format — формат или несколько через запятую ("m3u8,xspf,wpl"), порядок записывается в каждый;
+# relative_to — пути относительно папки плейлиста (True) или указанной папки, None — абсолютные
+PlaylistJob = namedtuple(
+    "PlaylistJob",
+    ["name", "seed", "shadow_seed", "intensity", "reverse_step", "playlist_format", "algorithm", "swap_mode", "digits_only",
+     "relative_to"],
+    defaults=(None, False, 0, 0, "m3u8", LEGACY, SWAP_COMPAT, True, None)
+)
+
+# Результат задания: error — текст ошибки или None, seconds — время генерации и записи,
+# path — файл первого формата, paths — файлы всех форматов задания
+PlaylistResult = namedtuple(
+    "PlaylistResult",
+    ["name", "path", "seed", "shadow_seed", "num_swaps", "reverse_step", "seconds", "error", "paths"],
+    defaults=(None,)
+)
+
+# План генерации: сиды и итоговый порядок строк таблицы; swap_mode — None вне legacy
+PlaylistPlan = namedtuple(
+    "PlaylistPlan",
+    ["seed", "shadow_seed", "order", "num_swaps", "reverse_step", "algorithm", "swap_mode"]
+)
+
+
+def scan_library(folders, scanner=None, with_durations=False):
+    """Один проход по папкам: таблица треков и общая длительность (строка или None)"""
+    if scanner is None:
+        scanner = LibraryScanner(LibraryIndex(), DurationCache())
+    table = TrackTable.from_records(scanner.scan(folders, with_durations=with_durations))
+    duration = None
+    if with_durations:
+        total_seconds = sum(value for value in table.durations if not math.isnan(value))
+        if total_seconds > 0:
+            duration = format_duration(total_seconds)
+    return table, duration
+
+
+def plan_playlist(table, order, job, date, iteration=0, profiler=None, base_seed=None):
+    """Сиды и итоговый порядок треков для задания — все, что нужно до записи.
+
+    Возвращает PlaylistPlan; ошибки (пустая таблица, неверный сид) пробрасываются.
+    profiler — StageProfiler для замера этапов (по умолчанию выключен).
+    base_seed — предсказуемая часть автоматического сида (date_seed_value), общая
+    для сессии, как в окне генератора; None — считается по date.
+    """
+    if profiler is None:
+        profiler = StageProfiler("plan_playlist", enabled=False)
+    num_tracks = len(table)
+    if not num_tracks:
+        raise ValueError("no tracks")
+    rng = random.Random()
+    algorithm = normalize_algorithm(job.algorithm)
+    swap_mode = normalize_swap_mode(job.swap_mode)
+
+    # Автоматический сид — как в окне генератора, iteration вместо счетчика генераций
+    if job.seed and str(job.seed) != "0":
+        seed = str(job.seed)
+    else:
+        with profiler.span("seed"):
+            if base_seed is None:
+                base_seed = date_seed_value(num_tracks, date, table.total_size)
+            value = mod_factorial(base_seed, num_tracks) + mod_factorial(iteration, num_tracks)
+            seed = format_seed(value, num_tracks, job.digits_only)
+            if algorithm == EXACT:
+                seed = to_decimal(expand_seed(seed, num_tracks), factorial_digits(num_tracks))
+    seed_trimmed = seed.lstrip('0') or '0'
+
+    shadow_seed = None
+    if job.shadow_seed:
+        with profiler.span("shadow_seed"):
+            shadow_value = shadow_seed_value(num_tracks, seed_trimmed, rng)
+            shadow_seed = format_seed(shadow_value, num_tracks, job.digits_only).lstrip('0') or '0'
+
+    reverse_step = job.reverse_step if job.reverse_step and job.reverse_step > 0 else None
+    if reverse_step == 1:
+        reverse_step = rng.randint(2, 21)
+
+    with profiler.span("shuffle"):
+        permutation, num_swaps = shuffle_permutation(
+            shadow_seed if shadow_seed is not None else seed_trimmed,
+            num_tracks, algorithm, job.intensity, swap_mode, rng
+        )
+    if reverse_step:
+        with profiler.span("reverse"):
+            permutation = reverse_blocks(permutation, reverse_step)
+    with profiler.span("apply"):
+        shuffled = apply_permutation(order, permutation)
+
+    return PlaylistPlan(
+        seed_trimmed, shadow_seed, shuffled, num_swaps, reverse_step,
+        algorithm, swap_mode if algorithm == LEGACY else None
+    )
+
+
+def rank_order(paths):
+    """Сид порядка paths для режима exact: номер перестановки относительно
+    сортировки генератора (plan_playlist с этим сидом по тем же файлам дает этот порядок)"""
+    table = TrackTable()
+    for path in paths:
+        table.append(path)
+    permutation = array('I', [0]) * len(table)
+    for sorted_position, index in enumerate(table.sorted_order()):
+        permutation[index] = sorted_position
+    return to_decimal(rank_permutation(permutation))
+
+
+def write_plan(output, table, plan, job, date, duration=None, durability=DURABILITY_FILE):
+    """Записывает плейлист по готовому плану и возвращает пути файлов.
+
+    output — путь без расширения (по файлу на каждый формат задания) или
+    текстовый поток (только один формат; возвращается пустой список).
+    durability — уровень fsync атомарной записи файлов (PlaylistWriter.DURABILITY_LEVELS).
+    Длительности треков, прочитанные при сканировании, пишутся в каждый трек.
+    """
+    formats = parse_formats(job.playlist_format)
+    durations = table.track_durations(plan.order) if table.duration_count else None
+    if hasattr(output, 'write'):
+        if len(formats) > 1:
+            raise ValueError("a stream takes a single playlist format")
+        write_playlist(
+            output, table.paths(plan.order), job.name,
+            plan.seed, plan.shadow_seed, len(table), date,
+            reverse_step=plan.reverse_step,
+            num_swaps=plan.num_swaps,
+            playlist_format=formats[0],
+            algorithm=plan.algorithm,
+            swap_mode=plan.swap_mode,
+            duration=duration,
+            durations=durations,
+            relative_to=job.relative_to
+        )
+        return []
+    return write_playlists(
+        output, table.paths(plan.order), job.name,
+        plan.seed, plan.shadow_seed, len(table), date,
+        reverse_step=plan.reverse_step,
+        num_swaps=plan.num_swaps,
+        playlist_formats=formats,
+        algorithm=plan.algorithm,
+        swap_mode=plan.swap_mode,
+        duration=duration,
+        durability=durability,
+        durations=durations,
+        relative_to=job.relative_to
+    )
+
+
+def generate_playlist(table, order, job, output_dir, date=None, iteration=0, duration=None, profiler=None,
+                      durability=DURABILITY_FILE):
+    """Одна генерация по готовой таблице: сиды, перестановка, запись.
+
+    order — отсортированный порядок (table.sorted_order()), date — дата для
+    автоматического сида и заголовка (по умолчанию — сейчас).
+    """
+    if profiler is None:
+        profiler = StageProfiler("generate_playlist", enabled=False)
+    started = time.perf_counter()
+    date = date or datetime.datetime.now()
+    path = os.path.join(output_dir, job.name)
+    try:
+        plan = plan_playlist(table, order, job, date, iteration, profiler)
+        with profiler.span("write"):
+            paths = write_plan(path, table, plan, job, date, duration, durability)
+        return PlaylistResult(job.name, paths[0], plan.seed, plan.shadow_seed, plan.num_swaps, plan.reverse_step,
+                           time.perf_counter() - started, None, tuple(paths))
+    except Exception as e:
+        print(f"[ERROR] Задание {job.name}: {e}")
+        return PlaylistResult(job.name, path, None, None, 0, None, time.perf_counter() - started, str(e))
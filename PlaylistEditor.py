@@ -3,7 +3,6 @@ import sys
 import random
 import datetime
 import hashlib
-import math
 import string
 import tempfile
 import json
@@ -20,6 +19,18 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from Localization import Localization
 from FontLoader import FontLoader            
+from TrackTable import TrackEntry
+from PlaylistCore import rank_order
+from PlaylistReader import read_header, read_playlist
+from PlaylistWriter import (
+    DURABILITY_FILE, PLAYLIST_FORMATS, merge_formats, normalize_durability, normalize_relative_to, write_playlists
+)
+from StageProfiler import StageProfiler
+from SeedEngine import factorial_digits, mod_factorial
+from ShuffleEngine import (
+    EXACT, FEISTEL, LEGACY, PCG64, SWAP_COMPAT, available_algorithms, normalize_algorithm, normalize_swap_mode,
+    reverse_blocks, shuffle_permutation
+)
 
 try:
     from tkinterdnd2 import TkinterDnD, DND_FILES
@@ -30,8 +41,14 @@ except ImportError:
 
 
 class PlaylistEditor:
-    def __init__(self, root, file_paths, icon_path, font_path):
+    def __init__(self, root, file_paths, icon_path, font_path, debug_mode=False):
         self.root = root
+        self.debug_mode = debug_mode  # Таблица профиля этапов в консоли
+        self.profile_sidecar = False  # JSON профиля рядом с сохраненным плейлистом
+        self.export_formats = []  # Дополнительные форматы сохранения (настройка генератора)
+        self.durability = DURABILITY_FILE  # fsync атомарной записи (настройка генератора)
+        self.relative_paths = None  # Относительные пути в сохраненном плейлисте (настройка генератора)
+        self.profiles = {}  # Последние профили загрузки и перемешивания — попадают в JSON при сохранении
         self.font_loader = FontLoader()		
         self.icon_path = self.font_loader.icon_ico
         self.font_path = self.font_loader._font_name
@@ -40,6 +57,8 @@ class PlaylistEditor:
         self.github_link = None
         self.format_m3u8 = "m3u8"
         self.format_file = "m3u8"
+        self.shuffle_algorithm = LEGACY  # Общая настройка с генератором (shuffle_algorithm)
+        self.swap_mode = SWAP_COMPAT  # Общая настройка с генератором (swap_mode)
         self.load_language_settings()
         self.root.title(self.localization.tr("window_title_editor"))
         self.playlist_name = ""
@@ -51,6 +70,7 @@ class PlaylistEditor:
         self.temp_list = None    # Временный список после ручного редактирования
         self.sorted_list = None  # Отсортированная версия для перемешивания
         self.shuffled_list = None # Результат перемешивания
+        self.manually_edited = False  # Порядок менялся вручную (перенос, добавление, удаление) — при сохранении пишется сид
         self.tracks = []  # Формат: [{"path": "", "name": "", "num": 0}, ...]
         self.display_tracks = []  # Треки для отображения
         self.modified_paths = {}
@@ -70,8 +90,10 @@ class PlaylistEditor:
         self.full_paths = []      # Текущий порядок
         self.display_names = []
         self.current_seed = ""
+        self.current_algorithm = LEGACY  # exact — сид ручной расстановки (номер перестановки)
         self.current_reverse_step = None
         self.current_swaps = None
+        self.current_swap_mode = SWAP_COMPAT
         self.seed_format = self.localization.tr("seed_formats")[0]  # По умолчанию
         self.selected_for_edit = []
         
@@ -144,6 +166,19 @@ class PlaylistEditor:
                     self.format_m3u8 = "m3u8"
                     print(f"[DEBUG] Неподдерживаемый формат '{saved_format}'. Авто–формат: m3u8")
                 
+                # Перемешивание в редакторе идет тем же алгоритмом, что выбран в генераторе
+                # (exact в редакторе — только для ручной расстановки)
+                saved_algorithm = normalize_algorithm(settings.get('shuffle_algorithm'))
+                if saved_algorithm in (PCG64, FEISTEL) and saved_algorithm in available_algorithms():
+                    self.shuffle_algorithm = saved_algorithm
+                    print(f"[DEBUG] Загружен алгоритм: {saved_algorithm}")
+                self.swap_mode = normalize_swap_mode(settings.get('swap_mode'))
+                self.profile_sidecar = settings.get('profile_sidecar') is True
+                if isinstance(settings.get('export_formats'), list):
+                    self.export_formats = [f for f in settings['export_formats'] if f in PLAYLIST_FORMATS]
+                self.durability = normalize_durability(settings.get('durability'))
+                self.relative_paths = normalize_relative_to(settings.get('relative_paths'))
+                
                 
         
                 
@@ -206,539 +241,31 @@ class PlaylistEditor:
         
     def load_playlist(self):
         """Загружает несколько плейлистов и объединяет их"""
-        import urllib
-        supported_formats = {
-                # Аудио
-                '.mp3', '.flac', '.ogg', '.wav', '.m4a', '.aac', '.wma', '.opus', '.aiff', '.aif', '.alac', '.dsf', '.dff', '.mka', '.ac3', '.dts',
-                # Видео
-                '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
-            }
+        profiler = StageProfiler(
+            "load_playlist", enabled=self.debug_mode or self.profile_sidecar, count_opens=self.profile_sidecar
+        )
+        with profiler:
+            with profiler.span("total"):
+                self._load_playlist(profiler)
+        if self.debug_mode:
+            profiler.report()
+        if profiler.enabled:
+            self.profiles["load_playlist"] = profiler.summary()
+
+    def _load_playlist(self, profiler):
         for i, file_path in enumerate(self.file_paths, 1):
-            temp_list = []
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    ext = os.path.splitext(file_path)[1].lower()
-                    
-                    if ext in ('.m3u', '.m3u8', '.txt'):
-                        # Обработка M3U/M3U8/TXT форматов
-                        for line_num, line in enumerate(f, 1):
-                            line = line.strip()
-                            if line and not line.startswith('#'):
-                                clean_path = line.strip('"\' \t')
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                normalized_path = os.path.normpath(clean_path).replace('\\', '/').strip('"\' \t')
-                                temp_list.append({
-                                    "path": normalized_path,
-                                    "name": os.path.basename(normalized_path),
-                                    "num": line_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": normalized_path,
-                                    "was_modified": False,
-                                    "track_id": None
-                                })
-                    
-                    elif ext in ('.pls'):
-                        # Обработка PLS формата
-                        for line_num, line in enumerate(f, 1):
-                            line = line.strip()
-                            if not line or line.startswith(';') or line.startswith('['):
-                                continue
-                                
-                            if line.lower().startswith('file'):
-                                # Извлекаем путь к файлу
-                                _, file_path_pls = line.split('=', 1)
-                                clean_path = file_path_pls.strip('"\' \t')
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                normalized_path = os.path.normpath(clean_path).replace('\\', '/')
-                                
-                                temp_list.append({
-                                    "path": normalized_path,
-                                    "name": os.path.basename(normalized_path),
-                                    "num": line_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": normalized_path,
-                                    "was_modified": False,
-                                    "track_id": None
-                                })
-                    
-                    elif ext in ('.asx'):
-                        # Обработка ASX формата
-                        try:
-                            from xml.etree import ElementTree as ET
-                            tree = ET.parse(file_path)
-                            root = tree.getroot()
-                            
-                            for entry_num, entry in enumerate(root.findall('.//Entry'), 1):
-                                ref = entry.find('Ref')
-                                if ref is not None:
-                                    href = ref.get('href', '').strip()
-                                    if not href:
-                                        continue
-                                    
-                                    # Декодирование URL-encoded путей (если нужно)
-                                    clean_path = urllib.parse.unquote(href) if '%' in href else href
-                                    clean_path = os.path.normpath(clean_path).replace('\\', '/').strip('"\' \t')
-                                    
-                                    if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                        continue
-                                    
-                                    # Получаем название трека из тега Title или из имени файла
-                                    title = os.path.basename(clean_path) or entry.findtext('Title', '').strip()
-                                    
-                                    temp_list.append({
-                                        "path": clean_path,
-                                        "name": saxutils.unescape(title),  # Декодируем XML-entities
-                                        "num": entry_num,
-                                        "source": f"original_temp_list_{i}",
-                                        "original_path": clean_path,
-                                        "was_modified": False,
-                                        "track_id": None
-                                    })
-                                    
-                        except ET.ParseError as e:
-                            print(f"[ERROR] Ошибка разбора ASX файла {file_path}: {str(e)}")
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка обработки ASX файла {file_path}: {str(e)}")
-                    
-                    elif ext == '.xspf':
-                        # Обработка XSPF формата
-                        import xml.etree.ElementTree as ET
-                        import re
-                        
-                        try:
-                            # Сначала читаем файл как текст и экранируем проблемные символы
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            # Заменяем неэкранированные амперсанды (кроме XML-сущностей)
-                            content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
-                            
-                            # Парсим исправленный XML
-                            root = ET.fromstring(content)
-                            ns = {'ns': 'http://xspf.org/ns/0/'}
-                            
-                            for track_num, track in enumerate(root.findall('.//ns:track', ns), 1):
-                                location_element = track.find('ns:location', ns)
-                                
-                                if location_element is None or not location_element.text:
-                                    print(f"Warning: Empty <location> in track {track_num}")
-                                    continue
-                                
-                                # Получаем и очищаем location
-                                location = location_element.text.strip()
-                                
-                                # Сначала декодируем URL-кодирование
-                                location = urllib.parse.unquote(location)
-                                    
-                                # Удаляем file:/// если присутствует (с учетом возможного file://)
-                                if location.startswith(('file:///', 'file://')):
-                                    location = re.sub(r'^file:///*', '', location)
-                                  
-                                location = urllib.parse.unquote(location)  # Декодируем URL-кодирование
-                                
-                                # Получаем название трека (если есть)
-                                title = track.find('ns:title', ns)
-                                display_name = os.path.basename(location)
-                                
-                                clean_path = location.strip('"\' \t')
-                                
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                
-                                normalized_path = os.path.normpath(clean_path).replace('\\', '/')
-                                temp_list.append({
-                                    "path": normalized_path,
-                                    "name": display_name,
-                                    "num": track_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": normalized_path,
-                                    "was_modified": False,
-                                    "track_id": None
-                                })
-                        except ET.ParseError as e:
-                            print(f"[ERROR] Ошибка разбора XSPF файла {file_path}: {str(e)}")
-                            continue
-                    
-                    
-                    elif ext == '.wax':
-                        # Обработка WAX формата (SMIL-based)
-                        import xml.etree.ElementTree as ET
-                        import re
-                        import urllib.parse
-                        
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            # Экранируем специальные символы в XML
-                            content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
-                            
-                            # Парсим XML с учетом namespace
-                            namespaces = {
-                                'smil': 'http://www.w3.org/2001/SMIL20/Language'
-                            }
-                            root = ET.fromstring(content)
-                            
-                            track_num = 1
-                            for media in root.findall('.//smil:media', namespaces):
-                                if 'src' not in media.attrib or not media.attrib['src']:
-                                    print(f"Warning: Empty src attribute in track {track_num}")
-                                    continue
-                                
-                                # Обрабатываем путь
-                                location = media.attrib['src'].strip()
-                                
-                                # Удаляем file:///
-                                if location.startswith('file:///'):
-                                    location = location[8:]  # Удаляем file:///
-                                elif location.startswith('file://'):
-                                    location = location[7:]  # Удаляем file://
-                                
-                                # Декодируем URL-кодирование
-                                location = urllib.parse.unquote(location)
-                                
-                                # Получаем имя трека из параметров (если есть)
-                                title = None
-                                original_filename = None
-                                for param in media.findall('smil:param', namespaces):
-                                    if param.get('name') == 'title':
-                                        title = param.get('value')
-                                    elif param.get('name') == 'originalFilename':
-                                        original_filename = param.get('value')
-                                
-                                # Определяем display_name
-                                if title:
-                                    display_name = title
-                                elif original_filename:
-                                    display_name = os.path.splitext(original_filename)[0]
-                                else:
-                                    display_name = os.path.basename(location)
-                                
-                                # Нормализуем путь
-                                clean_path = os.path.normpath(location).replace('\\', '/')
-                                
-                                # Пропускаем неподдерживаемые форматы
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                
-                                # Добавляем трек в список
-                                temp_list.append({
-                                    "path": clean_path,
-                                    "name": os.path.basename(location),
-                                    "num": track_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": clean_path,
-                                    "was_modified": False,
-                                    "track_id": None
-                                })
-                                
-                                track_num += 1
-                                
-                        except ET.ParseError as e:
-                            print(f"[ERROR] Ошибка разбора WAX файла {file_path}: {str(e)}")
-                            continue
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка обработки WAX файла {file_path}: {str(e)}")
-                            continue                    
-                    
-                    
-                    elif ext == '.wvx':
-                        # Обработка WVX формата (SMIL-based)
-                        import xml.etree.ElementTree as ET
-                        import re
-                        import urllib.parse
-                        
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            
-                            # Экранируем специальные символы в XML
-                            content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
-                            
-                            # Парсим XML
-                            root = ET.fromstring(content)
-                            
-                            track_num = 1
-                            for media in root.findall('.//media'):
-                                if 'src' not in media.attrib or not media.attrib['src']:
-                                    print(f"Warning: Empty src attribute in track {track_num}")
-                                    continue
-                                
-                                # Обрабатываем путь
-                                location = media.attrib['src'].strip()
-                                
-                                # Удаляем file:/// и декодируем URL
-                                if location.startswith('file:///'):
-                                    location = urllib.parse.unquote(location[8:])
-                                elif location.startswith('file://'):
-                                    location = urllib.parse.unquote(location[7:])
-                                elif location.startswith(('http://', 'https://', 'mms://')):
-                                    # Для онлайн-ресурсов оставляем как есть
-                                    pass
-                                else:
-                                    location = urllib.parse.unquote(location)
-                                
-                                # Получаем метаданные
-                                title = media.attrib.get('title')
-                                artist = media.attrib.get('artist')
-                                album = media.attrib.get('albumTitle')
-                                
-                                # Формируем отображаемое имя
-                                if title and artist:
-                                    display_name = f"{artist} - {title}"
-                                elif title:
-                                    display_name = title
-                                else:
-                                    display_name = os.path.basename(location)
-                                
-                                # Для локальных файлов нормализуем путь
-                                if not location.startswith(('http://', 'https://', 'mms://')):
-                                    clean_path = os.path.normpath(location).replace('\\', '/')
-                                else:
-                                    clean_path = location
-                                
-                                # Пропускаем неподдерживаемые форматы для локальных файлов
-                                if not location.startswith(('http://', 'https://', 'mms://')):
-                                    if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                        continue
-                                
-                                # Добавляем трек в список
-                                temp_list.append({
-                                    "path": clean_path,
-                                    "name": os.path.basename(location),
-                                    "num": track_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": clean_path,
-                                    "was_modified": False,
-                                    "track_id": None,
-                                    "metadata": {
-                                        "artist": artist,
-                                        "title": title,
-                                        "album": album
-                                    }
-                                })
-                                
-                                track_num += 1
-                                
-                        except ET.ParseError as e:
-                            print(f"[ERROR] Ошибка разбора WVX файла {file_path}: {str(e)}")
-                            continue
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка обработки WVX файла {file_path}: {str(e)}")
-                            continue
-                    
-                    
-                    elif ext == '.json':
-                        # Обработка JSON формата
-                        try:
-                            playlist_data = json.load(f)
-                            
-                            # Проверяем структуру JSON
-                            if not isinstance(playlist_data, dict):
-                                raise ValueError("Invalid JSON playlist format: expected dictionary")
-                            
-                            # Получаем треки из разных возможных структур JSON
-                            tracks = playlist_data.get('tracks') or playlist_data.get('items') or []
-                            
-                            for track in tracks:
-                                # Поддержка разных форматов пути в JSON
-                                file_path = track.get('path') or track.get('file') or track.get('location') or ''
-                                
-                                if not file_path:
-                                    continue
-                                
-                                # Нормализация пути
-                                clean_path = os.path.normpath(file_path.strip('"\' \t')).replace('\\', '/')
-                                
-                                # Проверка расширения файла
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                
-                                # Добавляем трек во временный список
-                                temp_list.append({
-                                    "path": clean_path,
-                                    "name": os.path.basename(clean_path),
-                                    "num": track.get('position') or track.get('track_number') or len(temp_list) + 1,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": clean_path,
-                                    "was_modified": False,
-                                    "was_moved": False,
-                                    "was_restored": False,
-                                    "track_id": None,
-                                    "original_name": track.get('title') or track.get('name') or os.path.basename(clean_path)
-                                })
-                        except json.JSONDecodeError as e:
-                            print(f"[ERROR] Ошибка разбора JSON файла {filename}: {str(e)}")
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка обработки JSON файла {filename}: {str(e)}")
-                    
-                    elif ext == '.wpl':
-                        # Обработка WPL формата
-                        try:
-                            from xml.etree import ElementTree as ET
-                            tree = ET.parse(file_path)
-                            root = tree.getroot()
-                            
-                            # Находим все media-элементы в последовательности
-                            for entry_num, media in enumerate(root.findall('.//media'), 1):
-                                src = media.get('src', '').strip()
-                                if not src:
-                                    continue
-                                
-                                # Очистка пути (удаление лишних кавычек, пробелов)
-                                clean_path = os.path.normpath(src).replace('\\', '/').strip('"\' \t')
-                                
-                                # Проверка поддерживаемого формата файла
-                                if not any(clean_path.lower().endswith(ext) for ext in supported_formats):
-                                    continue
-                                
-                                # Получаем название трека из атрибута title или имени файла
-                                title = media.get('title', '').strip() or os.path.basename(clean_path)
-                                
-                                temp_list.append({
-                                    "path": clean_path,
-                                    "name": saxutils.unescape(title),  # Декодируем XML-entities
-                                    "num": entry_num,
-                                    "source": f"original_temp_list_{i}",
-                                    "original_path": clean_path,
-                                    "was_modified": False,
-                                    "track_id": None
-                                })
-                                
-                        except ET.ParseError as e:
-                            print(f"[ERROR] Ошибка разбора WPL файла {file_path}: {str(e)}")
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка обработки WPL файла {file_path}: {str(e)}")
-        
-        
-                    elif ext == '.xml':
-                        try:
-                            from xml.etree import ElementTree as ET
-                            import re
-                            
-                            # Читаем весь файл для обработки
-                            content = f.read()
-                            
-                            # Экранируем невалидные XML-символы
-                            content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
-                            
-                            # Удаляем все meta-теги с rel="filename" до парсинга
-                            content = re.sub(r'<meta\s+rel="filename"[^>]*>.*?</meta>', '', content, flags=re.IGNORECASE|re.DOTALL)
-                            
-                            try:
-                                root = ET.fromstring(content)
-                            except ET.ParseError:
-                                # Пробуем добавить корневой тег для неполных XML
-                                content = f'<root>{content}</root>'
-                                root = ET.fromstring(content)
-                            
-                            # Словарь для хранения найденных треков
-                            found_tracks = []
-                            
-                            # 1. Пытаемся обработать как iTunes Library
-                            if root.find('.//dict/dict') is not None:
-                                print("Detected iTunes Library format")
-                                tracks = []
-                                current_track = {}
-                                
-                                for elem in root.findall('.//dict/dict/dict'):
-                                    key = None
-                                    for child in elem:
-                                        if child.tag == 'key':
-                                            key = child.text
-                                        elif key:
-                                            current_track[key.lower()] = child.text if child.text else ''
-                                            key = None
-                                    
-                                    if 'location' in current_track:
-                                        location = current_track['location']
-                                        location = re.sub(r'^file:///*', '', location)
-                                        location = urllib.parse.unquote(location)
-                                        location = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
-                                        
-                                        name = current_track.get('name', os.path.basename(location))
-                                        found_tracks.append((location, name))
-                                    
-                                    current_track = {}
-                            
-                            # 2. Пытаемся обработать как XSPF
-                            elif root.find('.//track') is not None or root.find('.//Track') is not None:
-                                print("Detected XSPF format")
-                                for track in root.findall('.//track') + root.findall('.//Track'):
-                                    location = None
-                                    title = None
-                                    
-                                    # Получаем location
-                                    loc_elem = track.find('location') or track.find('Location')
-                                    if loc_elem is not None and loc_elem.text:
-                                        location = loc_elem.text.strip()
-                                        location = re.sub(r'^file:///*', '', location)
-                                        location = urllib.parse.unquote(location)
-                                        location = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
-                                    
-                                    # Получаем title
-                                    title_elem = track.find('title') or track.find('Title')
-                                    if title_elem is not None and title_elem.text:
-                                        title = title_elem.text.strip()
-                                    
-                                    if location:
-                                        found_tracks.append((
-                                            location,
-                                            title if title else os.path.splitext(os.path.basename(location))[0]
-                                        ))
-                            
-                            # 3. Общий поиск медиа-путей в XML
-                            else:
-                                print("Detected generic XML format")
-                                def find_paths(element):
-                                    paths = []
-                                    # Проверяем атрибуты
-                                    for attr, value in element.attrib.items():
-                                        if any(value.lower().endswith(ext) for ext in supported_formats):
-                                            clean_path = re.sub(r'^file:///*', '', value)
-                                            clean_path = urllib.parse.unquote(clean_path)
-                                            paths.append(clean_path)
-                                    
-                                    # Проверяем текст элемента
-                                    if element.text and any(element.text.strip().lower().endswith(ext) for ext in supported_formats):
-                                        clean_path = re.sub(r'^file:///*', '', element.text.strip())
-                                        clean_path = urllib.parse.unquote(clean_path)
-                                        paths.append(clean_path)
-                                    
-                                    # Рекурсивно проверяем дочерние элементы
-                                    for child in element:
-                                        paths.extend(find_paths(child))
-                                    
-                                    return paths
-                                
-                                paths = find_paths(root)
-                                found_tracks = [(path, os.path.splitext(os.path.basename(path))[0]) for path in paths]
-                            
-                            # Добавляем найденные треки в temp_list
-                            for track_num, (location, title) in enumerate(found_tracks, 1):
-                                if any(location.lower().endswith(ext) for ext in supported_formats):
-                                    normalized_path = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
-                                    temp_list.append({
-                                        "path": normalized_path,
-                                        "name": os.path.basename(location),
-                                        "num": track_num,
-                                        "source": f"original_temp_list_{i}",
-                                        "original_path": normalized_path,
-                                        "was_modified": False,
-                                        "track_id": None
-                                    })
-                                    print(f"Added track: {title} | {normalized_path}")
-                            
-                            print(f"Total tracks added from XML: {len(temp_list)}")
-                            
-                        except Exception as e:
-                            print(f"[ERROR] Ошибка загрузки XML плейлиста {file_path}: {str(e)}")
-                            import traceback
-                            traceback.print_exc()
-
-        
+                with profiler.span(f"read {os.path.basename(file_path)}"):
+                    temp_list = read_playlist(file_path, f"original_temp_list_{i}")
+                if temp_list is None:
+                    continue
+                if i == 1:
+                    # Алгоритм и режим перестановок загруженного порядка — из заголовка первого плейлиста
+                    header = read_header(file_path)
+                    self.current_algorithm = normalize_algorithm(header.get("algorithm"))
+                    self.current_swap_mode = normalize_swap_mode(header.get("swap_mode"))
+                    print(f"[DEBUG] Алгоритм плейлиста: {self.current_algorithm}, режим перестановок: {self.current_swap_mode}")
+                
                 # Сохраняем отдельный список
                 self.original_lists[f"original_temp_list_{i}"] = temp_list
                 self.original_list.extend(temp_list)
@@ -754,9 +281,11 @@ class PlaylistEditor:
         
         # Обновляем отображение
         self.display_tracks = self.original_list.copy()
-        self.update_display()
+        with profiler.span("display"):
+            self.update_display()
         print(f"[DEBUG] Загружено плейлистов = {count}")
-        self.save_initial_state()
+        with profiler.span("save_state"):
+            self.save_initial_state()
         
         # Генерируем имя плейлиста
         if self.file_paths:
@@ -781,6 +310,7 @@ class PlaylistEditor:
         self.base_list = None
         self.sorted_list = None
         self.shuffled_list = None
+        self.manually_edited = False
     
 
     def stable_hash(self, s):
@@ -804,6 +334,23 @@ class PlaylistEditor:
         
         print(f"[DEBUG] Формат файла сохранен: {self.format_m3u8}")        
 
+
+    def change_algorithm(self, event=None):
+        """Сохраняет выбранный алгоритм перемешивания (та же настройка, что в генераторе)"""
+        self.shuffle_algorithm = normalize_algorithm(self.algorithm_combobox.get())
+        try:
+            with open('playlist_settings.json', 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            settings = {}
+        
+        settings['shuffle_algorithm'] = self.shuffle_algorithm
+        
+        with open('playlist_settings.json', 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False, indent=4)
+        
+        print(f"[DEBUG] Выбран алгоритм: {self.shuffle_algorithm}")
+
             
     def create_github_link(self):
         """Создает кликабельную GitHub ссылку"""
@@ -1063,7 +610,7 @@ class PlaylistEditor:
                                     # Генерируем уникальный ID для трека
                                     track_id = str(uuid.uuid4())
                                     
-                                    new_track = {
+                                    new_track = TrackEntry({
                                         "path": normalized_path,
                                         "name": os.path.basename(normalized_path),
                                         "num": len(self.display_tracks) + len(new_tracks) + 1,
@@ -1074,7 +621,7 @@ class PlaylistEditor:
                                         "was_name_modified": False,
                                         "was_moved": False,
                                         "found": False
-                                    }
+                                    })
                                     new_tracks.append(new_track)
                                     total_added += 1
                                     
@@ -1097,7 +644,7 @@ class PlaylistEditor:
                                     # Генерируем уникальный ID для трека
                                     track_id = str(uuid.uuid4())
                                     
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": normalized_path,
                                         "name": os.path.basename(normalized_path),
                                         "num": line_num,
@@ -1105,7 +652,7 @@ class PlaylistEditor:
                                         "source": "added_from_drag_and_drop",
                                         "original_path": normalized_path,
                                         "was_modified": False,
-                                    })
+                                    }))
                                     total_added += 1
                                     
                                     
@@ -1136,7 +683,7 @@ class PlaylistEditor:
                                         # Генерируем уникальный ID для трека
                                         track_id = str(uuid.uuid4())
                                         
-                                        new_tracks.append({
+                                        new_tracks.append(TrackEntry({
                                             "path": clean_path,
                                             "name": saxutils.unescape(title),  # Декодируем XML-entities
                                             "num": entry_num,
@@ -1144,7 +691,7 @@ class PlaylistEditor:
                                             "source": "added_from_drag_and_drop",
                                             "original_path": clean_path,
                                             "was_modified": False
-                                        })
+                                        }))
                                         total_added += 1
                                         
                             except ET.ParseError as e:
@@ -1204,7 +751,7 @@ class PlaylistEditor:
                                     # Генерируем уникальный ID для трека
                                     track_id = str(uuid.uuid4())
                                     
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": normalized_path,
                                         "name": display_name,
                                         "num": track_num,
@@ -1212,7 +759,7 @@ class PlaylistEditor:
                                         "source": "added_from_drag_and_drop",
                                         "original_path": normalized_path,
                                         "was_modified": False
-                                    })
+                                    }))
                                     total_added += 1
                             except ET.ParseError as e:
                                 print(f"[ERROR] Ошибка разбора XSPF файла {file_path}: {str(e)}")
@@ -1285,7 +832,7 @@ class PlaylistEditor:
                                     track_id = str(uuid.uuid4())
                                     
                                     # Добавляем трек в список
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": clean_path,
                                         "name": os.path.basename(location),
                                         "num": track_num,
@@ -1293,7 +840,7 @@ class PlaylistEditor:
                                         "source": "added_from_drag_and_drop",
                                         "original_path": clean_path,
                                         "was_modified": False
-                                    })
+                                    }))
                                     total_added += 1
                                     track_num += 1
                                     
@@ -1369,7 +916,7 @@ class PlaylistEditor:
                                     track_id = str(uuid.uuid4())
                                     
                                     # Добавляем трек в список
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": clean_path,
                                         "name": os.path.basename(location),
                                         "num": track_num,
@@ -1382,7 +929,7 @@ class PlaylistEditor:
                                             "title": title,
                                             "album": album
                                         }
-                                    })
+                                    }))
                                     total_added += 1
                                     track_num += 1
                                     
@@ -1424,7 +971,7 @@ class PlaylistEditor:
                                     track_id = str(uuid.uuid4())
                                     
                                     # Добавляем трек во временный список
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": clean_path,
                                         "name": os.path.basename(clean_path),
                                         "num": track.get('position') or track.get('track_number') or len(tracks) + 1,
@@ -1435,7 +982,7 @@ class PlaylistEditor:
                                         "was_moved": False,
                                         "was_restored": False,
                                         "original_name": track.get('title') or track.get('name') or os.path.basename(clean_path)
-                                    })
+                                    }))
                                     total_added += 1
                             except json.JSONDecodeError as e:
                                 print(f"[ERROR] Ошибка разбора JSON файла {file_path}: {str(e)}")
@@ -1468,7 +1015,7 @@ class PlaylistEditor:
                                     # Генерируем уникальный ID для трека
                                     track_id = str(uuid.uuid4())
                                     
-                                    new_tracks.append({
+                                    new_tracks.append(TrackEntry({
                                         "path": clean_path,
                                         "name": saxutils.unescape(title),  # Декодируем XML-entities
                                         "num": entry_num,
@@ -1476,7 +1023,7 @@ class PlaylistEditor:
                                         "source": "added_from_drag_and_drop",
                                         "original_path": clean_path,
                                         "was_modified": False
-                                    })
+                                    }))
                                     total_added += 1
                             except ET.ParseError as e:
                                 print(f"[ERROR] Ошибка разбора WPL файла {file_path}: {str(e)}")
@@ -1595,7 +1142,7 @@ class PlaylistEditor:
                                         # Генерируем уникальный ID для трека
                                         track_id = str(uuid.uuid4())
                                         
-                                        new_tracks.append({
+                                        new_tracks.append(TrackEntry({
                                             "path": normalized_path,
                                             "name": os.path.basename(location),
                                             "num": track_num,
@@ -1603,7 +1150,7 @@ class PlaylistEditor:
                                             "source": "added_from_drag_and_drop",
                                             "original_path": normalized_path,
                                             "was_modified": False
-                                        })
+                                        }))
                                         total_added += 1
                                         print(f"Added track: {title} | {normalized_path}")
                                 
@@ -1629,6 +1176,7 @@ class PlaylistEditor:
             self.temp_list.extend(new_tracks)
             self.display_tracks = self.temp_list.copy()
             self.shuffled_list = None
+            self.manually_edited = True
             # Обновляем отображение
             self.update_display()
             self.save_state()
@@ -1673,7 +1221,7 @@ class PlaylistEditor:
                         # Генерируем уникальный ID для трека
                         track_id = str(uuid.uuid4())
                     
-                        new_track = {
+                        new_track = TrackEntry({
                             "path": normalized_path,
                             "name": file,
                             "num": len(self.display_tracks) + len(new_tracks) + 1,
@@ -1684,7 +1232,7 @@ class PlaylistEditor:
                             "was_name_modified": False,
                             "was_moved": False,
                             "found": False
-                        }
+                        })
                         new_tracks.append(new_track)
             
             if not new_tracks:
@@ -1698,6 +1246,7 @@ class PlaylistEditor:
             self.temp_list.extend(new_tracks)
             self.display_tracks = self.temp_list.copy()
             self.shuffled_list = None
+            self.manually_edited = True
             # Обновляем отображение
             self.update_display()
             self.save_state()
@@ -1985,6 +1534,17 @@ class PlaylistEditor:
         self.shuffle_label = ttk.Button(btn_frame, text=self.localization.tr("shuffle_button"), command=self.shuffle_tracks)
         self.shuffle_label.pack(side=tk.RIGHT, padx=5)
 
+        # Алгоритм перемешивания — общая настройка с генератором (exact здесь только для ручной расстановки)
+        self.algorithm_combobox = ttk.Combobox(
+            btn_frame,
+            values=[algorithm for algorithm in available_algorithms() if algorithm != EXACT],
+            state="readonly",
+            width=10
+        )
+        self.algorithm_combobox.pack(side=tk.RIGHT, padx=5)
+        self.algorithm_combobox.set(self.shuffle_algorithm)
+        self.algorithm_combobox.bind("<<ComboboxSelected>>", self.change_algorithm)
+
         self.language_label = tk.Label(btn_frame, text=self.localization.tr("language_label"))
         self.language_label.pack(side=tk.LEFT, padx=5)
     
@@ -2384,6 +1944,7 @@ class PlaylistEditor:
             self.display_tracks = new_display
             self.temp_list = self.display_tracks
             self.shuffled_list = None
+            self.manually_edited = True
             self._drag_data["y"] = y
             
             # Обновляем отображение
@@ -2457,6 +2018,7 @@ class PlaylistEditor:
                 self.display_tracks = new_display
                 self.temp_list = self.display_tracks
                 self.shuffled_list = None
+                self.manually_edited = True
                 self._drag_data["y"] = y
                 
                 # Обновляем отображение
@@ -2578,6 +2140,7 @@ class PlaylistEditor:
                 self.display_tracks = new_display
                 self.temp_list = self.display_tracks
                 self.shuffled_list = None
+                self.manually_edited = True
                 self.update_display()
                 
                 # Обновляем реальные индексы в block_items
@@ -2754,6 +2317,7 @@ class PlaylistEditor:
         # Обновляем основной список
         self.display_tracks = self.temp_list.copy()
         self.shuffled_list = None
+        self.manually_edited = True
         # Обновляем отображение
         self.update_display()
         
@@ -2844,6 +2408,7 @@ class PlaylistEditor:
         # Обновляем основной список
         self.display_tracks = self.temp_list.copy()
         self.shuffled_list = None
+        self.manually_edited = True
         # Обновляем отображение
         self.update_display()
         
@@ -2923,6 +2488,7 @@ class PlaylistEditor:
         
         # Сбрасываем перемешанную версию
         self.shuffled_list = None
+        self.manually_edited = True
     
     
     def update_display(self, selection_indices=None):
@@ -3125,6 +2691,7 @@ class PlaylistEditor:
         # Обновляем временные списки
         self.temp_list = self.display_tracks.copy()
         self.shuffled_list = None
+        self.manually_edited = True
         
         # Обновляем отображение с сохранением фильтра
         current_search = self.search_entry.get()
@@ -3231,42 +2798,41 @@ class PlaylistEditor:
 
 
 
-    def generate_seed(self, num_tracks, date):
+    def generate_seed(self, num_tracks, date, rng=None):
         """Генерация предсказуемого основного сида на основе даты и n!"""
-        import _pylong
-        sys.set_int_max_str_digits(0)
+        if rng is None:
+            rng = random.Random()
         try: 
-            # Вычисляем факториал
-            fact = math.factorial(num_tracks)
-            print(f"[DEBUG] Факториал {num_tracks}! = {fact} \n===================================================================")
+            # Сам n! не вычисляем: длина сида и остаток берутся через lgamma
+            print(f"[DEBUG] Длина {num_tracks}! = {factorial_digits(num_tracks)} цифр \n===================================================================")
             
             # Немного усложнено: дата + количество треков + случайное число из списка
             date_part = int(date.timestamp())
-            random_number = random.getrandbits(256)
-            random_nbr = random.getrandbits(128)
-            random_nbrr = random.getrandbits(64)
-            random_nbrrr = random.getrandbits(4)
+            random_number = rng.getrandbits(256)
+            random_nbr = rng.getrandbits(128)
+            random_nbrr = rng.getrandbits(64)
+            random_nbrrr = rng.getrandbits(4)
             number = [1, random_nbr, random_nbrr, 1, random_nbrrr]
 
             # Выбираем подходящий делитель
-            random_divisor = random.choice(number)
+            random_divisor = rng.choice(number)
             if random_divisor == 0 or (random_divisor > random_number and random_divisor != 1):
                 random_divisor = max([x for x in number if x <= random_number])
             
             result = (random_number // random_divisor)
             
-            predictable_num = (date_part * num_tracks + result + 1) % fact
+            predictable_num = mod_factorial(date_part * num_tracks + result + 1, num_tracks)
             
             print(f"[DEBUG] ГЕНЕРАЦИЯ ОСНОВНОГО СИДА \n=================================================================== \n Количество треков = {num_tracks} \n Дата = {date_part} \n Случайное число = {random_number} \n Делитель = {random_divisor} \n Разность = {result} \n Результат = {predictable_num}")
             # Форматируем в соответствии с выбранным форматом
             if self.seed_format_combobox.get() in ["Только цифры", "Digits only", "Solo dígitos", "Nur Zahlen", "Solo numeri", "Tylko cyfry", 
                             "Толькі лічбы", "Тільки цифри", "Тек сандар", "Само бројеви", "Chiffres uniquement", "Sólo números", "Apenas números", "Sadece rakamlar", "Apenas dígitos", "Alleen cijfers", "仅数字", "숫자만", "Samo številke", "Vetëm numra", "Samo brojevi", "Csak számok", "Doar cifre", "Pouze čísla", "Alleen cijfers", "Chiffres seulement", "Nur Zahlen", "Numbers only", "Aðeins tölur", "Ainult numbrid", "Bare tall", "Solo números", "केवल संख्याएँ", "数字のみ", "Kun tal", "Endast siffror", "Vain numerot", "Slegs Syfers", "Chỉ số", "Hanya angka", "Dhigití amháin", "Μόνο αριθμοί", "Само цифри", "Tik skaičiai", "Tikai cipari", "Numri biss", "Само бројки", "Iba číslice", "מספרים בלבד", "எண்கள் மட்டும்", "అంకెలు మాత్రమే", "Nombor sahaja", "ቁጥሮች ብቻ", "Nambari pekee", "Izinombolo kuphela"]:
-                return str(predictable_num).zfill(len(str(fact)))
+                return str(predictable_num).zfill(factorial_digits(num_tracks))
             else:
                 # Для буквенно-цифрового формата используем хеш
                 hash_obj = hashlib.sha256(str(predictable_num).encode())
                 print(f"[DEBUG] Хеш = {hash_obj}")
-                return hash_obj.hexdigest()[:len(str(fact))]
+                return hash_obj.hexdigest()[:factorial_digits(num_tracks)]
         
         except Exception as e:
             self.seed_info.config(text=f"{self.localization.tr('error')}: {str(e)}", fg="red")
@@ -3282,6 +2848,18 @@ class PlaylistEditor:
 
     def shuffle_tracks(self, num_swaps=None):
         """Перемешивание с фиксированным результатом для одинакового сида"""
+        profiler = StageProfiler(
+            "shuffle_tracks", enabled=self.debug_mode or self.profile_sidecar, count_opens=self.profile_sidecar
+        )
+        with profiler:
+            with profiler.span("total"):
+                self._shuffle_tracks(profiler)
+        if self.debug_mode:
+            profiler.report()
+        if profiler.enabled:
+            self.profiles["shuffle_tracks"] = profiler.summary()
+
+    def _shuffle_tracks(self, profiler):
         import _pylong
         import uuid
         sys.set_int_max_str_digits(0)
@@ -3290,6 +2868,8 @@ class PlaylistEditor:
             user_seed = self.seed_entry.get()
             step_value = self.step_entry.get()
             now = datetime.datetime.now()
+            # Свой генератор случайных чисел на каждое перемешивание: глобальный random не трогаем
+            rng = random.Random()
         
             # Определяем базовый список для работы
             if self.shuffled_list is not None:
@@ -3306,32 +2886,36 @@ class PlaylistEditor:
 
             # 1. Присваиваем временные ID и сохраняем полные копии оригинальных треков
             original_tracks = {}
-            for track in base_list:
-                temp_id = str(uuid.uuid4())
-                track["temp_id"] = temp_id
-                # Сохраняем ПОЛНУЮ КОПИЮ оригинального трека
-                original_tracks[temp_id] = track.copy()
-            
-            # 2. Гарантируем наличие original_path и применяем модификации
-            for track in base_list:
-                if "original_path" not in track:
-                    track["original_path"] = track["path"]
-                
-                # Применяем изменения только к текущему треку
-                if track["original_path"] in self.modified_paths:
-                    track["path"] = self.modified_paths[track["original_path"]]
-                    track["was_modified"] = True
+            with profiler.span("prepare"):
+                for track in base_list:
+                    temp_id = str(uuid.uuid4())
+                    track["temp_id"] = temp_id
+                    # Сохраняем ПОЛНУЮ КОПИЮ оригинального трека
+                    original_tracks[temp_id] = track.copy()
+                
+                # 2. Гарантируем наличие original_path и применяем модификации
+                for track in base_list:
+                    if "original_path" not in track:
+                        track["original_path"] = track["path"]
+                    
+                    # Применяем изменения только к текущему треку
+                    if track["original_path"] in self.modified_paths:
+                        track["path"] = self.modified_paths[track["original_path"]]
+                        track["was_modified"] = True
                 
             # Сортируем по именам (A-Z)
-            self.sorted_list = sorted(base_list, 
-                            key=lambda x: (not x['name'][0].isalpha(), x['name'].lower()))
+            with profiler.span("sort"):
+                self.sorted_list = sorted(base_list, 
+                                key=lambda x: (not x['name'][0].isalpha(), x['name'].lower()))
             
             num_tracks = len(self.sorted_list)
             self.temp_list = None  # Сбрасываем временный список после сортировки
+            self.manually_edited = False
             
             # Генерация сидов
             if not user_seed or user_seed == "0":
-                seed = self.generate_seed(num_tracks, now)
+                with profiler.span("seed"):
+                    seed = self.generate_seed(num_tracks, now, rng)
             else:
                 seed = user_seed
             
@@ -3341,14 +2925,19 @@ class PlaylistEditor:
             print(f"[DEBUG] Сид = {seed}")
             print(f"[DEBUG] Использованный сид = {seed_trimmed}")
            
-            # Перемешиваем sorted_list
-            tracks = [track.copy() for track in self.sorted_list]  # Глубокое копирование
-            self.shuffled_list, num_swaps = self.soft_shuffle(tracks, str(seed_trimmed))
+            intensity_value = self.intensity_entry.get().strip()
+            try:
+                intensity = int(intensity_value) if intensity_value else 0
+                if intensity < 0:
+                    raise ValueError
+            except ValueError:
+                self.seed_info.config(text=self.localization.tr("error_intensity"), fg="red")
+                return
             
-            print("[DEBUG] : Новый список ============================")
-            for i, track in enumerate(self.shuffled_list, 1):
-                print(f"{i}. {track['name']}\n                                                                     TempID: {track['temp_id']}       |       ID: {track.get('track_id')}")
-            print("===================================================================")            
+            # Перемешивание, перестановки пар и реверс блоков собираются в одну
+            # перестановку индексов sorted_list; треки копируются один раз уже в итоговом порядке
+            with profiler.span("shuffle"):
+                permutation, num_swaps = shuffle_permutation(str(seed_trimmed), num_tracks, self.shuffle_algorithm, intensity, self.swap_mode, rng)
             
             # Применяем реверс если нужно
             step = 0
@@ -3357,67 +2946,77 @@ class PlaylistEditor:
                     step = int(step_value)
                     if 0 < step:
                         if step == 1:
-                            step = random.randint(2, 21)
-                        
-                        # Реверсируем блоки в shuffled_list
+                            # Для legacy rng засеян сидом — шаг повторяется вместе с сидом
+                            step = rng.randint(2, 21)
                         print(f"[DEBUG] Реверс = {step}")
-                        for i in range(0, len(self.shuffled_list), step):
-                            self.shuffled_list[i:i+step] = reversed(self.shuffled_list[i:i+step])
+                        with profiler.span("reverse"):
+                            permutation = reverse_blocks(permutation, step)
                 except ValueError:
                     self.seed_info.config(text=self.localization.tr("error_reverse_step"), fg="red")
                     return
             
-            if step_value.strip(): 
+            with profiler.span("copy"):
+                self.shuffled_list = [self.sorted_list[i].copy() for i in permutation]
+            
+            if step_value.strip():
                 print(f"[DEBUG] : Новый список c реверсом {step} ============================")
+            else:
+                print("[DEBUG] : Новый список ============================")
+            with profiler.span("debug_list"):
                 for i, track in enumerate(self.shuffled_list, 1):
                     print(f"{i}. {track['name']}\n                                                                     TempID: {track['temp_id']}       |       ID: {track.get('track_id')}")
                 print("===================================================================")            
             
             
             # 3. Восстанавливаем состояния после перемешивания
-            for track in self.shuffled_list:
-                temp_id = track.get('temp_id')
-                if temp_id and temp_id in original_tracks:
-                    original_track = original_tracks[temp_id]
+            with profiler.span("restore"):
+                for track in self.shuffled_list:
+                    temp_id = track.get('temp_id')
+                    if temp_id and temp_id in original_tracks:
+                        original_track = original_tracks[temp_id]
                     
-                    # Восстанавливаем ВСЕ атрибуты из оригинального трека
-                    for key in ['track_id', 'was_restored', 'was_modified', 
-                               'was_name_modified', 'was_moved', 'found',
-                               'original_path', 'original_name']:
-                        if key in original_track:
-                            track[key] = original_track[key]
+                        # Восстанавливаем ВСЕ атрибуты из оригинального трека
+                        for key in ['track_id', 'was_restored', 'was_modified', 
+                                   'was_name_modified', 'was_moved', 'found',
+                                   'original_path', 'original_name']:
+                            if key in original_track:
+                                track[key] = original_track[key]
                     
-                    # Особые случаи:
-                    # - Путь восстанавливаем только если не был изменен
-                    if not track.get('was_modified', False):
-                        track['path'] = original_track['path']
+                        # Особые случаи:
+                        # - Путь восстанавливаем только если не был изменен
+                        if not track.get('was_modified', False):
+                            track['path'] = original_track['path']
                     
-                    # - Имя восстанавливаем только если не было изменено
-                    if not track.get('was_name_modified', False):
-                        track['name'] = original_track['name']
+                        # - Имя восстанавливаем только если не было изменено
+                        if not track.get('was_name_modified', False):
+                            track['name'] = original_track['name']
                     
-                    # - Для модифицированных треков сохраняем текущий путь
-                    if track.get('was_modified', False) and track['original_path'] in self.modified_paths:
-                        track['path'] = self.modified_paths[track['original_path']]
+                        # - Для модифицированных треков сохраняем текущий путь
+                        if track.get('was_modified', False) and track['original_path'] in self.modified_paths:
+                            track['path'] = self.modified_paths[track['original_path']]
                 
-                # Удаляем временные данные
-                track.pop('temp_id', None)
-                if 'was_moved' in track and not track['was_moved']:
-                    del track['was_moved']
+                    # Удаляем временные данные
+                    track.pop('temp_id', None)
+                    if 'was_moved' in track and not track['was_moved']:
+                        del track['was_moved']
 
                 
             # Обновляем отображение
             self.display_tracks = self.shuffled_list
-            self.update_display()
+            with profiler.span("display"):
+                self.update_display()
             
             # Обновляем информацию о сиде
             self.current_seed = seed_trimmed
+            self.current_algorithm = self.shuffle_algorithm
             self.current_swaps = num_swaps if num_swaps > 0 else None
+            self.current_swap_mode = self.swap_mode if self.shuffle_algorithm == LEGACY else SWAP_COMPAT
             self.current_reverse_step = step if step > 0 else None
                     
             print(f"[SUCCES] Перемешивание завершено")
             
-            self.save_state()
+            with profiler.span("save_state"):
+                self.save_state()
             # Показываем сообщение
             if step > 0:
                 if self.current_swaps:
@@ -3439,80 +3038,27 @@ class PlaylistEditor:
             
     def shuffle_files(self, files, seed_value):
         """Перемешивание с небольшими изменениями"""
-        random.seed(abs(self.stable_hash(str(seed_value))))
+        rng = random.Random(abs(self.stable_hash(str(seed_value))))
         files = files.copy()
-        random.shuffle(files)        
+        rng.shuffle(files)        
         return files
 
 
-    def soft_shuffle(self, files, seed_value, intensity=None):
-        """Перемешивание с небольшими изменениями"""
-        seed_hash = abs(self.stable_hash(str(seed_value)))
-        random.seed(seed_hash)
-        files = files.copy()
-        
-        print(f"[DEBUG] : Текущий список ============================")
-        for i, track in enumerate(files, 1):
-            print(f"{i}. {track['name']} \n                                                                     TempID: {track['temp_id']}       |       ID: {track.get('track_id')}")
-        print("===================================================================")
-        
-        random.shuffle(files)
-        
-        print(f"[DEBUG] : Перемешанный список ============================")
-        for i, track in enumerate(files, 1):
-            print(f"{i}. {track['name']} \n                                                                     TempID: {track['temp_id']}      |       ID: {track.get('track_id')}")
-        print("===================================================================")
-        
-        # Обработка шага реверса
-        intensity_value = self.intensity_entry.get()
-        intensity = 0
-        num_swaps = 0
-        if intensity_value.strip():
-            try:
-                intensity = int(intensity_value)
-                if intensity < 0:
-                    raise ValueError
-            except ValueError:
-                self.seed_info.config(text=self.localization.tr("error_intensity"), fg="red")
-                return            
-
-            
-        # Генерация intensity из сида, если не задано
-        if intensity != 0 and intensity is None:
-            return files, num_swaps
-
-        elif intensity == 1:
-            # Используем хеш сида для генерации значения 0.6-1.0
-            hash_val = (seed_hash % 10_000_000_000) / 10_000_000_000
-            intensity = 0.6 + 0.4 * hash_val  # Растягиваем на диапазон 0.6-1.0
-            
-            # Количество перестановок = 30% от числа треков (можно регулировать)
-            num_swaps = min(int(len(files) * intensity * 1.07), int(len(files)))
-            print(f"[DEBUG] Генерация intensity из сида = {intensity}")
-            print(f"[DEBUG] Количество перестановок = {num_swaps}")
-            for _ in range(num_swaps):
-                i, j = random.sample(range(len(files)), 2)
-                files[i], files[j] = files[j], files[i]
-                print(f"[DEBUG] Перемешано {i}<->{j}")
-            return files, num_swaps          
-
-        else:
-                
-            # Количество перестановок = 30% от числа треков (можно регулировать)
-            num_swaps = int(intensity)
-            print(f"[DEBUG] Генерация intensity из сида = {intensity}")
-            print(f"[DEBUG] Количество перестановок = {num_swaps}")
-            for _ in range(num_swaps):
-                i, j = random.sample(range(len(files)), 2)
-                files[i], files[j] = files[j], files[i]
-                print(f"[DEBUG] Перемешано {i}<->{j}")
-            return files, num_swaps
-
-
-
     def save_playlist(self):
-        import datetime
         """Сохранение плейлиста с учетом текущего состояния"""
+        profiler = StageProfiler(
+            "save_playlist", enabled=self.debug_mode or self.profile_sidecar, count_opens=self.profile_sidecar
+        )
+        with profiler:
+            with profiler.span("total"):
+                save_path = self._save_playlist(profiler)
+        if self.debug_mode:
+            profiler.report()
+        if self.profile_sidecar and save_path:
+            profiler.write_sidecar(save_path, related=list(self.profiles.values()))
+
+    def _save_playlist(self, profiler):
+        """Возвращает путь сохраненного файла или None при ошибке"""
         try:
             # Определяем, какие треки использовать для сохранения
             if self.shuffled_list is not None:
@@ -3532,7 +3078,7 @@ class PlaylistEditor:
                     del track['was_moved'] 
                 if 'was_added' in track:
                     del track['was_added']
-                    
+
             # Создаем копию текущего состояния перед сохранением
             current_state = {
                 'tracks': [track.copy() for track in source_list],
@@ -3542,34 +3088,49 @@ class PlaylistEditor:
             # Создаем список треков для сохранения
             saved_tracks = []
             
-            for idx, track in enumerate(source_list, 1):
-                # Сохраняем текущее состояние трека
-                new_track = track.copy()
-                new_track['num'] = idx
-                
-                # Если имя было изменено, используем новое имя в пути
-                if track.get('was_name_modified', False):
-                    dir_path = os.path.dirname(track['path'])
-                    new_path = os.path.join(dir_path, track['name'])
-                else:
-                    new_path = track['path']
-                
-                saved_tracks.append({
-                    "path": new_path,
-                    "name": track['name'],
-                    "num": idx,
-                    'track_id': None, #track.get('track_id', None)
-                    "original_path": track.get("original_path", track['path']),
-                    "original_name": track.get("original_name", track['name']),
-                    "was_modified": track.get("was_modified", False),
-                    "was_name_modified": track.get("was_name_modified", False),
-                    "was_moved": track.get("was_moved", False),
-                    "was_restored": track.get("was_restored", False),
-                    'found': track.get('found', False),
-                })
+            with profiler.span("prepare"):
+                for idx, track in enumerate(source_list, 1):
+                    # Сохраняем текущее состояние трека
+                    new_track = track.copy()
+                    new_track['num'] = idx
+                
+                    # Если имя было изменено, используем новое имя в пути
+                    if track.get('was_name_modified', False):
+                        dir_path = os.path.dirname(track['path'])
+                        new_path = os.path.join(dir_path, track['name'])
+                    else:
+                        new_path = track['path']
+                
+                    saved_tracks.append(TrackEntry({
+                        "path": new_path,
+                        "name": track['name'],
+                        "num": idx,
+                        'track_id': None, #track.get('track_id', None)
+                        "original_path": track.get("original_path", track['path']),
+                        "original_name": track.get("original_name", track['name']),
+                        "was_modified": track.get("was_modified", False),
+                        "was_name_modified": track.get("was_name_modified", False),
+                        "was_moved": track.get("was_moved", False),
+                        "was_restored": track.get("was_restored", False),
+                        'found': track.get('found', False),
+                    }))
             
             if not saved_tracks:
                 raise ValueError(self.localization.tr("error_no_tracks"))
+
+            # У ручной расстановки нет сида — записываем номер перестановки относительно
+            # сортировки генератора по сохраняемым путям. Без правок сид не пишется, номер 0 — тоже
+            has_seed = self.shuffled_list is not None
+            if not has_seed and self.manually_edited and len(saved_tracks) > 1:
+                with profiler.span("rank"):
+                    rank = rank_order(track['path'] for track in saved_tracks)
+                if rank != "0":
+                    self.current_seed = rank
+                    self.current_algorithm = EXACT
+                    self.current_swaps = None
+                    self.current_reverse_step = None
+                    has_seed = True
+                    print(f"[DEBUG] Сид ручной расстановки: {len(self.current_seed)} цифр")
                 
             playlist_name = self.name_entry.get().strip()
             if not playlist_name:
@@ -3583,322 +3144,24 @@ class PlaylistEditor:
             if not playlist_format:  # Защита на случай пустого значения
                 playlist_format = "m3u8"    
                 
-            save_path = os.path.join(script_dir, f"{playlist_name}.{playlist_format}")
-            
-            # Записываем файл
-            if playlist_format in ["m3u8", "m3u"]:  
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write("#EXTM3U\n")
-                    f.write("#Made with VolfLife's Playlist Generator\n")
-                    f.write(f"#GENERATED:{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"#PLAYLIST:{playlist_name}\n")
-                    
-                    # Добавляем информацию о сиде только если было перемешивание
-                    if self.shuffled_list is not None and hasattr(self, 'current_seed'):
-                        f.write(f"#SEED:{self.current_seed}\n")
-                        if self.current_swaps:
-                            f.write(f"#NUM_SWAPS:{self.current_swaps}\n")    
-                        if hasattr(self, 'current_reverse_step') and self.current_reverse_step:
-                            f.write(f"#REVERSE_STEP:{self.current_reverse_step}\n")
-                    
-                    f.write(f"#TRACKS:{len(saved_tracks)}\n\n")
-                    
-                    for track in saved_tracks:                        
-                        # Нормализуем путь
-                        clean_path = os.path.normpath(track['path'])
-                        
-                        # Получаем имя файла
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        f.write(f"#EXTINF:-1,{saxutils.escape(name_without_ext)}\n")
-                        f.write(f"{clean_path.replace('\\', '/')}\n")
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-                
-                
-            if playlist_format in ["txt"]:  
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write("#Made with VolfLife's Playlist Generator\n")
-                    f.write(f"#GENERATED:{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"#TRACKLIST:{playlist_name}\n")
-                    
-                    # Добавляем информацию о сиде только если было перемешивание
-                    if self.shuffled_list is not None and hasattr(self, 'current_seed'):
-                        f.write(f"#SEED:{self.current_seed}\n")
-                        if self.current_swaps:
-                            f.write(f"#NUM_SWAPS:{self.current_swaps}\n")    
-                        if hasattr(self, 'current_reverse_step') and self.current_reverse_step:
-                            f.write(f"#REVERSE_STEP:{self.current_reverse_step}\n")
-                    
-                    f.write(f"#TRACKS:{len(saved_tracks)}\n\n")
-                    
-                    for track in saved_tracks:
-                        escaped_path = track['path'].replace('\\', '/')
-                        f.write(f"{escaped_path}\n")
-                print(f"[DEBUG] Треклист сохранен: {playlist_name}.{playlist_format}") 
-            
-            
-            if playlist_format in ["pls"]:
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    # Заголовок плейлиста
-                    f.write("[playlist]\n")
-                    f.write(f";Made with VolfLife's Playlist Generator\n")
-                    f.write(f";GENERATED:{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f";PLAYLIST:{playlist_name}\n")
-                    
-                    # Добавляем информацию о сиде только если было перемешивание
-                    if self.shuffled_list is not None and hasattr(self, 'current_seed'):
-                        f.write(f"#SEED:{self.current_seed}\n")
-                        if self.current_swaps:
-                            f.write(f"#NUM_SWAPS:{self.current_swaps}\n")     
-                        if hasattr(self, 'current_reverse_step') and self.current_reverse_step:
-                            f.write(f"#REVERSE_STEP:{self.current_reverse_step}\n")
-                    
-                    f.write(f"NumberOfEntries={len(saved_tracks)}\n")
-                    f.write("Version=2\n\n")  # Версия формата PLS
-
-                    # Запись треков
-                    for i, track in enumerate(saved_tracks, 1):
-                        # Нормализуем путь
-                        clean_path = os.path.normpath(track['path'])
-                        # Получаем имя файла
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        f.write(f"File{i}={clean_path.replace('\\', '/')}\n")
-                        f.write(f"Title{i}={saxutils.escape(name_without_ext)}\n")
-                        f.write(f"Length{i}=-1\n")  # -1 = длительность определит плеер
-                        
-                        if i < len(saved_tracks):  # Добавляем пустую строку между треками (кроме последнего)
-                            f.write("\n")
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-              
-
-            if playlist_format in ["asx"]:
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    # Заголовок ASX
-                    f.write('<ASX Version="3.0">\n')
-                    f.write(f'<!-- Generated by VolfLife\'s Playlist Generator on {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} -->\n')
-                    f.write(f'<Title>{saxutils.escape(playlist_name)}</Title>\n')
-                    f.write(f'<Abstract>SEED:{self.current_seed}</Abstract>\n')
-                    
-                    if self.current_swaps is not None and self.current_swaps > 0:
-                        f.write(f'<Abstract>NUM_SWAPS:{self.current_swaps}</Abstract>\n')    
-                    if self.current_reverse_step is not None and self.current_reverse_step > 0:
-                        f.write(f'<Abstract>REVERSE_STEP:{self.current_reverse_step}</Abstract>\n')
-                    
-                    f.write(f'<Abstract>TRACKS:{len(saved_tracks)}</Abstract>\n\n')
-                    
-                    # Запись треков
-                    for track in saved_tracks:
-                        clean_path = os.path.normpath(track['path'])
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        f.write('<Entry>\n')
-                        f.write(f'  <Title>{saxutils.escape(name_without_ext)}</Title>\n')
-                        f.write(f'  <Ref href="{saxutils.escape(clean_path.replace("\\", "/"))}" />\n')
-                        f.write('</Entry>\n\n')
-                    
-                    f.write('</ASX>')
-                
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-              
-                
-            if playlist_format in ["xspf"]:
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                    f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                    f.write(f'  <title>{playlist_name}</title>\n')
-                    f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                    f.write(f'  <date>{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</date>\n')
-                    
-                    # Метаданные
-                    if hasattr(self, 'current_seed'):
-                        f.write('  <annotation>\n')
-                        f.write(f'    SEED:{self.current_seed}\n')
-                        if self.current_swaps:
-                            f.write(f'    NUM_SWAPS:{self.current_swaps}\n')
-                        if hasattr(self, 'current_reverse_step'):
-                            f.write(f'    REVERSE_STEP:{self.current_swaps}\n')
-                        f.write('  </annotation>\n')
-                    
-                    f.write('  <trackList>\n')
-                    
-                    for track in saved_tracks:                     
-                        # Нормализуем путь
-                        clean_path = os.path.normpath(track['path'])
-                        # Получаем имя файла
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        # Формируем file:// URL с правильным кодированием
-                        file_url = "file:///" + clean_path.replace('\\', '/')
-                    
-                        f.write('    <track>\n')
-                        f.write(f'      <location>{file_url}</location>\n')
-                        f.write(f'      <title>{saxutils.escape(name_without_ext)}</title>\n')
-                        f.write(f'      <meta rel="filename">{saxutils.escape(file_name)}</meta>\n')  # Добавляем оригинальное имя файла
-                        f.write('    </track>\n')
-                    
-                    f.write('  </trackList>\n')
-                    f.write('</playlist>\n')
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-
-            
-            if playlist_format in ["xspf+url"]:
-                # Определяем путь для сохранения
-                script_dir = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) \
-                          else os.path.dirname(os.path.abspath(__file__))
-                playlist_format = "xspf"      
-                save_path = os.path.join(script_dir, f"{playlist_name}.{playlist_format}")
-                
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                    f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                    f.write(f'  <title>{playlist_name}</title>\n')
-                    f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                    f.write(f'  <date>{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</date>\n')
-                    
-                    # Метаданные
-                    if hasattr(self, 'current_seed'):
-                        f.write('  <annotation>\n')
-                        f.write(f'    SEED:{self.current_seed}\n')
-                        if self.current_swaps:
-                            f.write(f'    NUM_SWAPS:{self.current_swaps}\n')    
-                        if hasattr(self, 'current_reverse_step'):
-                            f.write(f'    REVERSE_STEP:{self.current_reverse_step}\n')
-                        f.write('  </annotation>\n')
-                    
-                    f.write('  <trackList>\n')
-                    
-                    for track in saved_tracks:                     
-                        # Нормализуем путь
-                        clean_path = os.path.normpath(track['path'])
-                        # Получаем имя файла
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        # Формируем file:// URL с правильным кодированием
-                        file_url = "file:///" + urllib.parse.quote(clean_path.replace('\\', '/'))
-                    
-                        f.write('    <track>\n')
-                        f.write(f'      <location>{file_url}</location>\n')
-                        f.write(f'      <title>{saxutils.escape(name_without_ext)}</title>\n')
-                        f.write(f'      <meta rel="filename">{saxutils.escape(file_name)}</meta>\n')  # Добавляем оригинальное имя файла
-                        f.write('    </track>\n')
-                    
-                    f.write('  </trackList>\n')
-                    f.write('</playlist>\n')
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-
-            
-            if playlist_format in ["json"]:          
-                from datetime import datetime
-                playlist_data = {
-                    "meta": {
-                        "name": playlist_name,
-                        "generator": "VolfLife's Playlist Generator",
-                        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "seed": self.current_seed,
-                        "num_swaps": self.current_swaps if self.current_swaps and self.current_swaps > 0 else None,
-                        "reverse_step": self.current_reverse_step if self.current_reverse_step and self.current_reverse_step > 0 else None,
-                        "num_tracks": len(saved_tracks)
-                    },
-                    "tracks": []
-                }
-
-                for track in saved_tracks:
-                    file_path = os.path.normpath(track['path'])
-                    playlist_data["tracks"].append({
-                        "path": file_path.replace('\\', '/'),
-                        "filename": os.path.basename(file_path),
-                        "title": os.path.splitext(os.path.basename(track['path']))[0]
-                    })
-
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    json.dump(playlist_data, f, indent=4, ensure_ascii=False)
-                print(f"[DEBUG] Плейлист сохранен: {playlist_name}.{playlist_format}")
-                
-            
-            if playlist_format in ["wpl"]:
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write('<?wpl version="1.0"?>\n')
-                    f.write('<smil>\n')
-                    f.write('  <head>\n')
-                    f.write('    <meta name="Generator" content="VolfLife\'s Playlist Generator"/>\n')
-                    f.write(f'    <meta name="ItemCount" content="{len(saved_tracks)}"/>\n')
-                    f.write(f'    <title>{playlist_name}</title>\n')
-                    
-                    # Метаданные в виде комментариев (альтернатива для WPL)
-                    f.write('    <!--\n')
-                    f.write(f'      GENERATED:{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n')
-                    f.write(f'      SEED:{self.current_seed}\n')
-                    if self.current_swaps:
-                        f.write(f'      NUM_SWAPS:{self.current_swaps}\n')
-                    if self.current_reverse_step:
-                        f.write(f'      REVERSE_STEP:{self.current_reverse_step}\n')
-                    f.write('    -->\n')
-                    
-                    f.write('  </head>\n')
-                    f.write('  <body>\n')
-                    f.write('    <seq>\n')
-                    
-                    for track in saved_tracks:
-                        # Нормализуем путь и экранируем спецсимволы XML
-                        clean_path = os.path.normpath(track['path'])
-                        escaped_path = saxutils.escape(clean_path.replace('\\', '/'))
-                        
-                        # Записываем путь к файлу
-                        f.write(f'      <media src="{escaped_path}"/>\n')
-                    
-                    f.write('    </seq>\n')
-                    f.write('  </body>\n')
-                    f.write('</smil>\n')
-                
-                print(f"[DEBUG] Плейлист создан и сохранен: {playlist_name}.{playlist_format}")
-
-            
-            if playlist_format == 'xml':
-                with open(save_path, 'w', encoding='utf-8') as f:
-                    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                    f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                    f.write('  <title>{}</title>\n'.format(saxutils.escape(playlist_name)))
-                    f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                    f.write('  <date>{}</date>\n'.format(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-                    
-                    # Метаданные
-                    f.write('  <annotation>\n')
-                    f.write('    GENERATED:{}\n'.format(datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-                    if self.current_seed:
-                        f.write('    SEED:{}\n'.format(self.current_seed))
-                    if self.current_swaps:
-                        f.write('    NUM_SWAPS:{}\n'.format(self.current_swaps))
-                    if self.current_reverse_step:
-                        f.write('    REVERSE_STEP:{}\n'.format(self.current_reverse_step))
-                    f.write('    TRACKS:{}\n'.format(len(saved_tracks)))
-                    f.write('  </annotation>\n')
-                    
-                    f.write('  <trackList>\n')
-                    
-                    for i, track in enumerate(saved_tracks, 1):
-                        # Нормализуем путь
-                        clean_path = os.path.normpath(track['path'])
-                        file_name = os.path.basename(clean_path)
-                        name_without_ext = os.path.splitext(file_name)[0]
-                        
-                        f.write('    <track>\n')
-                        f.write('      <location>{}</location>\n'.format(
-                            urllib.parse.quote(saxutils.escape(clean_path.replace('\\', '/')))))
-                        f.write('      <title>{}</title>\n'.format(
-                            saxutils.escape(name_without_ext)))
-                        f.write('      <meta rel="trackNumber">{}</meta>\n'.format(i))
-                        f.write('    </track>\n')
-                    
-                    f.write('  </trackList>\n')
-                    f.write('</playlist>\n')
-                
-                print(f"[DEBUG] Плейлист создан и сохранен: {playlist_name}.{playlist_format}")
+            # Выбранный формат первым, дополнительные — следом; xspf и xspf+url вместе не пишутся
+            playlist_formats = merge_formats(playlist_format, self.export_formats)
+            
+            # Записываем файлы (путь без расширения: у каждого формата свое)
+            with profiler.span("write"):
+                # Без сида заголовок пишется без строк перемешивания
+                save_paths = write_playlists(
+                    os.path.join(script_dir, playlist_name), (track['path'] for track in saved_tracks), playlist_name,
+                    self.current_seed if has_seed else None, None, len(saved_tracks), datetime.datetime.now(),
+                    reverse_step=self.current_reverse_step if has_seed else None,
+                    num_swaps=self.current_swaps if has_seed else None,
+                    playlist_formats=playlist_formats,
+                    algorithm=self.current_algorithm if has_seed else None,
+                    swap_mode=self.current_swap_mode if has_seed else None,
+                    durability=self.durability,
+                    relative_to=self.relative_paths
+                )
+            save_path = save_paths[0]
             
             
             # Обновляем temp_list с сохранением original_path
@@ -3911,35 +3174,41 @@ class PlaylistEditor:
             
             # Обновляем отображение из saved_tracks, чтобы синхронизироваться
             self.display_tracks = saved_tracks.copy()
-            self.update_display()
+            with profiler.span("display"):
+                self.update_display()
             
-            # Формируем сообщение          
+            # Формируем сообщение (длинный сид ручной расстановки показываем сокращенно)
+            shown_seed = self.current_seed
+            if self.current_algorithm == EXACT and len(shown_seed) > 40:
+                shown_seed = f"{shown_seed[:16]}…{shown_seed[-16:]}"
             if self.current_reverse_step:
                 if self.current_swaps:
                     info_text = self.localization.tr("seed_info_intensity_step").format(
-                        seed=self.current_seed, step=self.current_reverse_step, num_swaps=self.current_swaps
+                        seed=shown_seed, step=self.current_reverse_step, num_swaps=self.current_swaps
                     )
                 else:
                     info_text = self.localization.tr("seed_info_step").format(
-                        seed=self.current_seed, step=self.current_reverse_step
+                        seed=shown_seed, step=self.current_reverse_step
                     )
             else:
                 if self.current_swaps:
                     info_text = self.localization.tr("seed_info_intensity").format(
-                        seed=self.current_seed, num_swaps=self.current_swaps
+                        seed=shown_seed, num_swaps=self.current_swaps
                     )
                 else:
                     info_text = self.localization.tr("seed_info_basic").format(
-                        seed=self.current_seed
+                        seed=shown_seed
                     )
             
-            self.seed_info.config(text=self.localization.tr("playlist_saved").format(name=f"{playlist_name}.{playlist_format}", info=info_text), fg="green")
+            # xspf+url сохраняется как .xspf — имена берем у записанных файлов
+            saved_names = ", ".join(os.path.basename(path) for path in save_paths)
+            self.seed_info.config(text=self.localization.tr("playlist_saved").format(name=saved_names, info=info_text), fg="green")
+            return save_path
             
         except Exception as e:
             self.seed_info.config(text=f"{self.localization.tr('error_save')}: {str(e)}", fg="red")
-    
+            return None
 
-    
     def create_path_editor_window(self, event=None):
         """Создает окно для изменения путей и имен выделенных треков"""
         if event:  # Если вызвано через клик мыши
@@ -4390,6 +3659,7 @@ class PlaylistEditor:
             self.save_state()
             
             self.shuffled_list = None
+            self.manually_edited = True
             self.show_message(self.localization.tr("names_updated"), "green")
             if self.path_editor:
                 self.path_editor.destroy()
@@ -7,20 +7,34 @@ import sys
 import random
 import datetime
 import hashlib
-import math
+import multiprocessing
 import string
 import json
 import locale
+import sqlite3
 import logging
+import queue
+import threading
+import time
 import traceback
-import urllib.parse
-import xml.sax.saxutils as saxutils
-from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 from FontLoader import FontLoader
 from Localization import Localization
+from LibraryIndex import LibraryIndex
+from DurationCache import DurationCache
+from LibraryScanner import LibraryScanner, ScanCancelled
+from TrackTable import TrackTable
+from PlaylistWriter import (
+    DURABILITY_FILE, PLAYLIST_FORMATS, format_duration, merge_formats, normalize_durability, normalize_relative_to
+)
+from PlaylistCore import PlaylistJob, plan_playlist, write_plan
+from StageProfiler import StageProfiler
+from SeedEngine import date_seed_value, factorial_digits
+from ShuffleEngine import (
+    LEGACY, SWAP_COMPAT, SWAP_MODES, available_algorithms, normalize_algorithm, normalize_swap_mode
+)
 from PlaylistEditor import PlaylistEditor 
 from tkinterdnd2 import TkinterDnD, DND_FILES
 
@@ -93,6 +107,15 @@ def handle_exception(type, value, traceback):
     messagebox.showerror("Критическая ошибка", str(value))
 
 
+class GenerationError(Exception):
+    """Ошибка генерации плейлиста с готовым текстом для пользователя"""
+
+
+# Название формата сида «только цифры» на всех языках интерфейса
+DIGITS_ONLY_FORMATS = ["Только цифры", "Digits only", "Solo dígitos", "Nur Zahlen", "Solo numeri", "Tylko cyfry",
+    "Толькі лічбы", "Тільки цифри", "Тек сандар", "Само бројеви", "Chiffres uniquement", "Sólo números", "Apenas números", "Sadece rakamlar", "Apenas dígitos", "Alleen cijfers", "仅数字", "숫자만", "Samo številke", "Vetëm numra", "Samo brojevi", "Csak számok", "Doar cifre", "Pouze čísla", "Alleen cijfers", "Chiffres seulement", "Nur Zahlen", "Numbers only", "Aðeins tölur", "Ainult numbrid", "Bare tall", "Solo números", "केवल संख्याएँ", "数字のみ", "Kun tal", "Endast siffror", "Vain numerot", "Slegs Syfers", "Chỉ số", "Hanya angka", "Dhigití amháin", "Μόνο αριθμοί", "Само цифри", "Tik skaičiai", "Tikai cipari", "Numri biss", "Само бројки", "Iba číslice", "מספרים בלבד", "எண்கள் மட்டும்", "అంకెలు మాత్రమే", "Nombor sahaja", "ቁጥሮች ብቻ", "Nambari pekee", "Izinombolo kuphela"]
+
+
 class PlaylistGenerator:
     def __init__(self, root, file_to_open=None, font_loader=None):
         
@@ -117,7 +140,25 @@ class PlaylistGenerator:
         self.format_m3u8 = "m3u8"  # Строка для хранения формата
         self.format_combobox = None  # Виджет Combobox
         self.formatted_duration = None
+        self.audio_total_size = 0
+        self.library_index = LibraryIndex()
+        self.duration_cache = DurationCache()
+        self.probe_workers = None  # None = по числу ядер
+        self.probe_executor = "process"
+        self.shuffle_algorithm = LEGACY
+        self.swap_mode = SWAP_COMPAT
+        self.profile_sidecar = False  # JSON профиля этапов рядом с плейлистом
+        self.export_formats = []  # Дополнительные форматы: тот же порядок пишется и в них
+        self.durability = DURABILITY_FILE  # fsync атомарной записи плейлиста: none / file / file+dir
+        self.relative_paths = None  # Пути относительно папки плейлиста (True) или указанной папки; None — абсолютные
+        # Фоновая задача (сканирование, подсчет длительности, генерация)
+        self.worker_thread = None
+        self.worker_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.task_on_done = None
+        self.task_started = 0.0
         self.load_settings()
+        self.scanner = LibraryScanner(self.library_index, self.duration_cache, self.probe_workers, self.probe_executor)
         self.root.title(self.localization.tr("window_title_generator"))
         
         self.create_widgets()
@@ -223,6 +264,22 @@ class PlaylistGenerator:
                     # Оставляем только существующие папки
                     self.last_folders = [f for f in settings['last_folders'] if self.is_valid_folders([f])]
                     print(f"[DEBUG] Выбраны папки: {self.last_folders}")          
+                
+                # Параметры параллельного чтения метаданных
+                if settings.get('probe_executor') in ["process", "thread"]:
+                    self.probe_executor = settings['probe_executor']
+                if isinstance(settings.get('probe_workers'), int) and settings['probe_workers'] > 0:
+                    self.probe_workers = settings['probe_workers']
+                self.shuffle_algorithm = normalize_algorithm(settings.get('shuffle_algorithm'))
+                if self.shuffle_algorithm not in available_algorithms():
+                    print(f"[WARNING] Алгоритм {self.shuffle_algorithm} недоступен (нет NumPy), используется {LEGACY}")
+                    self.shuffle_algorithm = LEGACY
+                self.swap_mode = normalize_swap_mode(settings.get('swap_mode'))
+                self.profile_sidecar = settings.get('profile_sidecar') is True
+                if isinstance(settings.get('export_formats'), list):
+                    self.export_formats = [f for f in settings['export_formats'] if f in PLAYLIST_FORMATS]
+                self.durability = normalize_durability(settings.get('durability'))
+                self.relative_paths = normalize_relative_to(settings.get('relative_paths'))
                             
                 return settings
         except (FileNotFoundError, json.JSONDecodeError):
@@ -244,7 +301,15 @@ class PlaylistGenerator:
             'language': self.localization.current_lang,
             'last_folders': self.last_folders,
             'visited_github': self.visited_github,
-            'playlist_format': self.format_m3u8
+            'playlist_format': self.format_m3u8,
+            'probe_workers': self.probe_workers,
+            'probe_executor': self.probe_executor,
+            'shuffle_algorithm': self.shuffle_algorithm,
+            'swap_mode': self.swap_mode,
+            'profile_sidecar': self.profile_sidecar,
+            'export_formats': self.export_formats,
+            'durability': self.durability,
+            'relative_paths': self.relative_paths
         }
         try:
             with open('playlist_settings.json', 'w', encoding='utf-8') as f:
@@ -255,13 +320,7 @@ class PlaylistGenerator:
     def load_time(self):
         # Вызываем подсчет времени для загруженных папок
          if self.last_folders:
-            total_seconds = self.time_count(self.last_folders)
-            if total_seconds > 0:
-                self.formatted_duration = self.format_duration(total_seconds)
-                self.seed_info.config(
-                    text=self.localization.tr("total_duration").format(duration=self.formatted_duration),
-                    fg="green"
-                )     
+            self.start_duration_count(self.last_folders)
                 
                 
     def open_github(self, event=None):
@@ -299,6 +358,18 @@ class PlaylistGenerator:
         self.github_link.bind("<Button-1>", self.open_github)
         
         
+    def change_algorithm(self, event=None):
+        """Обработчик изменения алгоритма перемешивания"""
+        self.shuffle_algorithm = normalize_algorithm(self.algorithm_combobox.get())
+        print(f"[DEBUG] Выбран алгоритм: {self.shuffle_algorithm}")
+        self.save_settings()
+
+    def change_swap_mode(self, event=None):
+        """Обработчик изменения режима перестановок пар"""
+        self.swap_mode = normalize_swap_mode(self.swap_mode_combobox.get())
+        print(f"[DEBUG] Выбран режим перестановок: {self.swap_mode}")
+        self.save_settings()
+
     def change_format(self, event=None):
         """Сохраняет настройки выбранного формата файла"""
         self.format_m3u8 = self.format_combobox.get()
@@ -344,6 +415,7 @@ class PlaylistGenerator:
             self.shadow_seed_check.config(text=self.localization.tr("shadow_seed_check"))
             self.language_label.config(text=self.localization.tr("language_label"))
             self.generate_btn.config(text=self.localization.tr("generate_button"))
+            self.cancel_btn.config(text=self.localization.tr("cancel_button"))
         
             # Обновляем список форматов сида
             self.seed_format['values'] = self.localization.get_seed_format_options()
@@ -354,11 +426,8 @@ class PlaylistGenerator:
 
             # Получаем текущее значение формата сида
             current_seed_format = self.seed_format.get()
-            # Список форматов, при которых текущее значение не должно меняться
-            numeric_formats = ["Только цифры", "Digits only", "Solo dígitos", "Nur Zahlen", "Solo numeri", "Tylko cyfry", 
-                            "Толькі лічбы", "Тільки цифри", "Тек сандар", "Само бројеви", "Chiffres uniquement", "Sólo números", "Apenas números", "Sadece rakamlar", "Apenas dígitos", "Alleen cijfers", "仅数字", "숫자만", "Samo številke", "Vetëm numra", "Samo brojevi", "Csak számok", "Doar cifre", "Pouze čísla", "Alleen cijfers", "Chiffres seulement", "Nur Zahlen", "Numbers only", "Aðeins tölur", "Ainult numbrid", "Bare tall", "Solo números", "केवल संख्याएँ", "数字のみ", "Kun tal", "Endast siffror", "Vain numerot", "Slegs Syfers", "Chỉ số", "Hanya angka", "Dhigití amháin", "Μόνο αριθμοί", "Само цифри", "Tik skaičiai", "Tikai cipari", "Numri biss", "Само бројки", "Iba číslice", "מספרים בלבד", "எண்கள் மட்டும்", "అంకెలు మాత్రమే", "Nombor sahaja", "ቁጥሮች ብቻ", "Nambari pekee", "Izinombolo kuphela"]
             # Проверяем, находится ли текущее значение в списке форматов
-            if current_seed_format in numeric_formats:
+            if current_seed_format in DIGITS_ONLY_FORMATS:
                 # Если текущее значение в списке, не меняем его
                 self.seed_format['values'] = self.localization.get_seed_format_options()
                 self.seed_format.current(0)
@@ -430,6 +499,17 @@ class PlaylistGenerator:
 
         self.seed_entry.bind("<Button-3>", self.clear_seed_entry)
 
+        # Алгоритм перемешивания (legacy — как во всех прежних плейлистах)
+        self.algorithm_combobox = ttk.Combobox(
+            self.root,
+            values=list(available_algorithms()),
+            state="readonly",
+            width=10
+        )
+        self.algorithm_combobox.set(self.shuffle_algorithm)
+        self.algorithm_combobox.grid(row=2, column=2, padx=1, pady=5, sticky="w")
+        self.algorithm_combobox.bind("<<ComboboxSelected>>", self.change_algorithm)
+
         # Поле для перестановок
         self.swaps_label = tk.Label(self.root, text=self.localization.tr("intensity_label"))
         self.swaps_label.grid(row=3, column=0, sticky="w", padx=10, pady=5)
@@ -438,6 +518,17 @@ class PlaylistGenerator:
 
         self.intensity_entry.bind("<Button-3>", self.clear_intensity_entry)
 
+        # Режим перестановок пар (compat — та же последовательность, что у старых сидов)
+        self.swap_mode_combobox = ttk.Combobox(
+            self.root,
+            values=list(SWAP_MODES),
+            state="readonly",
+            width=10
+        )
+        self.swap_mode_combobox.set(self.swap_mode)
+        self.swap_mode_combobox.grid(row=3, column=2, padx=1, pady=5, sticky="w")
+        self.swap_mode_combobox.bind("<<ComboboxSelected>>", self.change_swap_mode)
+
         # Выбор формата сида
         self.seed_format_label = tk.Label(self.root, text=self.localization.tr("seed_format_label"))
         self.seed_format_label.grid(row=3, column=1, sticky="w", padx=85, pady=5)
@@ -536,6 +627,21 @@ class PlaylistGenerator:
         self.format_combobox.set(self.format_m3u8)
         self.format_combobox.bind("<<ComboboxSelected>>", self.change_format)
         
+        # Прогресс фоновой задачи (показывается только во время работы)
+        self.progress_frame = tk.Frame(self.root)
+        self.progress_frame.grid(row=7, column=0, columnspan=3, padx=10, sticky="ew")
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode="indeterminate", length=250)
+        self.progress_bar.pack(side=tk.LEFT)
+        self.progress_label = tk.Label(self.progress_frame, text="", fg="gray")
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = ttk.Button(
+            self.progress_frame,
+            text=self.localization.tr("cancel_button"),
+            command=self.cancel_background_task
+        )
+        self.cancel_btn.pack(side=tk.RIGHT)
+        self.progress_frame.grid_remove()
+        
         # Поле для вывода информации
         self.seed_info = tk.Label(self.root, text="", fg="green", bg=self.root.cget('bg'))
         self.seed_info.grid(row=8, column=0, columnspan=3, pady=5)
@@ -750,116 +856,147 @@ class PlaylistGenerator:
             self.folder_entry.insert(0, display_text)
             # Вызываем подсчет времени для ВСЕХ выбранных папок
             if self.last_folders:
-                total_seconds = self.time_count(self.last_folders)  # Передаем все папки, а не только последнюю
-                if total_seconds > 0:
-                    self.formatted_duration = self.format_duration(total_seconds)
-                    self.seed_info.config(
-                        text=self.localization.tr("total_duration").format(duration=self.formatted_duration),
-                        fg="green"
-                    )
-                print(f"[DEBUG] Общая продолжительность: {self.formatted_duration}")
+                self.start_duration_count(self.last_folders)  # Передаем все папки, а не только последнюю
             self.save_settings()
 
 
     def format_duration(self, total_seconds):
         """Форматирует продолжительность в формате Y:M:W:D:H:M:S, пропуская нулевые значения"""
-        # Константы времени
-        MINUTE = 60
-        HOUR = 60 * MINUTE
-        DAY = 24 * HOUR
-        WEEK = 7 * DAY
-        MONTH = 30 * DAY  # Упрощенное значение
-        YEAR = 365 * DAY   # Упрощенное значение
-        
-        # Вычисляем каждую единицу времени
-        years = int(total_seconds // YEAR)
-        remaining = total_seconds % YEAR
-        
-        months = int(remaining // MONTH)
-        remaining %= MONTH
-        
-        weeks = int(remaining // WEEK)
-        remaining %= WEEK
-        
-        days = int(remaining // DAY)
-        remaining %= DAY
-        
-        hours = int(remaining // HOUR)
-        remaining %= HOUR
-        
-        minutes = int(remaining // MINUTE)
-        seconds = remaining % MINUTE
-        
-        # Собираем только значимые значения
-        parts = []
-        if years > 0:
-            parts.append(f"{years}")
-        if months > 0 or parts:  # Добавляем месяцы если есть годы
-            parts.append(f"{months}")
-        if weeks > 0 or parts:  # Добавляем недели если есть более крупные единицы
-            parts.append(f"{weeks}")
-        if days > 0 or parts:
-            parts.append(f"{days}")
-        if hours > 0 or parts:
-            parts.append(f"{hours:02d}")
-        if minutes > 0 or parts:
-            parts.append(f"{minutes:02d}")
-        
-        # Секунды всегда добавляем с двумя знаками после запятой
-        parts.append(f"{seconds:05.2f}")  # Формат 35.00
-        
-        # Объединяем части через двоеточие
-        formatted = ":".join(parts)
-        
-        # Для случаев, когда продолжительность меньше минуты
-        if "H" not in formatted and "M" not in formatted and "S" in formatted:
-            # Формат MM:SS.00 (например 35.00 -> 00:35.00)
-            seconds_only = float(formatted.replace("S", ""))
-            minutes_part = int(seconds_only // 60)
-            seconds_part = seconds_only % 60
-            formatted = f"{minutes_part:02d}:{seconds_part:05.2f}"
-        elif "H" not in formatted and "M" in formatted and "S" in formatted:
-            # Формат MM:SS.00 (например 17M:35.00S -> 17:35.00)
-            m_part = formatted.split("M")[0]
-            s_part = formatted.split(":")[-1].replace("S", "")
-            formatted = f"{int(m_part):02d}:{float(s_part):05.2f}"
-        
-        return formatted
-
-    def time_count(self, folders):
+        return format_duration(total_seconds)
+
+    def start_duration_count(self, folders):
+        """Запускает подсчет длительности папок в фоновом потоке"""
+        self.run_background_task(self.time_count, list(folders), on_done=self.on_duration_counted)
+
+    def on_duration_counted(self, total_seconds):
+        if total_seconds > 0:
+            self.formatted_duration = self.format_duration(total_seconds)
+            self.seed_info.config(
+                text=self.localization.tr("total_duration").format(duration=self.formatted_duration),
+                fg="green"
+            )
+        print(f"[DEBUG] Общая продолжительность: {self.formatted_duration}")
+
+    def run_background_task(self, task, *args, on_done=None):
+        """Выполняет task(*args, progress=..., cancel_event=...) в фоновом потоке.
+
+        Поток не трогает виджеты: прогресс и результат передаются через очередь,
+        которую главный цикл Tk забирает в poll_background_task.
+        """
+        if self.worker_thread is not None and self.worker_thread.is_alive():
+            print("[DEBUG] Фоновая задача уже выполняется")
+            return False
+
+        self.cancel_event = threading.Event()
+        self.worker_queue = queue.Queue()
+        self.task_on_done = on_done
+        self.task_started = time.monotonic()
+        worker_queue = self.worker_queue
+
+        def report(done, total):
+            worker_queue.put(("progress", done, total))
+
+        def worker():
+            try:
+                result = task(*args, progress=report, cancel_event=self.cancel_event)
+            except ScanCancelled:
+                worker_queue.put(("cancelled", None))
+            except Exception as e:
+                traceback.print_exc()
+                worker_queue.put(("error", e))
+            else:
+                worker_queue.put(("done", result))
+
+        self.show_progress()
+        self.worker_thread = threading.Thread(target=worker, daemon=True)
+        self.worker_thread.start()
+        self.root.after(100, self.poll_background_task)
+        return True
+
+    def cancel_background_task(self):
+        """Просит фоновую задачу остановиться"""
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        print("[DEBUG] Запрошена отмена фоновой задачи")
+
+    def poll_background_task(self):
+        """Забирает сообщения фонового потока (вызывается из главного цикла Tk)"""
+        finished = None
+        try:
+            while True:
+                message = self.worker_queue.get_nowait()
+                if message[0] == "progress":
+                    self.update_progress(message[1], message[2])
+                else:
+                    finished = message
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.root.after(100, self.poll_background_task)
+            return
+
+        self.hide_progress()
+        status, result = finished
+        if status == "done":
+            if self.task_on_done:
+                self.task_on_done(result)
+        elif status == "cancelled":
+            print("[DEBUG] Фоновая задача отменена")
+            self.seed_info.config(text=self.localization.tr("scan_cancelled"), fg="red")
+        elif isinstance(result, GenerationError):
+            self.seed_info.config(text=str(result), fg="red")
+        else:
+            self.seed_info.config(text=f"{self.localization.tr('error')}: {result}", fg="red")
+
+    def show_progress(self):
+        self.progress_bar.config(mode="indeterminate", value=0)
+        self.progress_bar.start(15)
+        self.progress_label.config(text="")
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress_frame.grid()
+        self.browse_btn.config(state=tk.DISABLED)
+        self.generate_btn.config(state=tk.DISABLED)
+
+    def hide_progress(self):
+        self.progress_bar.stop()
+        self.progress_frame.grid_remove()
+        self.browse_btn.config(state=tk.NORMAL)
+        self.generate_btn.config(state=tk.NORMAL)
+
+    def update_progress(self, done, total):
+        """Обновляет полосу прогресса: файлов в секунду и оставшееся время"""
+        elapsed = time.monotonic() - self.task_started
+        rate = done / elapsed if elapsed > 0 else 0
+        if total:
+            if str(self.progress_bar.cget("mode")) != "determinate":
+                # Началось чтение длительностей — скорость считаем с этого момента
+                self.progress_bar.stop()
+                self.progress_bar.config(mode="determinate", maximum=total)
+                self.task_started = time.monotonic()
+                rate = 0
+            self.progress_bar.config(value=done)
+            if rate > 0:
+                eta = time.strftime("%M:%S", time.gmtime((total - done) / rate))
+            else:
+                eta = "--:--"
+            self.progress_label.config(text=f"{done}/{total} · {rate:.0f}/s · ETA {eta}")
+        else:
+            self.progress_label.config(text=f"{done} · {rate:.0f}/s")
+
+    def time_count(self, folders, progress=None, cancel_event=None):
         """Подсчитывает общую продолжительность аудиофайлов в выбранных папках (в секундах)"""
-        from mutagen import File
-        from mutagen.flac import FLAC
-        from mutagen.mp3 import MP3
-        from mutagen.ogg import OggFileType
-        from mutagen.wave import WAVE
-        from mutagen.aiff import AIFF
-        from mutagen.mp4 import MP4
-        from mutagen.asf import ASF
-        
         total_seconds = 0.0
-        audio_extensions = {
-                # Аудио
-                '.mp3', '.flac', '.ogg', '.wav', '.m4a', '.aac', '.wma', '.opus', '.aiff', '.aif', '.alac', '.dsf', '.dff', '.mka', '.ac3', '.dts',
-                # Видео
-                '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
-            }
-        
-        for folder in folders:  # Обрабатываем каждую папку в списке
-            try:
-                for root, _, files in os.walk(folder):
-                    for file in files:
-                        if Path(file).suffix.lower() in audio_extensions:
-                            full_path = os.path.join(root, file)
-                            try:
-                                audio = File(full_path)
-                                if audio and hasattr(audio, 'info'):
-                                    total_seconds += audio.info.length
-                            except Exception as e:
-                                print(f"[WARNING] Ошибка чтения {file}: {e}")
-            except (OSError, UnicodeDecodeError) as e:
-                print(f"[ERROR] Ошибка сканирования {folder}: {e}")
-            
+        # Чтение тегов в пуле процессов не попадает в счетчики ввода-вывода этого процесса
+        profiler = StageProfiler("time_count", enabled=self.debug_mode, count_opens=False)
+        try:
+            with profiler, profiler.span("durations"):
+                for record in self.scanner.scan(folders, with_durations=True, progress=progress, cancel_event=cancel_event):
+                    if record.duration:
+                        total_seconds += record.duration
+        except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+            print(f"[ERROR] Ошибка сканирования {folders}: {e}")
+        profiler.report()
         return total_seconds
 
     
@@ -868,105 +1005,40 @@ class PlaylistGenerator:
         return int(hashlib.md5(str(s).encode()).hexdigest(), 16) % (10**12)
     
 
-    def get_audio_files(self, folders):
-        """Принимает список папок, возвращает общий список аудиофайлов всех папок"""
-        audio_extensions = {
-                # Аудио
-                '.mp3', '.flac', '.ogg', '.wav', '.m4a', '.aac', '.wma', '.opus', '.aiff', '.aif', '.alac', '.dsf', '.dff', '.mka', '.ac3', '.dts',
-                # Видео
-                '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
-            }
-        audio_files = []
-        for folder in folders:
-            try:
-                for root, _, files in os.walk(folder):
-                    for file in files:
-                        if Path(file).suffix.lower() in audio_extensions:
-                            full_path = os.path.join(root, file)
-                            try:
-                                with open(full_path, 'rb'):
-                                    pass
-                                audio_files.append(full_path)
-                            except (IOError, OSError):
-                                continue
-            except (OSError, UnicodeDecodeError) as e:
-                print(self.localization.tr("error_scanning_folder").format(error=e))
-                continue
-        
-        # Сортируем аудиофайлы сначала по ASCII символам, затем A-Z
-        # Т.к. sort стабилен, сортируем дважды
-        audio_files.sort(key=lambda x: (not os.path.basename(x)[0].isalpha(), os.path.basename(x).lower()))
-        return audio_files
-
-
-    def generate_seed(self, num_tracks, date, total_size, iteration=0):
-        """Генерация предсказуемого основного сида на основе даты и n!"""
-        import _pylong
-        sys.set_int_max_str_digits(0)
-        # Вычисляем факториал
-        fact = math.factorial(num_tracks)
-        print(f"[DEBUG] Факториал {num_tracks}! = {fact} \n===================================================================")
-        
-        # Предсказуемая часть: дата + количество треков
-        date_part = int(date.timestamp())
-        base_seed = (date_part * num_tracks * total_size) % fact
-        
-        if not hasattr(self, '_base_seed'):
-            self._base_seed = (int(date.timestamp()) * num_tracks * total_size) % fact
-            
-        # Добавляем итерацию для плавного изменения
-        modified_seed = self._base_seed + iteration % fact
-        
-        print(f"[DEBUG] ГЕНЕРАЦИЯ ОСНОВНОГО СИДА \n=================================================================== \n Дата = {date_part} \n Размер = {total_size} \n Количество треков = {num_tracks} \n Базовый сид = {base_seed} \n Результат = {modified_seed}")
-        # Форматируем в соответствии с выбранным форматом
-        if self.seed_format.get() in ["Только цифры", "Digits only", "Solo dígitos", "Nur Zahlen", "Solo numeri", "Tylko cyfry", 
-                            "Толькі лічбы", "Тільки цифри", "Тек сандар", "Само бројеви", "Chiffres uniquement", "Sólo números", "Apenas números", "Sadece rakamlar", "Apenas dígitos", "Alleen cijfers", "仅数字", "숫자만", "Samo številke", "Vetëm numra", "Samo brojevi", "Csak számok", "Doar cifre", "Pouze čísla", "Alleen cijfers", "Chiffres seulement", "Nur Zahlen", "Numbers only", "Aðeins tölur", "Ainult numbrid", "Bare tall", "Solo números", "केवल संख्याएँ", "数字のみ", "Kun tal", "Endast siffror", "Vain numerot", "Slegs Syfers", "Chỉ số", "Hanya angka", "Dhigití amháin", "Μόνο αριθμοί", "Само цифри", "Tik skaičiai", "Tikai cipari", "Numri biss", "Само бројки", "Iba číslice", "מספרים בלבד", "எண்கள் மட்டும்", "అంకెలు మాత్రమే", "Nombor sahaja", "ቁጥሮች ብቻ", "Nambari pekee", "Izinombolo kuphela"]:
-            return str(modified_seed).zfill(len(str(fact)))
-        else:
-            # Для буквенно-цифрового формата используем хеш
-            hash_obj = hashlib.sha256(str(modified_seed).encode())
-            return hash_obj.hexdigest()[:len(str(fact))]
-        
-        
-        
-    def generate_shadow_seed(self, num_tracks, seed_trimmed):
-        """Генерация непредсказуемого теневого сида"""
-        import _pylong
-        sys.set_int_max_str_digits(0)
-        
-        # Вычисляем факториал
-        fact = math.factorial(num_tracks)
-        
-        # Непредсказуемая часть: хеш основного сида + случайное число
-        random_part = random.getrandbits(256)
-        random_nbr = random.getrandbits(128)
-        random_nbrr = random.getrandbits(64)
-        random_nbrrr = random.getrandbits(4)
-        number = [1, random_nbr, random_nbrr, 1, random_nbrrr]
-        random_divisor = random.choice(number)
-        
-        # Выбираем подходящий делитель
-        random_divisor = random.choice(number)
-        if random_divisor == 0 or (random_divisor > random_part and random_divisor != 1):
-            random_divisor = max([x for x in number if x <= random_part])
-        
-        result = (random_part // random_divisor)
-        
-        seed_num = int((seed_trimmed), 16) if isinstance(seed_trimmed, str) else seed_trimmed
-        
-        predictable_num = (seed_num + result + 1) % fact
-        
-        
-        print(f"[DEBUG] ГЕНЕРАЦИЯ ТЕНЕВОГО СИДА \n=================================================================== \n Количество треков = {num_tracks} \n Случайное число = {random_part} \n Делитель = {random_divisor} \n Разность = {result} \n Основной сид = {seed_num} \n Результат = {predictable_num}")
-        # Форматируем аналогично основному сиду
-        if self.seed_format.get() in ["Только цифры", "Digits only", "Solo dígitos", "Nur Zahlen", "Solo numeri", "Tylko cyfry", 
-                            "Толькі лічбы", "Тільки цифри", "Тек сандар", "Само бројеви", "Chiffres uniquement", "Sólo números", "Apenas números", "Sadece rakamlar", "Apenas dígitos", "Alleen cijfers", "仅数字", "숫자만", "Samo številke", "Vetëm numra", "Samo brojevi", "Csak számok", "Doar cifre", "Pouze čísla", "Alleen cijfers", "Chiffres seulement", "Nur Zahlen", "Numbers only", "Aðeins tölur", "Ainult numbrid", "Bare tall", "Solo números", "केवल संख्याएँ", "数字のみ", "Kun tal", "Endast siffror", "Vain numerot", "Slegs Syfers", "Chỉ số", "Hanya angka", "Dhigití amháin", "Μόνο αριθμοί", "Само цифри", "Tik skaičiai", "Tikai cipari", "Numri biss", "Само бројки", "Iba číslice", "מספרים בלבד", "எண்கள் மட்டும்", "అంకెలు మాత్రమే", "Nombor sahaja", "ቁጥሮች ብቻ", "Nambari pekee", "Izinombolo kuphela"]:
-            return str(predictable_num).zfill(len(str(fact)))
+    def get_track_table(self, folders, progress=None, cancel_event=None):
+        """Принимает список папок, возвращает компактную таблицу аудиофайлов всех папок"""
+        table = TrackTable()
+        try:
+            # Один проход: пути и размеры берутся из одного и того же stat, длительности —
+            # только из кэша, куда их уже сложил time_count (файлы заново не читаются)
+            for record in self.scanner.scan(folders, with_durations=True, probe=False,
+                                            progress=progress, cancel_event=cancel_event):
+                table.append(record.path, record.size, record.duration)
+        except (OSError, UnicodeDecodeError, sqlite3.Error) as e:
+            print(self.localization.tr("error_scanning_folder").format(error=e))
+        self.audio_total_size = table.total_size
+        return table
+
+
+    def is_digits_only(self, seed_format):
+        """Формат сида «только цифры» на любом языке интерфейса"""
+        return seed_format in DIGITS_ONLY_FORMATS
+
+    def seed_info_text(self, plan):
+        """Итог генерации для окна: сид (или теневой сид), шаг реверса и число перестановок"""
+        if plan.shadow_seed is not None:
+            key = "seed_info_shadow"
+        elif plan.num_swaps or plan.reverse_step:
+            key = "seed_info"
         else:
-            # Для буквенно-цифрового формата используем хеш
-            hash_obj = hashlib.sha256(str(predictable_num).encode())
-            return hash_obj.hexdigest()[:len(str(fact))]
-        
+            key = "seed_info_basic"
+        if plan.num_swaps:
+            key += "_intensity"
+        if plan.reverse_step:
+            key += "_step"
+        return self.localization.tr(key).format(
+            seed=plan.seed, shadow_seed=plan.shadow_seed, step=plan.reverse_step, num_swaps=plan.num_swaps
+        )
         
         
     def generate_playlist(self, num_swaps=None):
@@ -1006,15 +1078,75 @@ class PlaylistGenerator:
                 self.seed_info.config(text=self.localization.tr("error_reverse_step"), fg="red")
                 return
 
-        # Получаем аудиофайлы
-        audio_files = self.get_audio_files(valid_paths)
-        if not audio_files:
-            self.seed_info.config(text=self.localization.tr("error_no_audio_files"), fg="red")
-            return
+        # Количество перестановок проверяем до запуска фоновой задачи
+        intensity_value = self.intensity_entry.get()
+        if intensity_value.strip():
+            try:
+                if int(intensity_value) < 0:
+                    raise ValueError
+            except ValueError:
+                self.seed_info.config(text=self.localization.tr("error_intensity"), fg="red")
+                return
 
+        # Значения виджетов снимаем в главном потоке, работа идет в фоне
+        params = {
+            "valid_paths": valid_paths,
+            "playlist_name": playlist_name,
+            "user_seed": user_seed,
+            "step": step,
+            "intensity_value": intensity_value,
+            "seed_format": self.seed_format.get(),
+            "use_shadow_seed": self.use_shadow_seed.get(),
+            "playlist_format": self.format_m3u8,
+            "export_formats": list(self.export_formats),
+            "algorithm": self.shuffle_algorithm,
+            "swap_mode": self.swap_mode,
+        }
+        self.run_background_task(
+            self.build_playlist, params,
+            on_done=lambda info_text: self.on_playlist_built(info_text, valid_paths)
+        )
+
+    def on_playlist_built(self, info_text, valid_paths):
+        self.last_folder = valid_paths
+        self.save_settings()
+        self.seed_info.config(text=self.localization.tr("playlist_created").format(info=info_text), fg="green")
+
+    def build_playlist(self, params, progress=None, cancel_event=None):
+        """Сканирует папки, перемешивает и сохраняет плейлист (выполняется в фоновом потоке)"""
+        # Профиль этапов: таблица — в режиме отладки, JSON рядом с плейлистом — по настройке profile_sidecar
+        profiler = StageProfiler(
+            "generate_playlist", enabled=self.debug_mode or self.profile_sidecar, count_opens=self.profile_sidecar
+        )
+        with profiler:
+            with profiler.span("total"):
+                info_text, playlist_paths = self._build_playlist(params, profiler, progress, cancel_event)
+        if self.debug_mode:
+            profiler.report()
+        if self.profile_sidecar:
+            profiler.write_sidecar(playlist_paths[0])
+        return info_text
 
-        num_tracks = len(audio_files)
-        total_size = sum(os.path.getsize(f) for f in audio_files)
+    def _build_playlist(self, params, profiler, progress=None, cancel_event=None):
+        import _pylong
+        sys.set_int_max_str_digits(0)
+        valid_paths = params["valid_paths"]
+        playlist_name = params["playlist_name"]
+        user_seed = params["user_seed"]
+        intensity_value = params["intensity_value"]
+
+        # Конвейер: обход папок → сортировка → перемешивание на месте → потоковая запись.
+        # Сортировка и перемешивание требуют полного списка, поэтому дальше
+        # работаем с индексами строк таблицы, пути собираются только при записи
+        with profiler.span("scan"):
+            table = self.get_track_table(valid_paths, progress, cancel_event)
+        if not len(table):
+            raise GenerationError(self.localization.tr("error_no_audio_files"))
+
+        # Сортируем треки сначала по ASCII символам, затем A-Z
+        with profiler.span("sort"):
+            track_order = table.sorted_order()
+        num_tracks = len(table)
         now = datetime.datetime.now()
     
         # Счетчик итераций (сбрасывается при ручном вводе сида)
@@ -1022,32 +1154,10 @@ class PlaylistGenerator:
             self._generation_iteration = 0
         elif not user_seed:  # только для автоматического сида
             self._generation_iteration += 1
-        
-        
-        # Генерация сидов
-        if not user_seed or user_seed == "0":
-            seed = self.generate_seed(num_tracks, now, total_size, self._generation_iteration)
-        else:
-            seed = user_seed
-
-        # Обрезаем нули
-        seed_trimmed = seed.lstrip('0') or '0'
-        
-        print(f"[DEBUG] Основной сид = {seed}")
-        print(f"[DEBUG] Использованный основной сид = {seed_trimmed}")
-        
-        
-        # Генерируем теневой сид
-        if self.use_shadow_seed.get():
-            shadow_seed = self.generate_shadow_seed(num_tracks, seed_trimmed)
-            print(f"[DEBUG] Теневой сид = {shadow_seed} ")
-            # Обрезаем нули
-            shadow_seed_trimmed = shadow_seed.lstrip('0') or '0'
-            print(f"[DEBUG] Использованный теневой сид = {shadow_seed_trimmed}")
-        else:
-            shadow_seed = None
-            shadow_seed_trimmed = None
-        
+        # Базовая часть автоматического сида считается один раз за сессию:
+        # повторные генерации идут от нее с шагом итерации
+        if (not user_seed or user_seed == "0") and not hasattr(self, '_base_seed'):
+            self._base_seed = date_seed_value(num_tracks, now, table.total_size)
 
         # Определяем путь для сохранения
         if getattr(sys, 'frozen', False):
@@ -1055,590 +1165,75 @@ class PlaylistGenerator:
         else:
             script_dir = os.path.dirname(os.path.abspath(__file__))
         # Получаем выбранный формат
-        playlist_format = self.format_m3u8
+        playlist_format = params["playlist_format"]
 
         if not playlist_format:  # Защита на случай пустого значения
             playlist_format = "m3u8" 
-                
-        playlist_path = os.path.join(script_dir, f"{playlist_name}.{playlist_format}")
-
+        # Выбранный формат первым, дополнительные — следом; xspf и xspf+url вместе не пишутся
+        playlist_formats = merge_formats(playlist_format, params["export_formats"])
 
-        # Обработка перемешивания
-        reverse_step = None
-        if step == 1:       
-            # Определяем шаг реверса (1-20)
-            reverse_step = random.randint(2, 21)
-            print(f"[DEBUG] Реверс = {reverse_step}")
-            
-            if self.use_shadow_seed.get():
-                seed_trimmed = shadow_seed_trimmed
-                # Основное перемешивание по теневому сиду
-                shuffled, num_swaps = self.soft_shuffle(audio_files, str(shadow_seed_trimmed))
-                shuffled_files = self.apply_reverse_step(shuffled, reverse_step)
-            
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_shadow_intensity_step").format(
-                        shadow_seed=shadow_seed_trimmed, step=reverse_step, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_shadow_step").format(
-                        shadow_seed=shadow_seed_trimmed, step=reverse_step
-                    )
-            else:
-            
-                # Основное перемешивание по основному сиду
-                shuffled, num_swaps = self.soft_shuffle(audio_files, str(seed_trimmed))
-            
-                # Применяем реверс блоков
-                shuffled_files = self.apply_reverse_step(shuffled, reverse_step)
-                
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_intensity_step").format(
-                        seed=seed_trimmed, step=reverse_step, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_step").format(
-                        seed=seed_trimmed, step=reverse_step
-                    )
-            
-            print(f"[DEBUG] : Перестановленный список (Теневой сид + {reverse_step}) ============================")
-            for i, path in enumerate(shuffled_files, 1):
-                print(f"{i}. {os.path.basename(path)}")
-            print("===================================================================")
-            
-        elif step > 0:
-            # Ручной шаг реверса
-            reverse_step = step
-            print(f"[DEBUG] Реверс = {reverse_step}")
-            
-            if self.use_shadow_seed.get():
-                shuffled, num_swaps = self.soft_shuffle(audio_files, str(shadow_seed_trimmed))
-                shuffled_files = self.apply_reverse_step(shuffled, reverse_step)
-                
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_shadow_intensity_step").format(
-                        shadow_seed=shadow_seed_trimmed, step=reverse_step, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_shadow_step").format(
-                        shadow_seed=shadow_seed_trimmed, step=reverse_step
-                    )
-                
-            else:
-                shuffled, num_swaps = self.soft_shuffle(audio_files, str(seed_trimmed))
-                shuffled_files = self.apply_reverse_step(shuffled, reverse_step)
-            
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_intensity_step").format(
-                        seed=seed_trimmed, step=reverse_step, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_step").format(
-                        seed=seed_trimmed, step=reverse_step
-                    )
-            
-            print(f"[DEBUG] : Новый список с реверсом {reverse_step} ============================")
-            for i, path in enumerate(shuffled_files, 1):
-                print(f"{i}. {os.path.basename(path)}")
-            print("===================================================================")
-            
-        else:
-            # Без реверса
-            if self.use_shadow_seed.get():
-                shuffled_files, num_swaps = self.soft_shuffle(audio_files, str(shadow_seed_trimmed))
-                
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_shadow_intensity").format(
-                        shadow_seed=shadow_seed_trimmed, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_shadow").format(
-                        shadow_seed=shadow_seed_trimmed
-                    )
-                
-            else:
-                shuffled_files, num_swaps = self.soft_shuffle(audio_files, str(seed_trimmed))
-                
-                if num_swaps:
-                    info_text = self.localization.tr("seed_info_intensity").format(
-                        seed=seed_trimmed, num_swaps=num_swaps
-                    )
-                else:
-                    info_text = self.localization.tr("seed_info_basic").format(
-                        seed=seed_trimmed
-                    )
-            
-            
-            print(f"[DEBUG] : Новый список ============================")
-            for i, path in enumerate(shuffled_files, 1):
-                print(f"{i}. {os.path.basename(path)}")
-            print("===================================================================")
-        
-        print(f"[SUCCES] Перемешивание завершено")
-       
-        # Создание плейлиста
-        self.save_m3u8_playlist(
-            path=playlist_path,
-            files=shuffled_files,
+        # Сиды, перемешивание и запись — общие с консольным и пакетным генераторами и сервером (PlaylistCore)
+        job = PlaylistJob(
             name=playlist_name,
-            seed=seed_trimmed,
-            shadow_seed=shadow_seed_trimmed,
-            num_tracks=num_tracks,
-            date=now,
-            reverse_step=reverse_step,
-            num_swaps=num_swaps,
-            playlist_format=playlist_format
+            seed=user_seed or None,
+            shadow_seed=params["use_shadow_seed"],
+            intensity=int(intensity_value) if intensity_value.strip() else 0,
+            reverse_step=params["step"],
+            playlist_format=",".join(playlist_formats),
+            algorithm=params["algorithm"],
+            swap_mode=params["swap_mode"],
+            digits_only=self.is_digits_only(params["seed_format"]),
+            relative_to=self.relative_paths
+        )
+        print(f"[DEBUG] Длина {num_tracks}! = {factorial_digits(num_tracks)} цифр \n===================================================================")
+        plan = plan_playlist(
+            table, track_order, job, now, self._generation_iteration, profiler, getattr(self, '_base_seed', None)
         )
 
-        self.last_folder = valid_paths
-        self.save_settings()
-        self.seed_info.config(text=self.localization.tr("playlist_created").format(info=info_text), fg="green")
-       
-       
-    def soft_shuffle(self, files, seed_value):
-        """Перемешивание с небольшими изменениями"""
-        seed_hash = abs(self.stable_hash(str(seed_value)))
-        random.seed(seed_hash)
-        files = files.copy()
-        
-        print(f"[DEBUG] : Текущий список ============================")
-        for i, path in enumerate(files, 1):
-            print(f"{i}. {os.path.basename(path)}")
-        print("===================================================================")
-        
-        random.shuffle(files)
-        
-        print(f"[DEBUG] : Перемешанный список ============================")
-        for i, path in enumerate(files, 1):
-            print(f"{i}. {os.path.basename(path)}")
-        print("===================================================================")
-            
-            
-        # Обработка шага реверса
-        intensity_value = self.intensity_entry.get()
-        intensity = 0
-        num_swaps = 0
-        if intensity_value.strip():
-            try:
-                intensity = int(intensity_value)
-                if intensity < 0:
-                    raise ValueError
-            except ValueError:
-                self.seed_info.config(text=self.localization.tr("error_intensity"), fg="red")
-                return            
-
-            
-        # Генерация intensity из сида, если не задано
-        if intensity != 0 and intensity is None:
-            return files, num_swaps
-
-        elif intensity == 1:
-            # Используем хеш сида для генерации значения 0.6-1.0
-            hash_val = (seed_hash % 10_000_000_000) / 10_000_000_000
-            intensity = 0.6 + 0.4 * hash_val  # Растягиваем на диапазон 0.6-1.0
-            
-            # Количество перестановок = 30% от числа треков (можно регулировать)
-            num_swaps = min(int(len(files) * intensity * 1.07), int(len(files)))
-            print(f"[DEBUG] Генерация intensity из сида = {intensity}")
-            print(f"[DEBUG] Количество перестановок = {num_swaps}")
-            for _ in range(num_swaps):
-                i, j = random.sample(range(len(files)), 2)
-                files[i], files[j] = files[j], files[i]
-                print(f"[DEBUG] Перемешано {i}<->{j}")
-            return files, num_swaps          
-
-        else:
-                
-            # Количество перестановок = 30% от числа треков (можно регулировать)
-            num_swaps = int(intensity)
-            print(f"[DEBUG] Генерация intensity из сида = {intensity}")
-            print(f"[DEBUG] Количество перестановок = {num_swaps}")
-            for _ in range(num_swaps):
-                i, j = random.sample(range(len(files)), 2)
-                files[i], files[j] = files[j], files[i]
-                print(f"[DEBUG] Перемешано {i}<->{j}")
-            return files, num_swaps
-        
-        
-    
-    def save_m3u8_playlist(self, path, files, name, seed, shadow_seed, num_tracks, date, reverse_step=None, num_swaps=None, playlist_format=None):
-        """Создает M3U8 файл плейлиста"""
-        date_str = date.strftime("%Y-%m-%d %H:%M:%S")
-        if playlist_format in ["m3u8", "m3u"]:      
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write("#EXTM3U\n")
-                f.write("#Made with VolfLife's Playlist Generator\n")
-                f.write(f"#GENERATED:{date_str}\n")
-                f.write(f"#PLAYLIST:{name}\n")
-                if self.formatted_duration is not None:
-                    f.write(f"#DURATION:{self.formatted_duration}\n")
-                f.write(f"#SEED:{seed}\n")
-                if self.use_shadow_seed.get():
-                    f.write(f"#SHADOW_SEED:{shadow_seed}\n")
-                
-                if num_swaps is not None and num_swaps > 0:
-                    f.write(f"#NUM_SWAPS:{num_swaps}\n")
-                if reverse_step is not None and reverse_step > 0:
-                    f.write(f"#REVERSE_STEP:{reverse_step}\n")
-                    
-                f.write(f"#TRACKS:{num_tracks}\n")
-
-                f.write("\n")  # Разделитель
-                
-                for file_path in files:
-                    # Нормализуем путь
-                    clean_path = os.path.normpath(file_path)
-                    
-                    # Получаем имя файла
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    
-                    f.write(f"#EXTINF:-1,{saxutils.escape(name_without_ext)}\n")
-                    f.write(f"{clean_path.replace('\\', '/')}\n")
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")        
-        
-        if playlist_format in ["txt"]:      
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write("#Made with VolfLife's Playlist Generator\n")
-                f.write(f"#GENERATED:{date_str}\n")
-                f.write(f"#TRACKLIST:{name}\n")
-                if self.formatted_duration is not None:
-                    f.write(f"#DURATION:{self.formatted_duration}\n")                
-                f.write(f"#SEED:{seed}\n")
-                if self.use_shadow_seed.get():
-                    f.write(f"#SHADOW_SEED:{shadow_seed}\n")
-                
-                if num_swaps is not None and num_swaps > 0:
-                    f.write(f"#NUM_SWAPS:{num_swaps}\n")    
-                if reverse_step is not None and reverse_step > 0:
-                    f.write(f"#REVERSE_STEP:{reverse_step}\n")
-                
-                f.write(f"#TRACKS:{num_tracks}\n")
-
-                f.write("\n")  # Разделитель
-                
-                for file_path in files:
-                    file_path = os.path.normpath(file_path)
-                    escaped_path = file_path.replace('\\', '/')
-                    f.write(f"{escaped_path}\n")
-            print(f"[DEBUG] Треклист создан и сохранен: {name}.{playlist_format}") 
-        
-        if playlist_format in ["pls"]:
-            with open(path, 'w', encoding='utf-8') as f:
-                # Заголовок плейлиста
-                f.write("[playlist]\n")
-                f.write(f";Made with VolfLife's Playlist Generator\n")
-                f.write(f";GENERATED:{date_str}\n")
-                f.write(f";PLAYLIST:{name}\n")
-                if self.formatted_duration is not None:
-                    f.write(f";DURATION:{self.formatted_duration}\n")                
-                f.write(f";SEED:{seed}\n")
-                if self.use_shadow_seed.get():
-                    f.write(f";SHADOW_SEED:{shadow_seed}\n")
-                
-                if num_swaps is not None and num_swaps > 0:
-                    f.write(f";NUM_SWAPS:{num_swaps}\n")    
-                if reverse_step is not None and reverse_step > 0:
-                    f.write(f";REVERSE_STEP:{reverse_step}\n")
-                
-                f.write(f"NumberOfEntries={num_tracks}\n")
-                f.write("Version=2\n\n")  # Версия формата PLS
-
-                # Запись треков
-                for i, file_path in enumerate(files, 1):
-                    # Нормализуем путь
-                    clean_path = os.path.normpath(file_path)
-                    
-                    # Получаем имя файла
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    f.write(f"File{i}={clean_path.replace('\\', '/')}\n")
-                    f.write(f"Title{i}={saxutils.escape(name_without_ext)}\n")
-                    f.write(f"Length{i}=-1\n")  # -1 = длительность определит плеер
-                    
-                    if i < num_tracks:  # Добавляем пустую строку между треками (кроме последнего)
-                        f.write("\n")
-
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-        
-        
-        if playlist_format in ["asx"]:
-            with open(path, 'w', encoding='utf-8') as f:
-                # Заголовок ASX
-                f.write('<ASX Version="3.0">\n')
-                f.write(f'<!-- Generated by VolfLife\'s Playlist Generator on {date_str} -->\n')
-                f.write(f'<Title>{saxutils.escape(name)}</Title>\n')
-                if self.formatted_duration is not None:
-                    f.write(f'<Abstract>DURATION:{self.formatted_duration}</Abstract>\n')
-                f.write(f'<Abstract>SEED:{seed}</Abstract>\n')
-                if self.use_shadow_seed.get():
-                    f.write(f'<Abstract>SHADOW_SEED:{shadow_seed}</Abstract>\n')
-                if num_swaps is not None and num_swaps > 0:
-                    f.write(f'<Abstract>NUM_SWAPS:{num_swaps}</Abstract>\n')
-                if reverse_step is not None and reverse_step > 0:
-                    f.write(f'<Abstract>REVERSE_STEP:{reverse_step}</Abstract>\n')
-                    
-                f.write(f'<Abstract>TRACKS:{num_tracks}</Abstract>\n\n')
-                
-                # Запись треков
-                for file_path in files:
-                    clean_path = os.path.normpath(file_path)
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    f.write('<Entry>\n')
-                    f.write(f'  <Title>{saxutils.escape(name_without_ext)}</Title>\n')
-                    f.write(f'  <Ref href="{saxutils.escape(clean_path.replace("\\", "/"))}" />\n')
-                    f.write('</Entry>\n\n')
-                
-                f.write('</ASX>')
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-        
+        print(f"[DEBUG] Использованный основной сид = {plan.seed}")
+        if plan.shadow_seed is not None:
+            print(f"[DEBUG] Использованный теневой сид = {plan.shadow_seed}")
+        if plan.reverse_step:
+            print(f"[DEBUG] Реверс = {plan.reverse_step}")
+        print(f"[DEBUG] : Новый список ============================")
+        self.print_order(table, plan.order, profiler)
         
-        if playlist_format in ["xspf"]:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                f.write(f'  <title>{name}</title>\n')
-                f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                f.write(f'  <date>{date_str}</date>\n')
-                
-                # Метаданные
-                f.write('  <annotation>\n')
-                f.write(f'    GENERATED:{date_str}\n')
-                if self.formatted_duration is not None:
-                    f.write(f'    DURATION:{self.formatted_duration}\n')
-                f.write(f'    SEED:{seed}\n')
-                if self.use_shadow_seed.get():
-                    f.write(f'    SHADOW_SEED:{shadow_seed}\n')
-                if num_swaps:
-                    f.write(f'    NUM_SWAPS:{num_swaps}\n')
-                if reverse_step:
-                    f.write(f'    REVERSE_STEP:{reverse_step}\n')
-                f.write(f'    TRACKS:{num_tracks}\n')
-                f.write('  </annotation>\n')
-                
-                f.write('  <trackList>\n')
-                
-                for file_path in files:
-                    # Нормализуем путь
-                    clean_path = os.path.normpath(file_path)
-                    
-                    # Получаем имя файла
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    # Формируем file:// 
-                    file_url = clean_path.replace('\\', '/')
-                    #file_url = "file:///" + urllib.parse.quote(clean_path.replace('\\', '/'))
-                    f.write('    <track>\n')
-                    f.write(f'      <location>{file_url}</location>\n')
-                    f.write(f'      <title>{saxutils.escape(name_without_ext)}</title>\n')
-                    f.write(f'      <meta rel="filename">{saxutils.escape(file_name)}</meta>\n')  # Добавляем оригинальное имя файла
-                    f.write('    </track>\n')
-                
-                f.write('  </trackList>\n')
-                f.write('</playlist>\n')
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-    
-    
-        if playlist_format in ["xspf+url"]:
-            # Определяем путь для сохранения
-            if getattr(sys, 'frozen', False):
-                script_dir = os.path.dirname(sys.executable)
-            else:
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-            playlist_format = "xspf"
-            path = os.path.join(script_dir, f"{name}.{playlist_format}")
-            
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                f.write(f'  <title>{name}</title>\n')
-                f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                f.write(f'  <date>{date_str}</date>\n')
-                
-                # Метаданные
-                f.write('  <annotation>\n')
-                f.write(f'    GENERATED:{date_str}\n')
-                if self.formatted_duration is not None:
-                    f.write(f'    DURATION:{self.formatted_duration}\n')
-                f.write(f'    SEED:{seed}\n')
-                if self.use_shadow_seed.get():
-                    f.write(f'    SHADOW_SEED:{shadow_seed}\n')
-                if num_swaps:
-                    f.write(f'    NUM_SWAPS:{num_swaps}\n')
-                if reverse_step:
-                    f.write(f'    REVERSE_STEP:{reverse_step}\n')
-                f.write(f'    TRACKS:{num_tracks}\n')
-                f.write('  </annotation>\n')
-                
-                f.write('  <trackList>\n')
-                
-                for file_path in files:
-                    # Нормализуем путь
-                    clean_path = os.path.normpath(file_path)
-                    
-                    # Получаем имя файла
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    # Формируем file:// URL с правильным кодированием
-                    file_url = "file:///" + urllib.parse.quote(clean_path.replace('\\', '/'))
-                    f.write('    <track>\n')
-                    f.write(f'      <location>{file_url}</location>\n')
-                    f.write(f'      <title>{saxutils.escape(name_without_ext)}</title>\n')
-                    f.write(f'      <meta rel="filename">{saxutils.escape(file_name)}</meta>\n')  # Добавляем оригинальное имя файла
-                    f.write('    </track>\n')
-                
-                f.write('  </trackList>\n')
-                f.write('</playlist>\n')
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-        
-        if playlist_format in ["json"]:          
-            from datetime import datetime
-            playlist_data = {
-                "meta": {
-                    "name": name,
-                    "duration": self.formatted_duration if self.formatted_duration else None,
-                    "generator": "VolfLife's Playlist Generator",
-                    "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "seed": seed,
-                    "shadow_seed": shadow_seed if self.use_shadow_seed.get() else None,
-                    "num_swaps": num_swaps if num_swaps and num_swaps > 0 else None,
-                    "reverse_step": reverse_step if reverse_step and reverse_step > 0 else None,
-                    "num_tracks": num_tracks
-                },
-                "tracks": []
-            }
-
-            for file_path in files:
-                file_path = os.path.normpath(file_path)
-                playlist_data["tracks"].append({
-                    "path": file_path.replace('\\', '/'),
-                    "filename": os.path.basename(file_path),
-                    "title": os.path.splitext(os.path.basename(file_path))[0]
-                })
+        print(f"[SUCCES] Перемешивание завершено")
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScanCancelled()
+       
+        # Создание плейлиста (путь без расширения: у каждого формата свое)
+        with profiler.span("write"):
+            playlist_paths = write_plan(
+                os.path.join(script_dir, playlist_name), table, plan, job, now,
+                duration=self.formatted_duration,
+                durability=self.durability
+            )
+        return self.seed_info_text(plan), playlist_paths
 
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(playlist_data, f, indent=4, ensure_ascii=False)
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-        
-        if playlist_format in ["wpl"]:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('<?wpl version="1.0"?>\n')
-                f.write('<smil>\n')
-                f.write('  <head>\n')
-                f.write('    <meta name="Generator" content="VolfLife\'s Playlist Generator"/>\n')
-                f.write(f'    <meta name="ItemCount" content="{num_tracks}"/>\n')
-                f.write(f'    <title>{name}</title>\n')
-                
-                # Метаданные в виде комментариев (альтернатива для WPL)
-                f.write('    <!--\n')
-                f.write(f'      GENERATED:{date_str}\n')
-                if self.formatted_duration is not None:
-                    f.write(f'      DURATION:{self.formatted_duration}\n')
-                f.write(f'      SEED:{seed}\n')
-                if self.use_shadow_seed.get():
-                    f.write(f'      SHADOW_SEED:{shadow_seed}\n')
-                if num_swaps:
-                    f.write(f'      NUM_SWAPS:{num_swaps}\n')
-                if reverse_step:
-                    f.write(f'      REVERSE_STEP:{reverse_step}\n')
-                f.write('    -->\n')
-                
-                f.write('  </head>\n')
-                f.write('  <body>\n')
-                f.write('    <seq>\n')
-                
-                for file_path in files:
-                    # Нормализуем путь и экранируем спецсимволы XML
-                    clean_path = os.path.normpath(file_path)
-                    escaped_path = saxutils.escape(clean_path.replace('\\', '/'))
-                    
-                    # Записываем путь к файлу
-                    f.write(f'      <media src="{escaped_path}"/>\n')
-                
-                f.write('    </seq>\n')
-                f.write('  </body>\n')
-                f.write('</smil>\n')
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
-    
-        
-        elif playlist_format == 'xml':
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-                f.write('  <title>{}</title>\n'.format(saxutils.escape(name)))
-                f.write('  <creator>VolfLife\'s Playlist Generator</creator>\n')
-                f.write('  <date>{}</date>\n'.format(date_str))
-                
-                # Метаданные
-                f.write('  <annotation>\n')
-                f.write('    GENERATED:{}\n'.format(date_str))
-                if self.formatted_duration is not None:
-                    f.write('    DURATION:{}\n'.format(self.formatted_duration))
-                f.write('    SEED:{}\n'.format(seed))
-                if self.use_shadow_seed.get():
-                    f.write('    SHADOW_SEED:{}\n'.format(shadow_seed))
-                if num_swaps:
-                    f.write('    NUM_SWAPS:{}\n'.format(num_swaps))
-                if reverse_step:
-                    f.write('    REVERSE_STEP:{}\n'.format(reverse_step))
-                f.write('    TRACKS:{}\n'.format(num_tracks))
-                f.write('  </annotation>\n')
-                
-                f.write('  <trackList>\n')
-                
-                for track_num, file_path in enumerate(files, 1):
-                    # Нормализуем путь
-                    clean_path = os.path.normpath(file_path)
-                    file_name = os.path.basename(clean_path)
-                    name_without_ext = os.path.splitext(file_name)[0]
-                    
-                    f.write('    <track>\n')
-                    f.write('      <location>{}</location>\n'.format(
-                        urllib.parse.quote(saxutils.escape(clean_path.replace('\\', '/')))))
-                    f.write('      <title>{}</title>\n'.format(
-                        saxutils.escape(name_without_ext)))
-                    f.write('      <meta rel="trackNumber">{}</meta>\n'.format(track_num))
-                    f.write('    </track>\n')
-                
-                f.write('  </trackList>\n')
-                f.write('</playlist>\n')
-            
-            print(f"[DEBUG] Плейлист создан и сохранен: {name}.{playlist_format}")
+    def print_order(self, table, order, profiler):
+        """Печатает перемешанный список в отладочную консоль"""
+        with profiler.span("debug_list"):
+            for i, index in enumerate(order, 1):
+                print(f"{i}. {table.name(index)}")
+            print("===================================================================")
         
         
         
-    def apply_reverse_step(self, files, step):
-        """Применяет реверс блоков без повторной фиксации генератора"""
-        # Создаем копию списка, чтобы не менять оригинал
-        reversed_files = files.copy()
-        for i in range(0, len(reversed_files), step):
-            reversed_files[i:i+step] = reversed(reversed_files[i:i+step])
-        return reversed_files
-    
-           
-    
     def shuffle_files(self, files, seed_value):
         """Улучшенное перемешивание с явным указанием сида"""
-        random.seed(abs(self.stable_hash((str(seed_value)))))
+        rng = random.Random(abs(self.stable_hash((str(seed_value)))))
         shuffled = files.copy()
-        random.shuffle(shuffled)
+        rng.shuffle(shuffled)
         return shuffled
     
     
         
 if __name__ == "__main__":
     
+    # Нужно для пула процессов в собранном .exe (иначе дочерние процессы запускают GUI)
+    multiprocessing.freeze_support()
+    
     # Устанавливаем обработчик исключений ДО всего остального
     sys.excepthook = handle_exception
     
@@ -1686,7 +1281,7 @@ if __name__ == "__main__":
             # Проверяем, что иконка загружена
             icon_path = font_loader.icon_ico if font_loader.icon_ico else None
             font_path = font_loader._font_path
-            PlaylistEditor(editor_root, file_paths, icon_path, font_path)
+            PlaylistEditor(editor_root, file_paths, icon_path, font_path, debug_mode=debug_mode)
             editor_root.mainloop()
         else:
             # Иначе открываем генератор
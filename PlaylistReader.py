@@ -0,0 +1,584 @@
+import json
+import os
+import re
+import traceback
+import urllib.parse
+import xml.sax.saxutils as saxutils
+from xml.etree import ElementTree as ET
+
+from TrackTable import TrackEntry
+
+
+# Расширения медиафайлов, которые редактор принимает из плейлистов
+SUPPORTED_FORMATS = {
+    # Аудио
+    '.mp3', '.flac', '.ogg', '.wav', '.m4a', '.aac', '.wma', '.opus', '.aiff', '.aif', '.alac', '.dsf', '.dff', '.mka', '.ac3', '.dts',
+    # Видео
+    '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
+}
+
+
+# Поля перемешивания в заголовке: #KEY:value (M3U/TXT), ;KEY:value (PLS), <Abstract>KEY:value</Abstract> (ASX),
+# KEY:value в аннотации (XSPF, WPL) и "key": "value" в meta (JSON)
+_HEADER_FIELD = re.compile(
+    r'^\s*(?:#|;|<Abstract>)?\s*(ALGORITHM|SWAP_MODE):\s*([\w+.-]+)|^\s*"(algorithm|swap_mode)"\s*:\s*"([\w+.-]+)"'
+)
+# Заголовок пишется в начале файла: дальше идут только треки
+_HEADER_LINES = 64
+
+
+def _strip_file_url(location):
+    """Убирает схему file://; вне Windows путь из ссылки остается абсолютным (с ведущим /)"""
+    return re.sub(r'^file:///*', '' if os.name == 'nt' else '/', location)
+
+
+def read_playlist(file_path, source):
+    """Читает плейлист любого поддерживаемого формата в список TrackEntry.
+
+    source — метка исходного списка у каждого трека. None — файл не разобран
+    (ошибка уже напечатана); ошибка открытия файла пробрасывается.
+    """
+    temp_list = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        ext = os.path.splitext(file_path)[1].lower()
+        
+        if ext in ('.m3u', '.m3u8', '.txt'):
+            # Обработка M3U/M3U8/TXT форматов
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    clean_path = line.strip('"\' \t')
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    normalized_path = os.path.normpath(clean_path).replace('\\', '/').strip('"\' \t')
+                    temp_list.append(TrackEntry({
+                        "path": normalized_path,
+                        "name": os.path.basename(normalized_path),
+                        "num": line_num,
+                        "source": source,
+                        "original_path": normalized_path,
+                        "was_modified": False,
+                        "track_id": None
+                    }))
+        
+        elif ext in ('.pls'):
+            # Обработка PLS формата
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith(';') or line.startswith('['):
+                    continue
+                    
+                if line.lower().startswith('file'):
+                    # Извлекаем путь к файлу
+                    _, file_path_pls = line.split('=', 1)
+                    clean_path = file_path_pls.strip('"\' \t')
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    normalized_path = os.path.normpath(clean_path).replace('\\', '/')
+                    
+                    temp_list.append(TrackEntry({
+                        "path": normalized_path,
+                        "name": os.path.basename(normalized_path),
+                        "num": line_num,
+                        "source": source,
+                        "original_path": normalized_path,
+                        "was_modified": False,
+                        "track_id": None
+                    }))
+        
+        elif ext in ('.asx'):
+            # Обработка ASX формата
+            try:
+                tree = ET.parse(file_path)
+                root = tree.getroot()
+                
+                for entry_num, entry in enumerate(root.findall('.//Entry'), 1):
+                    ref = entry.find('Ref')
+                    if ref is not None:
+                        href = ref.get('href', '').strip()
+                        if not href:
+                            continue
+                        
+                        # Декодирование URL-encoded путей (если нужно)
+                        clean_path = urllib.parse.unquote(href) if '%' in href else href
+                        clean_path = os.path.normpath(clean_path).replace('\\', '/').strip('"\' \t')
+                        
+                        if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                            continue
+                        
+                        # Получаем название трека из тега Title или из имени файла
+                        title = os.path.basename(clean_path) or entry.findtext('Title', '').strip()
+                        
+                        temp_list.append(TrackEntry({
+                            "path": clean_path,
+                            "name": saxutils.unescape(title),  # Декодируем XML-entities
+                            "num": entry_num,
+                            "source": source,
+                            "original_path": clean_path,
+                            "was_modified": False,
+                            "track_id": None
+                        }))
+                        
+            except ET.ParseError as e:
+                print(f"[ERROR] Ошибка разбора ASX файла {file_path}: {str(e)}")
+            except Exception as e:
+                print(f"[ERROR] Ошибка обработки ASX файла {file_path}: {str(e)}")
+        
+        elif ext == '.xspf':
+            # Обработка XSPF формата
+            
+            try:
+                # Сначала читаем файл как текст и экранируем проблемные символы
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Заменяем неэкранированные амперсанды (кроме XML-сущностей)
+                content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
+                
+                # Парсим исправленный XML
+                root = ET.fromstring(content)
+                ns = {'ns': 'http://xspf.org/ns/0/'}
+                
+                for track_num, track in enumerate(root.findall('.//ns:track', ns), 1):
+                    location_element = track.find('ns:location', ns)
+                    
+                    if location_element is None or not location_element.text:
+                        print(f"Warning: Empty <location> in track {track_num}")
+                        continue
+                    
+                    # Получаем и очищаем location
+                    location = location_element.text.strip()
+                    
+                    # Сначала декодируем URL-кодирование
+                    location = urllib.parse.unquote(location)
+                        
+                    # Удаляем file:/// если присутствует (с учетом возможного file://)
+                    if location.startswith(('file:///', 'file://')):
+                        location = _strip_file_url(location)
+                      
+                    location = urllib.parse.unquote(location)  # Декодируем URL-кодирование
+                    
+                    # Получаем название трека (если есть)
+                    title = track.find('ns:title', ns)
+                    display_name = os.path.basename(location)
+                    
+                    clean_path = location.strip('"\' \t')
+                    
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    
+                    normalized_path = os.path.normpath(clean_path).replace('\\', '/')
+                    temp_list.append(TrackEntry({
+                        "path": normalized_path,
+                        "name": display_name,
+                        "num": track_num,
+                        "source": source,
+                        "original_path": normalized_path,
+                        "was_modified": False,
+                        "track_id": None
+                    }))
+            except ET.ParseError as e:
+                print(f"[ERROR] Ошибка разбора XSPF файла {file_path}: {str(e)}")
+                return None
+        
+        
+        elif ext == '.wax':
+            # Обработка WAX формата (SMIL-based)
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Экранируем специальные символы в XML
+                content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
+                
+                # Парсим XML с учетом namespace
+                namespaces = {
+                    'smil': 'http://www.w3.org/2001/SMIL20/Language'
+                }
+                root = ET.fromstring(content)
+                
+                track_num = 1
+                for media in root.findall('.//smil:media', namespaces):
+                    if 'src' not in media.attrib or not media.attrib['src']:
+                        print(f"Warning: Empty src attribute in track {track_num}")
+                        continue
+                    
+                    # Обрабатываем путь
+                    location = media.attrib['src'].strip()
+                    
+                    # Удаляем file:///
+                    if location.startswith('file:///'):
+                        location = location[8:]  # Удаляем file:///
+                    elif location.startswith('file://'):
+                        location = location[7:]  # Удаляем file://
+                    
+                    # Декодируем URL-кодирование
+                    location = urllib.parse.unquote(location)
+                    
+                    # Получаем имя трека из параметров (если есть)
+                    title = None
+                    original_filename = None
+                    for param in media.findall('smil:param', namespaces):
+                        if param.get('name') == 'title':
+                            title = param.get('value')
+                        elif param.get('name') == 'originalFilename':
+                            original_filename = param.get('value')
+                    
+                    # Определяем display_name
+                    if title:
+                        display_name = title
+                    elif original_filename:
+                        display_name = os.path.splitext(original_filename)[0]
+                    else:
+                        display_name = os.path.basename(location)
+                    
+                    # Нормализуем путь
+                    clean_path = os.path.normpath(location).replace('\\', '/')
+                    
+                    # Пропускаем неподдерживаемые форматы
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    
+                    # Добавляем трек в список
+                    temp_list.append(TrackEntry({
+                        "path": clean_path,
+                        "name": os.path.basename(location),
+                        "num": track_num,
+                        "source": source,
+                        "original_path": clean_path,
+                        "was_modified": False,
+                        "track_id": None
+                    }))
+                    
+                    track_num += 1
+                    
+            except ET.ParseError as e:
+                print(f"[ERROR] Ошибка разбора WAX файла {file_path}: {str(e)}")
+                return None
+            except Exception as e:
+                print(f"[ERROR] Ошибка обработки WAX файла {file_path}: {str(e)}")
+                return None                    
+        
+        
+        elif ext == '.wvx':
+            # Обработка WVX формата (SMIL-based)
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                
+                # Экранируем специальные символы в XML
+                content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
+                
+                # Парсим XML
+                root = ET.fromstring(content)
+                
+                track_num = 1
+                for media in root.findall('.//media'):
+                    if 'src' not in media.attrib or not media.attrib['src']:
+                        print(f"Warning: Empty src attribute in track {track_num}")
+                        continue
+                    
+                    # Обрабатываем путь
+                    location = media.attrib['src'].strip()
+                    
+                    # Удаляем file:/// и декодируем URL
+                    if location.startswith('file:///'):
+                        location = urllib.parse.unquote(location[8:])
+                    elif location.startswith('file://'):
+                        location = urllib.parse.unquote(location[7:])
+                    elif location.startswith(('http://', 'https://', 'mms://')):
+                        # Для онлайн-ресурсов оставляем как есть
+                        pass
+                    else:
+                        location = urllib.parse.unquote(location)
+                    
+                    # Получаем метаданные
+                    title = media.attrib.get('title')
+                    artist = media.attrib.get('artist')
+                    album = media.attrib.get('albumTitle')
+                    
+                    # Формируем отображаемое имя
+                    if title and artist:
+                        display_name = f"{artist} - {title}"
+                    elif title:
+                        display_name = title
+                    else:
+                        display_name = os.path.basename(location)
+                    
+                    # Для локальных файлов нормализуем путь
+                    if not location.startswith(('http://', 'https://', 'mms://')):
+                        clean_path = os.path.normpath(location).replace('\\', '/')
+                    else:
+                        clean_path = location
+                    
+                    # Пропускаем неподдерживаемые форматы для локальных файлов
+                    if not location.startswith(('http://', 'https://', 'mms://')):
+                        if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                            continue
+                    
+                    # Добавляем трек в список
+                    temp_list.append(TrackEntry({
+                        "path": clean_path,
+                        "name": os.path.basename(location),
+                        "num": track_num,
+                        "source": source,
+                        "original_path": clean_path,
+                        "was_modified": False,
+                        "track_id": None,
+                        "metadata": {
+                            "artist": artist,
+                            "title": title,
+                            "album": album
+                        }
+                    }))
+                    
+                    track_num += 1
+                    
+            except ET.ParseError as e:
+                print(f"[ERROR] Ошибка разбора WVX файла {file_path}: {str(e)}")
+                return None
+            except Exception as e:
+                print(f"[ERROR] Ошибка обработки WVX файла {file_path}: {str(e)}")
+                return None
+        
+        
+        elif ext == '.json':
+            # Обработка JSON формата
+            try:
+                playlist_data = json.load(f)
+                
+                # Проверяем структуру JSON
+                if not isinstance(playlist_data, dict):
+                    raise ValueError("Invalid JSON playlist format: expected dictionary")
+                
+                # Получаем треки из разных возможных структур JSON
+                tracks = playlist_data.get('tracks') or playlist_data.get('items') or []
+                
+                for track in tracks:
+                    # Поддержка разных форматов пути в JSON
+                    track_path = track.get('path') or track.get('file') or track.get('location') or ''
+                    
+                    if not track_path:
+                        continue
+                    
+                    # Нормализация пути
+                    clean_path = os.path.normpath(track_path.strip('"\' \t')).replace('\\', '/')
+                    
+                    # Проверка расширения файла
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    
+                    # Добавляем трек во временный список
+                    temp_list.append(TrackEntry({
+                        "path": clean_path,
+                        "name": os.path.basename(clean_path),
+                        "num": track.get('position') or track.get('track_number') or len(temp_list) + 1,
+                        "source": source,
+                        "original_path": clean_path,
+                        "was_modified": False,
+                        "was_moved": False,
+                        "was_restored": False,
+                        "track_id": None,
+                        "original_name": track.get('title') or track.get('name') or os.path.basename(clean_path)
+                    }))
+            except json.JSONDecodeError as e:
+                print(f"[ERROR] Ошибка разбора JSON файла {file_path}: {str(e)}")
+            except Exception as e:
+                print(f"[ERROR] Ошибка обработки JSON файла {file_path}: {str(e)}")
+        
+        elif ext == '.wpl':
+            # Обработка WPL формата
+            try:
+                tree = ET.parse(file_path)
+                root = tree.getroot()
+                
+                # Находим все media-элементы в последовательности
+                for entry_num, media in enumerate(root.findall('.//media'), 1):
+                    src = media.get('src', '').strip()
+                    if not src:
+                        continue
+                    
+                    # Очистка пути (удаление лишних кавычек, пробелов)
+                    clean_path = os.path.normpath(src).replace('\\', '/').strip('"\' \t')
+                    
+                    # Проверка поддерживаемого формата файла
+                    if not any(clean_path.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        continue
+                    
+                    # Получаем название трека из атрибута title или имени файла
+                    title = media.get('title', '').strip() or os.path.basename(clean_path)
+                    
+                    temp_list.append(TrackEntry({
+                        "path": clean_path,
+                        "name": saxutils.unescape(title),  # Декодируем XML-entities
+                        "num": entry_num,
+                        "source": source,
+                        "original_path": clean_path,
+                        "was_modified": False,
+                        "track_id": None
+                    }))
+                    
+            except ET.ParseError as e:
+                print(f"[ERROR] Ошибка разбора WPL файла {file_path}: {str(e)}")
+            except Exception as e:
+                print(f"[ERROR] Ошибка обработки WPL файла {file_path}: {str(e)}")
+
+
+        elif ext == '.xml':
+            try:
+                
+                # Читаем весь файл для обработки
+                content = f.read()
+                
+                # Экранируем невалидные XML-символы
+                content = re.sub(r'&(?!amp;|lt;|gt;|apos;|quot;|\#\d+;)', '&amp;', content)
+                
+                # Удаляем все meta-теги с rel="filename" до парсинга
+                content = re.sub(r'<meta\s+rel="filename"[^>]*>.*?</meta>', '', content, flags=re.IGNORECASE|re.DOTALL)
+                
+                try:
+                    root = ET.fromstring(content)
+                except ET.ParseError:
+                    # Пробуем добавить корневой тег для неполных XML
+                    content = f'<root>{content}</root>'
+                    root = ET.fromstring(content)
+                
+                # Словарь для хранения найденных треков
+                found_tracks = []
+                
+                # 1. Пытаемся обработать как iTunes Library
+                if root.find('.//dict/dict') is not None:
+                    print("Detected iTunes Library format")
+                    tracks = []
+                    current_track = {}
+                    
+                    for elem in root.findall('.//dict/dict/dict'):
+                        key = None
+                        for child in elem:
+                            if child.tag == 'key':
+                                key = child.text
+                            elif key:
+                                current_track[key.lower()] = child.text if child.text else ''
+                                key = None
+                        
+                        if 'location' in current_track:
+                            location = current_track['location']
+                            location = _strip_file_url(location)
+                            location = urllib.parse.unquote(location)
+                            location = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
+                            
+                            name = current_track.get('name', os.path.basename(location))
+                            found_tracks.append((location, name))
+                        
+                        current_track = {}
+                
+                # 2. Пытаемся обработать как XSPF
+                elif root.find('.//track') is not None or root.find('.//Track') is not None:
+                    print("Detected XSPF format")
+                    for track in root.findall('.//track') + root.findall('.//Track'):
+                        location = None
+                        title = None
+                        
+                        # Получаем location
+                        loc_elem = track.find('location') or track.find('Location')
+                        if loc_elem is not None and loc_elem.text:
+                            location = loc_elem.text.strip()
+                            location = _strip_file_url(location)
+                            location = urllib.parse.unquote(location)
+                            location = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
+                        
+                        # Получаем title
+                        title_elem = track.find('title') or track.find('Title')
+                        if title_elem is not None and title_elem.text:
+                            title = title_elem.text.strip()
+                        
+                        if location:
+                            found_tracks.append((
+                                location,
+                                title if title else os.path.splitext(os.path.basename(location))[0]
+                            ))
+                
+                # 3. Общий поиск медиа-путей в XML
+                else:
+                    print("Detected generic XML format")
+                    def find_paths(element):
+                        paths = []
+                        # Проверяем атрибуты
+                        for attr, value in element.attrib.items():
+                            if any(value.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                                clean_path = _strip_file_url(value)
+                                clean_path = urllib.parse.unquote(clean_path)
+                                paths.append(clean_path)
+                        
+                        # Проверяем текст элемента
+                        if element.text and any(element.text.strip().lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                            clean_path = _strip_file_url(element.text.strip())
+                            clean_path = urllib.parse.unquote(clean_path)
+                            paths.append(clean_path)
+                        
+                        # Рекурсивно проверяем дочерние элементы
+                        for child in element:
+                            paths.extend(find_paths(child))
+                        
+                        return paths
+                    
+                    paths = find_paths(root)
+                    found_tracks = [(path, os.path.splitext(os.path.basename(path))[0]) for path in paths]
+                
+                # Добавляем найденные треки в temp_list
+                for track_num, (location, title) in enumerate(found_tracks, 1):
+                    if any(location.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
+                        normalized_path = os.path.normpath(location).replace('\\', '/').strip('"\' \t')
+                        temp_list.append(TrackEntry({
+                            "path": normalized_path,
+                            "name": os.path.basename(location),
+                            "num": track_num,
+                            "source": source,
+                            "original_path": normalized_path,
+                            "was_modified": False,
+                            "track_id": None
+                        }))
+                        print(f"Added track: {title} | {normalized_path}")
+                
+                print(f"Total tracks added from XML: {len(temp_list)}")
+                
+            except Exception as e:
+                print(f"[ERROR] Ошибка загрузки XML плейлиста {file_path}: {str(e)}")
+                traceback.print_exc()
+
+    resolve_relative(temp_list, file_path)
+    return temp_list
+
+
+def read_header(file_path):
+    """Алгоритм и режим перестановок из заголовка плейлиста: {"algorithm": ..., "swap_mode": ...}.
+
+    Отсутствующие поля в словарь не попадают (плейлист legacy/compat или записан не генератором).
+    """
+    header = {}
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line_num, line in enumerate(f):
+            if line_num >= _HEADER_LINES:
+                break
+            match = _HEADER_FIELD.match(line)
+            if match:
+                key = match.group(1) or match.group(3)
+                header.setdefault(key.lower(), (match.group(2) or match.group(4)).lower())
+    return header
+
+
+def resolve_relative(tracks, playlist_path):
+    """Относительные пути треков (плейлист записан с relative_to) отсчитываются от папки плейлиста"""
+    base = None
+    for track in tracks:
+        path = track["path"]
+        # Путь вида C:/... абсолютный и для Windows-плейлиста, открытого в другой ОС
+        if os.path.isabs(path) or re.match(r'^[A-Za-z]:', path):
+            continue
+        if base is None:
+            base = os.path.dirname(os.path.abspath(playlist_path))
+        resolved = os.path.normpath(os.path.join(base, path)).replace('\\', '/')
+        track["path"] = resolved
+        track["original_path"] = resolved
@@ -0,0 +1,496 @@
+import argparse
+import contextlib
+import datetime
+import io
+import itertools
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import unicodedata
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PlaylistCore import PlaylistJob, plan_playlist, scan_library, write_plan
+from PlaylistWriter import PLAYLIST_FORMATS
+
+
+# Локальный сервис генерации: python PlaylistServer.py serve, клиент — request / stats
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Сколько последних запросов учитывается в статистике задержек
+LATENCY_WINDOW = 1000
+# Размер буфера потоковой записи ответа (один чанк HTTP)
+STREAM_BUFFER = 64 * 1024
+# Сиды длиннее не передаются в заголовках ответа — они есть в самом плейлисте
+MAX_HEADER_SEED = 4096
+
+CONTENT_TYPES = {
+    "m3u8": "audio/x-mpegurl; charset=utf-8",
+    "m3u": "audio/x-mpegurl; charset=utf-8",
+    "pls": "audio/x-scpls; charset=utf-8",
+    "txt": "text/plain; charset=utf-8",
+    "xspf": "application/xspf+xml; charset=utf-8",
+    "xspf+url": "application/xspf+xml; charset=utf-8",
+    "asx": "video/x-ms-asf; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+    "wpl": "application/vnd.ms-wpl; charset=utf-8",
+    "xml": "application/xml; charset=utf-8",
+}
+
+# Библиотека в кеше: loaded — время сканирования (time.monotonic)
+CachedLibrary = namedtuple("CachedLibrary", ["folders", "table", "order", "duration", "with_durations", "loaded"])
+
+
+def _is_printable(value):
+    """Нет управляющих символов и разделителей строк"""
+    return not any(unicodedata.category(ch) in ("Cc", "Zl", "Zp") for ch in value)
+
+
+def _header_seed(seed):
+    """Сид можно отдать в заголовке: короткий и только печатный ASCII.
+
+    Остальные (кириллица, очень длинные) в заголовок не попадают — они есть в самом плейлисте.
+    """
+    return len(seed) <= MAX_HEADER_SEED and seed.isascii() and seed.isprintable()
+
+
+class RequestError(Exception):
+    """Ошибка в запросе клиента: код ответа и текст"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LibraryCache:
+    """Теплый кеш таблиц треков по набору папок.
+
+    Таблица и отсортированный порядок считаются один раз и дальше только читаются
+    потоками-воркерами. Через ttl секунд набор папок сканируется заново (индекс
+    библиотеки делает повторный проход дешевым). Одни и те же папки сканирует
+    только один поток, остальные ждут его результат.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, folders, with_durations=False):
+        folders = [os.path.abspath(folder) for folder in folders]
+        key = tuple(os.path.normcase(folder) for folder in folders)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if (entry is not None and time.monotonic() - entry.loaded < self.ttl
+                    and (entry.with_durations or not with_durations)):
+                with self._lock:
+                    self.hits += 1
+                return entry
+            table, duration = scan_library(folders, with_durations=with_durations)
+            entry = CachedLibrary(folders, table, table.sorted_order(), duration, with_durations, time.monotonic())
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = entry
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.values())
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "libraries": [
+                {
+                    "folders": entry.folders,
+                    "tracks": len(entry.table),
+                    "durations": entry.with_durations,
+                    "age": round(now - entry.loaded, 3),
+                }
+                for entry in entries
+            ],
+        }
+
+
+class ServiceStats:
+    """Счетчики сервиса: очередь, активные генерации и задержки последних запросов"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.errors = 0
+        self.rejected = 0
+        self.queued = 0
+        self.active = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def enqueue(self, max_queue):
+        """Ставит запрос в очередь; False — очередь заполнена"""
+        with self._lock:
+            self.requests += 1
+            if self.queued >= max_queue:
+                self.rejected += 1
+                return False
+            self.queued += 1
+            return True
+
+    def cancel(self):
+        """Освобождает место в очереди запроса, не попавшего в пул"""
+        with self._lock:
+            self.queued -= 1
+
+    def start(self):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+
+    def finish(self, seconds, failed):
+        with self._lock:
+            self.active -= 1
+            if failed:
+                self.errors += 1
+            else:
+                self.completed += 1
+                self.latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            data = {
+                "uptime": round(time.monotonic() - self.started, 3),
+                "requests": self.requests,
+                "completed": self.completed,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "queue_depth": self.queued,
+                "active": self.active,
+            }
+        latency = {"count": len(latencies)}
+        if latencies:
+            latency.update({
+                "avg": sum(latencies) / len(latencies) * 1000,
+                "p50": latencies[len(latencies) // 2] * 1000,
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                "max": latencies[-1] * 1000,
+            })
+        data["latency_ms"] = {key: round(value, 3) for key, value in latency.items()}
+        return data
+
+
+class _ChunkedStream(io.RawIOBase):
+    """Тело ответа с Transfer-Encoding: chunked — длина плейлиста заранее неизвестна"""
+
+    def __init__(self, wfile):
+        super().__init__()
+        self.wfile = wfile
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data:
+            self.wfile.write(b"%x\r\n" % len(data) + bytes(data) + b"\r\n")
+        return len(data)
+
+    def finish(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class PlaylistService:
+    """Генерация по запросам в ограниченном пуле потоков с общим кешем библиотек"""
+
+    def __init__(self, workers=None, max_queue=64, cache_ttl=300):
+        self.workers = max(1, int(workers or min(4, os.cpu_count() or 1)))
+        self.max_queue = max_queue
+        self.cache = LibraryCache(cache_ttl)
+        self.stats = ServiceStats()
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="playlist")
+        # Номер генерации для автоматического сида, как счетчик генераций в окне
+        self._iteration = itertools.count()
+
+    def parse_request(self, params):
+        """Задание из тела запроса: folders, with_durations и поля PlaylistJob"""
+        if not isinstance(params, dict):
+            raise RequestError(400, "request body must be a JSON object")
+        params = dict(params)
+        folders = params.pop("folders", None)
+        with_durations = bool(params.pop("with_durations", False))
+        if isinstance(folders, str):
+            folders = [folders]
+        if not folders or not all(isinstance(folder, str) and os.path.isdir(folder) for folder in folders):
+            raise RequestError(400, "folders must be a list of existing directories")
+        unknown = set(params) - set(PlaylistJob._fields)
+        if unknown:
+            raise RequestError(400, f"unknown fields: {', '.join(sorted(unknown))}")
+        if "name" not in params:
+            params["name"] = "Playlist"
+        if isinstance(params.get("seed"), int) and not isinstance(params["seed"], bool):
+            params["seed"] = str(params["seed"])
+        # Имя и сид попадают в заголовки ответа и строки плейлиста: переводы строк и прочие управляющие символы запрещены
+        for field in ("name", "seed"):
+            value = params.get(field)
+            if value is not None and not (isinstance(value, str) and _is_printable(value)):
+                raise RequestError(400, f"{field} must be a string without control characters")
+        job = PlaylistJob(**params)
+        if job.playlist_format not in PLAYLIST_FORMATS:
+            raise RequestError(400, f"unknown format: {job.playlist_format}")
+        # bool в Python тоже int: true/false в числовых полях отклоняем
+        for field in ("intensity", "reverse_step"):
+            value = getattr(job, field)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise RequestError(400, "intensity and reverse_step must be non-negative integers")
+        for field in ("algorithm", "swap_mode"):
+            if getattr(job, field) is not None and not isinstance(getattr(job, field), str):
+                raise RequestError(400, f"{field} must be a string")
+        for field in ("digits_only", "shadow_seed"):
+            if not isinstance(getattr(job, field), bool):
+                raise RequestError(400, f"{field} must be true or false")
+        # У ответа нет своей папки: относительные пути — только от указанной папки
+        if job.relative_to is not None and not (isinstance(job.relative_to, str) and job.relative_to):
+            raise RequestError(400, "relative_to must be a folder path")
+        return folders, with_durations, job
+
+    def handle(self, handler, params):
+        """Выполняет запрос генерации в пуле и ждет, пока ответ будет отправлен"""
+        folders, with_durations, job = self.parse_request(params)
+        if not self.stats.enqueue(self.max_queue):
+            raise RequestError(503, "queue is full")
+        received = time.perf_counter()
+        try:
+            future = self.pool.submit(self._generate, handler, folders, with_durations, job, received)
+        except Exception:
+            # Пул уже остановлен: иначе место в очереди осталось бы занятым навсегда
+            self.stats.cancel()
+            raise
+        future.result()
+
+    def _generate(self, handler, folders, with_durations, job, received):
+        self.stats.start()
+        failed = True
+        try:
+            library = self.cache.get(folders, with_durations)
+            if not len(library.table):
+                raise RequestError(422, "no media files in folders")
+            date = datetime.datetime.now()
+            plan = plan_playlist(library.table, library.order, job, date, next(self._iteration))
+            self._send_playlist(handler, library, plan, job, date)
+            failed = False
+        finally:
+            self.stats.finish(time.perf_counter() - received, failed)
+
+    def _send_playlist(self, handler, library, plan, job, date):
+        extension = "xspf" if job.playlist_format == "xspf+url" else job.playlist_format
+        file_name = urllib.parse.quote(f"{job.name}.{extension}")
+        handler.send_response(200)
+        handler.send_header("Content-Type", CONTENT_TYPES[job.playlist_format])
+        handler.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{file_name}")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.send_header("X-Tracks", str(len(library.table)))
+        if _header_seed(plan.seed):
+            handler.send_header("X-Seed", plan.seed)
+        if plan.shadow_seed is not None and _header_seed(plan.shadow_seed):
+            handler.send_header("X-Shadow-Seed", plan.shadow_seed)
+        handler.send_header("X-Num-Swaps", str(plan.num_swaps))
+        if plan.reverse_step:
+            handler.send_header("X-Reverse-Step", str(plan.reverse_step))
+        handler.end_headers()
+
+        # Заголовки уже отправлены: при ошибке дальше можно только оборвать соединение
+        handler.streaming = True
+        stream = _ChunkedStream(handler.wfile)
+        out = io.TextIOWrapper(io.BufferedWriter(stream, STREAM_BUFFER), encoding='utf-8', newline='\n')
+        write_plan(out, library.table, plan, job, date, library.duration)
+        out.flush()
+        stream.finish()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+class PlaylistRequestHandler(BaseHTTPRequestHandler):
+    """POST /generate — плейлист по заданию, GET /stats — статистика, POST /cache/clear — сброс кеша"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "PlaylistGenerator"
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path == "/stats":
+            service = self.server.service
+            data = service.stats.snapshot()
+            data["workers"] = service.workers
+            data["max_queue"] = service.max_queue
+            data["cache"] = service.cache.snapshot()
+            self._send_json(200, data)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        path = urllib.parse.urlsplit(self.path).path
+        self.streaming = False
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            if path == "/generate":
+                try:
+                    params = json.loads(body.decode('utf-8') or "{}")
+                except ValueError as e:
+                    raise RequestError(400, f"invalid JSON: {e}")
+                self.server.service.handle(self, params)
+            elif path == "/cache/clear":
+                self.server.service.cache.clear()
+                self._send_json(200, {"cleared": True})
+            else:
+                self._send_json(404, {"error": "not found"})
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            print(f"[ERROR] Запрос {path}: {e}")
+            if self.streaming:
+                # Ответ уже начат — клиент увидит оборванный поток, а не неполный плейлист
+                self.close_connection = True
+                return
+            self._send_json(500, {"error": str(e)})
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"[DEBUG] HTTP {self.address_string()} {format % args}")
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_queue=64, cache_ttl=300):
+    """HTTP-сервер с сервисом генерации (server.service); port 0 — любой свободный порт"""
+    server = ThreadingHTTPServer((host, port), PlaylistRequestHandler)
+    server.daemon_threads = True
+    server.service = PlaylistService(workers, max_queue, cache_ttl)
+    return server
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, max_queue=64, cache_ttl=300):
+    server = create_server(host, port, workers, max_queue, cache_ttl)
+    print(f"[DEBUG] Сервер генерации: http://{server.server_address[0]}:{server.server_address[1]} "
+          f"(воркеров: {server.service.workers}, очередь: {max_queue})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+
+
+def request_playlist(params, output, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=None):
+    """Локальный клиент: отправляет задание и потоково сохраняет плейлист в output.
+
+    Возвращает заголовки ответа (X-Seed, X-Num-Swaps и т.д.). Ошибка сервиса —
+    RequestError с кодом ответа.
+    """
+    request = urllib.request.Request(
+        f"http://{host}:{port}/generate",
+        data=json.dumps(params).encode('utf-8'),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            with open(output, 'wb') as f:
+                shutil.copyfileobj(response, f, STREAM_BUFFER)
+            return dict(response.headers)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read().decode('utf-8')).get("error", e.reason)
+        except ValueError:
+            message = e.reason
+        raise RequestError(e.code, message)
+
+
+def request_stats(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10):
+    """Статистика сервиса (GET /stats)"""
+    with urllib.request.urlopen(f"http://{host}:{port}/stats", timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="PlaylistServer", description="Local playlist generation service and client.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to bind or connect to")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind or connect to")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the service")
+    serve_parser.add_argument("--workers", type=int, default=None, help="generation threads (default: min(4, CPUs))")
+    serve_parser.add_argument("--max-queue", type=int, default=64, help="waiting requests before 503")
+    serve_parser.add_argument("--cache-ttl", type=float, default=300, help="seconds before a cached library is rescanned")
+    serve_parser.add_argument("-q", "--quiet", action="store_true", help="hide debug output")
+
+    request_parser = commands.add_parser("request", help="generate a playlist through a running service")
+    request_parser.add_argument("job", help="JSON job file: {\"folders\": [...], \"name\": ..., other PlaylistJob fields}")
+    request_parser.add_argument("-o", "--output", default=None, help="output file (default: <name>.<format>)")
+
+    commands.add_parser("stats", help="print service statistics")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        with open(os.devnull, 'w') if args.quiet else contextlib.nullcontext(sys.stdout) as out:
+            with contextlib.redirect_stdout(out):
+                serve(args.host, args.port, args.workers, args.max_queue, args.cache_ttl)
+        return 0
+
+    try:
+        if args.command == "stats":
+            print(json.dumps(request_stats(args.host, args.port), ensure_ascii=False, indent=2))
+            return 0
+
+        with open(args.job, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+        playlist_format = params.get("playlist_format", "m3u8")
+        extension = "xspf" if playlist_format == "xspf+url" else playlist_format
+        output = args.output or f"{params.get('name', 'Playlist')}.{extension}"
+        started = time.perf_counter()
+        headers = request_playlist(params, output, args.host, args.port)
+    except RequestError as e:
+        print(f"[ERROR] {e.status}: {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"[ERROR] Сервис недоступен: {e}", file=sys.stderr)
+        return 1
+
+    print(output)
+    for header in ("X-Seed", "X-Shadow-Seed", "X-Num-Swaps", "X-Reverse-Step"):
+        if header in headers:
+            print(f"{header[2:].upper().replace('-', '_')}:{headers[header]}")
+    print(f"TIME:{time.perf_counter() - started:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,807 @@
+import contextlib
+import itertools
+import json
+import os
+import queue
+import shutil
+import urllib.parse
+import uuid
+import xml.sax.saxutils as saxutils
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+from ShuffleEngine import LEGACY, SWAP_BATCH
+
+
+# Форматы плейлистов в порядке списка выбора
+PLAYLIST_FORMATS = ["m3u8", "m3u", "pls", "txt", "xspf", "asx", "xspf+url", "json", "wpl", "xml"]
+
+
+def format_duration(total_seconds):
+    """Форматирует продолжительность в формате Y:M:W:D:H:M:S, пропуская нулевые значения"""
+    # Константы времени
+    MINUTE = 60
+    HOUR = 60 * MINUTE
+    DAY = 24 * HOUR
+    WEEK = 7 * DAY
+    MONTH = 30 * DAY  # Упрощенное значение
+    YEAR = 365 * DAY   # Упрощенное значение
+
+    # Вычисляем каждую единицу времени
+    years = int(total_seconds // YEAR)
+    remaining = total_seconds % YEAR
+
+    months = int(remaining // MONTH)
+    remaining %= MONTH
+
+    weeks = int(remaining // WEEK)
+    remaining %= WEEK
+
+    days = int(remaining // DAY)
+    remaining %= DAY
+
+    hours = int(remaining // HOUR)
+    remaining %= HOUR
+
+    minutes = int(remaining // MINUTE)
+    seconds = remaining % MINUTE
+
+    # Собираем только значимые значения
+    parts = []
+    if years > 0:
+        parts.append(f"{years}")
+    if months > 0 or parts:  # Добавляем месяцы если есть годы
+        parts.append(f"{months}")
+    if weeks > 0 or parts:  # Добавляем недели если есть более крупные единицы
+        parts.append(f"{weeks}")
+    if days > 0 or parts:
+        parts.append(f"{days}")
+    if hours > 0 or parts:
+        parts.append(f"{hours:02d}")
+    if minutes > 0 or parts:
+        parts.append(f"{minutes:02d}")
+
+    # Секунды всегда добавляем с двумя знаками после запятой
+    parts.append(f"{seconds:05.2f}")  # Формат 35.00
+
+    # Объединяем части через двоеточие
+    formatted = ":".join(parts)
+
+    # Для случаев, когда продолжительность меньше минуты
+    if "H" not in formatted and "M" not in formatted and "S" in formatted:
+        # Формат MM:SS.00 (например 35.00 -> 00:35.00)
+        seconds_only = float(formatted.replace("S", ""))
+        minutes_part = int(seconds_only // 60)
+        seconds_part = seconds_only % 60
+        formatted = f"{minutes_part:02d}:{seconds_part:05.2f}"
+    elif "H" not in formatted and "M" in formatted and "S" in formatted:
+        # Формат MM:SS.00 (например 17M:35.00S -> 17:35.00)
+        m_part = formatted.split("M")[0]
+        s_part = formatted.split(":")[-1].replace("S", "")
+        formatted = f"{int(m_part):02d}:{float(s_part):05.2f}"
+
+    return formatted
+
+
+# Треков в одном куске записи: строки копятся в списке и уходят в файл одним write
+CHUNK_TRACKS = 4096
+# Буфер файла плейлиста (байт)
+BUFFER_SIZE = 1 << 20
+# Кусков в очереди одного писателя при записи нескольких форматов
+WRITER_QUEUE = 8
+
+# Надежность записи: файл всегда пишется во временный рядом и подменяется os.replace,
+# fsync — по уровню: none — без fsync, file — fsync файла, file+dir — еще и папки
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_DIR = "file+dir"
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_DIR)
+
+_WINDOWS = os.name == "nt"
+
+
+def normalize_durability(durability):
+    """Уровень надежности из настроек или аргументов; неизвестные и пустые значения — file"""
+    durability = (durability or "").strip().lower()
+    return durability if durability in DURABILITY_LEVELS else DURABILITY_FILE
+
+
+def _fsync_dir(folder):
+    # Папку на Windows открыть для fsync нельзя — там подмена имени и так надежна после закрытия
+    if os.name == 'nt':
+        return
+    fd = os.open(folder, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def _atomic_output(path, durability):
+    """Пишет во временный файл в той же папке и подменяет им path только после успешной записи.
+
+    Сбой или нехватка места посреди записи оставляют прежний файл целым,
+    а временный файл удаляется.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    temp_path = os.path.join(folder, f".{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        # Режим x создает файл с правами по umask, как обычный open(path, 'w')
+        with open(temp_path, 'x', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+            yield f
+            f.flush()
+            if durability != DURABILITY_NONE:
+                os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+    if durability == DURABILITY_DIR:
+        _fsync_dir(folder)
+
+
+def _open_output(path, durability=DURABILITY_FILE):
+    """Путь пишем атомарно сами, готовый текстовый поток (например, ответ сервера) — как есть"""
+    if hasattr(path, 'write'):
+        return contextlib.nullcontext(path)
+    return _atomic_output(path, normalize_durability(durability))
+
+
+def _escape(text):
+    # Большинство имен экранировать не нужно — обходимся без трех replace
+    if '&' in text or '<' in text or '>' in text:
+        return saxutils.escape(text)
+    return text
+
+
+# Заголовок плейлиста: seed None — без строк сида (редактор без перемешивания)
+PlaylistMeta = namedtuple(
+    "PlaylistMeta",
+    ["name", "date", "seed", "shadow_seed", "num_tracks", "reverse_step", "num_swaps", "algorithm", "swap_mode",
+     "duration"]
+)
+
+
+def meta_fields(meta):
+    """Пары (ключ, значение) служебного заголовка в порядке записи; пустые поля пропускаются"""
+    fields = []
+    if meta.duration is not None:
+        fields.append(("DURATION", meta.duration))
+    if meta.seed is not None:
+        fields.append(("SEED", meta.seed))
+    if meta.shadow_seed is not None:
+        fields.append(("SHADOW_SEED", meta.shadow_seed))
+    if meta.algorithm and meta.algorithm != LEGACY:
+        fields.append(("ALGORITHM", meta.algorithm))
+    if meta.num_swaps is not None and meta.num_swaps > 0:
+        fields.append(("NUM_SWAPS", meta.num_swaps))
+        if meta.swap_mode == SWAP_BATCH:
+            fields.append(("SWAP_MODE", meta.swap_mode))
+    if meta.reverse_step is not None and meta.reverse_step > 0:
+        fields.append(("REVERSE_STEP", meta.reverse_step))
+    return fields
+
+
+def track_title(filename):
+    """Имя файла без расширения (как os.path.splitext, но без лишних вызовов)"""
+    dot = filename.rfind('.')
+    if dot > 0 and filename[:dot].lstrip('.'):
+        return filename[:dot]
+    return filename
+
+
+class TrackChunk:
+    """Кусок треков для записи с полями, которые считаются один раз на весь кусок.
+
+    clean — пути после os.path.normpath, start — номер первого трека (с единицы),
+    durations — длительности в секундах (None — неизвестна) или None для всего куска,
+    base — папка, от которой пути пишутся относительными (None — пути абсолютные).
+    Остальные поля вычисляются при первом обращении и общие для всех форматов,
+    которые пишут этот кусок. folders — кэш кодированных и относительных папок
+    между кусками.
+    """
+
+    def __init__(self, paths, start, folders=None, durations=None, base=None):
+        self.start = start
+        self.folders = {} if folders is None else folders
+        self.durations = durations
+        self.relative = base is not None
+        self.clean = list(map(os.path.normpath, paths))
+        if self.relative:
+            self.clean = self._relative(self.clean, base)
+
+    def __len__(self):
+        return len(self.clean)
+
+    @cached_property
+    def seconds(self):
+        """Длительности целыми секундами для #EXTINF и PLS; -1 — определит плеер"""
+        if self.durations is None:
+            return ["-1"] * len(self.clean)
+        return ["-1" if duration is None else str(round(duration)) for duration in self.durations]
+
+    @cached_property
+    def milliseconds(self):
+        """Длительности в миллисекундах (XSPF) или None, если неизвестны"""
+        if self.durations is None:
+            return [None] * len(self.clean)
+        return [None if duration is None else round(duration * 1000) for duration in self.durations]
+
+    @cached_property
+    def locations(self):
+        """Пути с прямыми слешами — так они пишутся в плейлист"""
+        return [path.replace('\\', '/') for path in self.clean]
+
+    @cached_property
+    def filenames(self):
+        if _WINDOWS:
+            return list(map(os.path.basename, self.clean))
+        return [path[path.rfind('/') + 1:] for path in self.clean]
+
+    @cached_property
+    def titles(self):
+        return list(map(track_title, self.filenames))
+
+    @cached_property
+    def escaped_titles(self):
+        return list(map(_escape, self.titles))
+
+    @cached_property
+    def escaped_filenames(self):
+        return list(map(_escape, self.filenames))
+
+    @cached_property
+    def escaped_locations(self):
+        return list(map(_escape, self.locations))
+
+    @cached_property
+    def quoted_locations(self):
+        return self._quote(self.locations, self.filenames, "plain")
+
+    @cached_property
+    def escaped_quoted_locations(self):
+        return self._quote(self.escaped_locations, self.escaped_filenames, "escaped")
+
+    def _relative(self, paths, base):
+        prefixes = self.folders.get(("relative", base))
+        if prefixes is None:
+            prefixes = self.folders[("relative", base)] = _base_prefixes(base)
+        if _WINDOWS or not paths or not prefixes:
+            return [_relative_path(path, prefixes) for path in paths]
+        # Треки куска обычно лежат под одним предком base: для него хватает проверки префикса
+        # и среза; путь, который уходит глубже или в сторону, ищется по всей цепочке
+        level = next((level for level, (prefix, _, _) in enumerate(prefixes) if paths[0].startswith(prefix)), 0)
+        prefix, size, up = prefixes[level]
+        if not level:
+            return [path[size:] if path.startswith(prefix) else _relative_path(path, prefixes) for path in paths]
+        deeper = prefixes[level - 1][0]
+        return [
+            up + path[size:] if path.startswith(prefix) and not path.startswith(deeper)
+            else _relative_path(path, prefixes)
+            for path in paths
+        ]
+
+    def _quote(self, locations, filenames, kind):
+        # Кодирование посимвольное: папку кодируем один раз, к ней приклеиваем закодированное имя
+        quote = urllib.parse.quote
+        folders = self.folders.setdefault(kind, {})
+        quoted = []
+        for location, filename in zip(locations, filenames):
+            cut = len(location) - len(filename)
+            folder = location[:cut]
+            quoted_folder = folders.get(folder)
+            if quoted_folder is None:
+                quoted_folder = folders[folder] = quote(folder)
+            quoted.append(quoted_folder + quote(location[cut:]))
+        return quoted
+
+
+def _base_prefixes(base):
+    """Предки base от самой папки до корня, не включая его: (префикс с разделителем, его длина, подъем ../ к нему).
+
+    Общий префикс пути трека с base ищется по этой цепочке: относительный путь —
+    подъем плюс остаток пути после префикса, без os.path.relpath на каждый трек.
+    Корень (диск) общим предком не считается: пути, у которых с base общий только
+    корень, остаются абсолютными.
+    """
+    prefixes = []
+    folder = base
+    up = ""
+    while True:
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return prefixes
+        prefix = folder + os.sep
+        prefixes.append((os.path.normcase(prefix), len(prefix), up))
+        folder = parent
+        up += os.pardir + os.sep
+
+
+def _relative_path(path, prefixes):
+    """Путь относительно base по цепочке _base_prefixes; без общей с base папки — абсолютный"""
+    key = os.path.normcase(path) if _WINDOWS else path
+    for prefix, size, up in prefixes:
+        if key.startswith(prefix):
+            return up + path[size:]
+    # Относительный путь трека (папка задана относительно текущей) — сначала в абсолютный
+    if not os.path.isabs(path):
+        return _relative_path(os.path.abspath(path), prefixes)
+    return path
+
+
+def normalize_relative_to(value):
+    """Режим относительных путей из настроек: True, папка (строка) или None — абсолютные пути"""
+    if value is True:
+        return True
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def relative_base(path, relative_to):
+    """Папка для относительных путей по настройке relative_to или None — пути абсолютные.
+
+    relative_to: None/False — абсолютные пути, True — папка самого плейлиста
+    (path), строка — указанная папка.
+    """
+    if relative_to is None or relative_to is False:
+        return None
+    if relative_to is True:
+        if hasattr(path, 'write'):
+            raise ValueError("relative paths for a stream need a base folder")
+        relative_to = os.path.dirname(os.path.abspath(path))
+    return os.path.abspath(relative_to)
+
+
+def iter_chunks(files, size=CHUNK_TRACKS, durations=None, base=None):
+    """Делит пути на TrackChunk по size треков (читает files один раз, потоково).
+
+    durations — длительности треков в том же порядке, что и files, или None,
+    base — папка для относительных путей (см. relative_base) или None.
+    """
+    files = iter(files)
+    if durations is not None:
+        durations = iter(durations)
+    folders = {}
+    start = 1
+    while paths := list(itertools.islice(files, size)):
+        chunk_durations = None if durations is None else list(itertools.islice(durations, len(paths)))
+        yield TrackChunk(paths, start, folders, chunk_durations, base)
+        start += len(paths)
+
+
+class PlaylistFormat:
+    """Формат плейлиста: заголовок, треки и концовка.
+
+    Наследник задает name (ключ в списке форматов), extension (расширение
+    файла), label (для отладочного сообщения) и tracks(), и регистрируется
+    register_format. tracks() получает TrackChunk и возвращает текст всего
+    куска одной строкой.
+    """
+
+    name = None
+    extension = None
+    label = "Плейлист"
+
+    def header(self, meta):
+        return ""
+
+    def tracks(self, chunk, meta):
+        raise NotImplementedError
+
+    def footer(self, meta, count):
+        """Концовка файла; count — сколько треков записано"""
+        return ""
+
+
+PLAYLIST_BACKENDS = {}
+
+
+def register_format(backend):
+    """Регистрирует формат (класс PlaylistFormat) и добавляет его в список выбора"""
+    PLAYLIST_BACKENDS[backend.name] = backend
+    if backend.name not in PLAYLIST_FORMATS:
+        PLAYLIST_FORMATS.append(backend.name)
+    return backend
+
+
+@register_format
+class M3UFormat(PlaylistFormat):
+    name = extension = "m3u8"
+
+    def header(self, meta):
+        lines = [
+            "#EXTM3U\n",
+            "#Made with VolfLife's Playlist Generator\n",
+            f"#GENERATED:{meta.date}\n",
+            f"#PLAYLIST:{meta.name}\n",
+        ]
+        lines += [f"#{key}:{value}\n" for key, value in meta_fields(meta)]
+        lines.append(f"#TRACKS:{meta.num_tracks}\n\n")
+        return "".join(lines)
+
+    def tracks(self, chunk, meta):
+        return "".join([
+            f"#EXTINF:{seconds},{title}\n{location}\n"
+            for seconds, title, location in zip(chunk.seconds, chunk.escaped_titles, chunk.locations)
+        ])
+
+
+@register_format
+class M3UPlainFormat(M3UFormat):
+    name = extension = "m3u"
+
+
+@register_format
+class TXTFormat(PlaylistFormat):
+    name = extension = "txt"
+    label = "Треклист"
+
+    def header(self, meta):
+        lines = [
+            "#Made with VolfLife's Playlist Generator\n",
+            f"#GENERATED:{meta.date}\n",
+            f"#TRACKLIST:{meta.name}\n",
+        ]
+        lines += [f"#{key}:{value}\n" for key, value in meta_fields(meta)]
+        lines.append(f"#TRACKS:{meta.num_tracks}\n\n")
+        return "".join(lines)
+
+    def tracks(self, chunk, meta):
+        return "\n".join(chunk.locations) + "\n"
+
+
+@register_format
+class PLSFormat(PlaylistFormat):
+    name = extension = "pls"
+
+    def header(self, meta):
+        lines = [
+            "[playlist]\n",
+            ";Made with VolfLife's Playlist Generator\n",
+            f";GENERATED:{meta.date}\n",
+            f";PLAYLIST:{meta.name}\n",
+        ]
+        lines += [f";{key}:{value}\n" for key, value in meta_fields(meta)]
+        lines.append(f"NumberOfEntries={meta.num_tracks}\n")
+        lines.append("Version=2\n\n")  # Версия формата PLS
+        return "".join(lines)
+
+    def tracks(self, chunk, meta):
+        # Length -1 = длительность определит плеер; треки разделены пустой строкой (после последнего ее нет)
+        text = "\n".join([
+            f"File{number}={location}\nTitle{number}={title}\nLength{number}={seconds}\n"
+            for number, (location, title, seconds) in enumerate(
+                zip(chunk.locations, chunk.escaped_titles, chunk.seconds), chunk.start
+            )
+        ])
+        return text + "\n" if chunk.start + len(chunk) - 1 < meta.num_tracks else text
+
+
+@register_format
+class ASXFormat(PlaylistFormat):
+    name = extension = "asx"
+
+    def header(self, meta):
+        lines = [
+            '<ASX Version="3.0">\n',
+            f"<!-- Generated by VolfLife's Playlist Generator on {meta.date} -->\n",
+            f"<Title>{saxutils.escape(meta.name)}</Title>\n",
+        ]
+        lines += [f"<Abstract>{key}:{value}</Abstract>\n" for key, value in meta_fields(meta)]
+        lines.append(f"<Abstract>TRACKS:{meta.num_tracks}</Abstract>\n\n")
+        return "".join(lines)
+
+    def tracks(self, chunk, meta):
+        return "".join([
+            f'<Entry>\n  <Title>{title}</Title>\n  <Ref href="{location}" />\n</Entry>\n\n'
+            for title, location in zip(chunk.escaped_titles, chunk.escaped_locations)
+        ])
+
+    def footer(self, meta, count):
+        return "</ASX>"
+
+
+@register_format
+class XSPFFormat(PlaylistFormat):
+    name = extension = "xspf"
+
+    def title(self, meta):
+        return meta.name
+
+    def header(self, meta):
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<playlist version="1" xmlns="http://xspf.org/ns/0/">\n',
+            f"  <title>{self.title(meta)}</title>\n",
+            "  <creator>VolfLife's Playlist Generator</creator>\n",
+            f"  <date>{meta.date}</date>\n",
+            "  <annotation>\n",
+            f"    GENERATED:{meta.date}\n",
+        ]
+        lines += [f"    {key}:{value}\n" for key, value in meta_fields(meta)]
+        lines.append(f"    TRACKS:{meta.num_tracks}\n")
+        lines.append("  </annotation>\n")
+        lines.append("  <trackList>\n")
+        return "".join(lines)
+
+    def locations(self, chunk):
+        return chunk.locations
+
+    def durations(self, chunk):
+        # <duration> в миллисекундах идет сразу после <title>; неизвестную длительность не пишем
+        return ["" if milliseconds is None else f"      <duration>{milliseconds}</duration>\n"
+                for milliseconds in chunk.milliseconds]
+
+    def tracks(self, chunk, meta):
+        return "".join([
+            f"    <track>\n      <location>{location}</location>\n      <title>{title}</title>\n{duration}"
+            f'      <meta rel="filename">{filename}</meta>\n    </track>\n'
+            for location, title, duration, filename in zip(
+                self.locations(chunk), chunk.escaped_titles, self.durations(chunk), chunk.escaped_filenames
+            )
+        ])
+
+    def footer(self, meta, count):
+        return "  </trackList>\n</playlist>\n"
+
+
+@register_format
+class XSPFURLFormat(XSPFFormat):
+    """Тот же плейлист XSPF, но со ссылками file:// — сохраняется с расширением .xspf"""
+
+    name = "xspf+url"
+    extension = "xspf"
+
+    def locations(self, chunk):
+        if chunk.relative:
+            # Относительная ссылка пишется без схемы; абсолютными остаются пути с другого диска
+            return [
+                "file:///" + location if os.path.isabs(path) else location
+                for location, path in zip(chunk.quoted_locations, chunk.clean)
+            ]
+        return ["file:///" + location for location in chunk.quoted_locations]
+
+
+@register_format
+class JSONFormat(PlaylistFormat):
+    name = extension = "json"
+
+    def header(self, meta):
+        data = {
+            "name": meta.name,
+            "duration": meta.duration if meta.duration else None,
+            "generator": "VolfLife's Playlist Generator",
+            "created": meta.date,
+            "seed": meta.seed,
+            "shadow_seed": meta.shadow_seed,
+            "algorithm": meta.algorithm if meta.algorithm and meta.algorithm != LEGACY else None,
+            "num_swaps": meta.num_swaps if meta.num_swaps and meta.num_swaps > 0 else None,
+            "swap_mode": meta.swap_mode if meta.swap_mode == SWAP_BATCH and meta.num_swaps else None,
+            "reverse_step": meta.reverse_step if meta.reverse_step and meta.reverse_step > 0 else None,
+            "num_tracks": meta.num_tracks
+        }
+        # Треки пишутся кусками, не собираясь в список (вывод как у json.dump с indent=4)
+        data_json = json.dumps(data, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        return '{\n    "meta": ' + data_json + ',\n    "tracks": ['
+
+    def tracks(self, chunk, meta):
+        # Строка JSON так же, как json.dumps(..., ensure_ascii=False)
+        quote = json.encoder.encode_basestring
+        # Длительность в секундах с точностью до миллисекунды; неизвестная не пишется
+        durations = [
+            "" if milliseconds is None else f',\n            "duration": {milliseconds / 1000!r}'
+            for milliseconds in chunk.milliseconds
+        ]
+        text = ",".join([
+            f'\n        {{\n            "path": {quote(location)},\n            "filename": {quote(filename)},'
+            f'\n            "title": {quote(title)}{duration}\n        }}'
+            for location, filename, title, duration in zip(chunk.locations, chunk.filenames, chunk.titles, durations)
+        ])
+        return text if chunk.start == 1 else "," + text
+
+    def footer(self, meta, count):
+        # Пустой список json.dump записывает как []
+        return "\n    ]\n}" if count else "]\n}"
+
+
+@register_format
+class WPLFormat(PlaylistFormat):
+    name = extension = "wpl"
+
+    def header(self, meta):
+        lines = [
+            '<?wpl version="1.0"?>\n',
+            "<smil>\n",
+            "  <head>\n",
+            "    <meta name=\"Generator\" content=\"VolfLife's Playlist Generator\"/>\n",
+            f'    <meta name="ItemCount" content="{meta.num_tracks}"/>\n',
+            f"    <title>{meta.name}</title>\n",
+            # Метаданные в виде комментариев (альтернатива для WPL)
+            "    <!--\n",
+            f"      GENERATED:{meta.date}\n",
+        ]
+        lines += [f"      {key}:{value}\n" for key, value in meta_fields(meta)]
+        lines.append("    -->\n")
+        lines.append("  </head>\n  <body>\n    <seq>\n")
+        return "".join(lines)
+
+    def tracks(self, chunk, meta):
+        return "".join([f'      <media src="{location}"/>\n' for location in chunk.escaped_locations])
+
+    def footer(self, meta, count):
+        return "    </seq>\n  </body>\n</smil>\n"
+
+
+@register_format
+class XMLFormat(XSPFFormat):
+    name = extension = "xml"
+
+    def title(self, meta):
+        return saxutils.escape(meta.name)
+
+    def tracks(self, chunk, meta):
+        return "".join([
+            f"    <track>\n      <location>{location}</location>\n      <title>{title}</title>\n{duration}"
+            f'      <meta rel="trackNumber">{number}</meta>\n    </track>\n'
+            for number, (location, title, duration) in enumerate(
+                zip(chunk.escaped_quoted_locations, chunk.escaped_titles, self.durations(chunk)), chunk.start
+            )
+        ])
+
+
+def playlist_extension(path, playlist_format):
+    """Путь файла с расширением формата (xspf+url сохраняется как .xspf)"""
+    extension = PLAYLIST_BACKENDS[playlist_format].extension
+    if extension == playlist_format:
+        return path
+    return os.path.splitext(path)[0] + f".{extension}"
+
+
+def parse_formats(value):
+    """Список форматов из строки через запятую или итерируемого; повторы убираются.
+
+    ValueError — неизвестный формат или два формата, пишущие один файл (xspf и xspf+url).
+    """
+    if isinstance(value, str):
+        value = value.split(",")
+    formats = []
+    extensions = {}
+    for playlist_format in value:
+        playlist_format = playlist_format.strip()
+        if not playlist_format or playlist_format in formats:
+            continue
+        if playlist_format not in PLAYLIST_BACKENDS:
+            raise ValueError(f"unknown format: {playlist_format}")
+        extension = PLAYLIST_BACKENDS[playlist_format].extension
+        if extension in extensions:
+            raise ValueError(f"{extensions[extension]} and {playlist_format} write the same .{extension} file")
+        extensions[extension] = playlist_format
+        formats.append(playlist_format)
+    if not formats:
+        raise ValueError("no playlist format")
+    return formats
+
+
+def merge_formats(playlist_format, extra_formats):
+    """Основной формат и дополнительные из настроек.
+
+    Неизвестный или конфликтующий с уже выбранными (тот же файл) дополнительный
+    формат пропускается, остальные сохраняются.
+    """
+    formats = parse_formats([playlist_format])
+    for extra_format in extra_formats:
+        try:
+            formats = parse_formats([*formats, extra_format])
+        except ValueError as e:
+            print(f"[WARNING] Дополнительный формат {extra_format} пропущен: {e}")
+    return formats
+
+
+def _write_chunks(path, backend, meta, chunks, durability=DURABILITY_FILE):
+    count = 0
+    with _open_output(path, durability) as f:
+        f.write(backend.header(meta))
+        for chunk in chunks:
+            f.write(backend.tracks(chunk, meta))
+            count += len(chunk)
+        f.write(backend.footer(meta, count))
+    print(f"[DEBUG] {backend.label} создан и сохранен: {meta.name}.{backend.extension}")
+    return path
+
+
+# Метка в очереди писателя: источник путей упал, файл не должен подменять прежний
+_ABORT = object()
+
+
+def _queued_chunks(chunks):
+    """Куски из очереди писателя до метки конца (None)"""
+    while (chunk := chunks.get()) is not None:
+        if chunk is _ABORT:
+            raise RuntimeError("playlist source failed")
+        yield chunk
+
+
+def _write_queued(path, backend, meta, chunks, durability):
+    stream = _queued_chunks(chunks)
+    try:
+        return _write_chunks(path, backend, meta, stream, durability)
+    finally:
+        # Упавший писатель дочитывает очередь, чтобы не останавливать раздачу кусков остальным
+        for _ in stream:
+            pass
+
+
+def _make_meta(name, seed, shadow_seed, num_tracks, date, reverse_step, num_swaps, algorithm, swap_mode, duration):
+    return PlaylistMeta(
+        name, date.strftime("%Y-%m-%d %H:%M:%S"), seed, shadow_seed, num_tracks, reverse_step, num_swaps,
+        algorithm, swap_mode, duration
+    )
+
+
+def write_playlist(path, files, name, seed, shadow_seed, num_tracks, date, reverse_step=None, num_swaps=None,
+                   playlist_format=None, algorithm=None, swap_mode=None, duration=None, durability=DURABILITY_FILE,
+                   durations=None, relative_to=None):
+    """Записывает плейлист в формате playlist_format и возвращает путь файла.
+
+    path — путь к файлу или открытый текстовый поток (не закрывается),
+    files — итерируемые пути в итоговом порядке (читаются один раз, потоково),
+    duration — общая длительность для заголовка (строка format_duration) или None,
+    seed None — заголовок без сида и параметров перемешивания,
+    durability — уровень fsync при атомарной записи файла (DURABILITY_LEVELS),
+    durations — длительности треков в секундах в порядке files (None — неизвестна)
+    для #EXTINF, Length, <duration> и JSON; без них пишется -1, как раньше,
+    relative_to — пути относительно папки плейлиста (True) или указанной папки
+    (строка); None — абсолютные пути.
+    """
+    backend = PLAYLIST_BACKENDS.get(playlist_format)
+    if backend is None:
+        return None
+    if isinstance(path, str):
+        path = playlist_extension(path, playlist_format)
+    meta = _make_meta(name, seed, shadow_seed, num_tracks, date, reverse_step, num_swaps, algorithm, swap_mode, duration)
+    chunks = iter_chunks(files, durations=durations, base=relative_base(path, relative_to))
+    return _write_chunks(path, backend(), meta, chunks, durability)
+
+
+def write_playlists(path, files, name, seed, shadow_seed, num_tracks, date, reverse_step=None, num_swaps=None,
+                    playlist_formats=("m3u8",), algorithm=None, swap_mode=None, duration=None,
+                    durability=DURABILITY_FILE, durations=None, relative_to=None):
+    """Записывает один и тот же порядок сразу в несколько форматов; возвращает пути файлов.
+
+    path — путь без расширения (у каждого формата свое), остальное — как у
+    write_playlist. Пути читаются и нормализуются один раз: куски TrackChunk
+    раздаются писателям в пуле потоков, каждый пишет свой файл потоково.
+    """
+    formats = parse_formats(playlist_formats)
+    paths = [playlist_extension(f"{path}.{playlist_format}", playlist_format) for playlist_format in formats]
+    meta = _make_meta(name, seed, shadow_seed, num_tracks, date, reverse_step, num_swaps, algorithm, swap_mode, duration)
+    # Все файлы пишутся в одну папку, поэтому относительные пути общие для всех форматов
+    base = relative_base(paths[0], relative_to)
+    if len(formats) == 1:
+        chunks = iter_chunks(files, durations=durations, base=base)
+        return [_write_chunks(paths[0], PLAYLIST_BACKENDS[formats[0]](), meta, chunks, durability)]
+
+    # Очередь на писателя ограничена: в памяти не больше WRITER_QUEUE кусков на формат
+    queues = [queue.Queue(maxsize=WRITER_QUEUE) for _ in formats]
+    with ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix="PlaylistWriter") as executor:
+        futures = [
+            executor.submit(_write_queued, file_path, PLAYLIST_BACKENDS[playlist_format](), meta, chunks, durability)
+            for file_path, playlist_format, chunks in zip(paths, formats, queues)
+        ]
+        end = _ABORT
+        try:
+            for chunk in iter_chunks(files, durations=durations, base=base):
+                for chunks in queues:
+                    chunks.put(chunk)
+            end = None
+        finally:
+            for chunks in queues:
+                chunks.put(end)
+        # Первая ошибка писателя пробрасывается после того, как остальные дописали свои файлы
+        return [future.result() for future in futures]
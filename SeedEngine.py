@@ -0,0 +1,87 @@
+import hashlib
+import math
+import random
+import sys
+
+
+# До этого числа треков n! считаем напрямую — это быстро и заведомо точно
+EXACT_LIMIT = 1000
+
+_LOG10_E = 1 / math.log(10)
+
+
+def log10_factorial(n):
+    """log10(n!) через lgamma, без вычисления самого факториала"""
+    return math.lgamma(n + 1) * _LOG10_E
+
+
+def _guard(log_value):
+    """Запас на погрешность lgamma (несколько ulp от результата)"""
+    return 1e-12 * log_value + 1e-9
+
+
+def factorial_digits(num_tracks):
+    """Количество цифр в n! — длина сида (то же, что len(str(math.factorial(n))))"""
+    if num_tracks <= EXACT_LIMIT:
+        return len(str(math.factorial(num_tracks)))
+
+    log_value = log10_factorial(num_tracks)
+    nearest = round(log_value)
+    if abs(log_value - nearest) > _guard(log_value):
+        return math.floor(log_value) + 1
+
+    # Слишком близко к степени 10 — сравниваем точно, но без перевода n! в строку
+    return nearest + 1 if math.factorial(num_tracks) >= 10 ** nearest else nearest
+
+
+def mod_factorial(value, num_tracks):
+    """value % n! без вычисления n!, когда value заведомо меньше факториала"""
+    if num_tracks > EXACT_LIMIT and value >= 0:
+        if value < 10 or math.log10(value) < log10_factorial(num_tracks) - _guard(log10_factorial(num_tracks)):
+            return value
+    return value % math.factorial(num_tracks)
+
+
+def format_seed(value, num_tracks, digits_only):
+    """Сид нужной длины: цифры с ведущими нулями или префикс sha256"""
+    width = factorial_digits(num_tracks)
+    if value.bit_length() > 10_000:
+        # Перевод очень длинных чисел в строку (теневой сид больших медиатек)
+        import _pylong
+        sys.set_int_max_str_digits(0)
+    if digits_only:
+        return str(value).zfill(width)
+    # Для буквенно-цифрового формата используем хеш
+    hash_obj = hashlib.sha256(str(value).encode())
+    return hash_obj.hexdigest()[:width]
+
+
+def date_seed_value(num_tracks, date, total_size):
+    """Предсказуемая часть основного сида: дата, число треков и общий размер по модулю n!"""
+    return mod_factorial(int(date.timestamp()) * num_tracks * total_size, num_tracks)
+
+
+def shadow_seed_value(num_tracks, seed_trimmed, rng=None):
+    """Непредсказуемый теневой сид: основной сид + случайное число по модулю n!"""
+    if rng is None:
+        rng = random.Random()
+    random_part = rng.getrandbits(256)
+    random_nbr = rng.getrandbits(128)
+    random_nbrr = rng.getrandbits(64)
+    random_nbrrr = rng.getrandbits(4)
+    number = [1, random_nbr, random_nbrr, 1, random_nbrrr]
+    random_divisor = rng.choice(number)
+
+    # Выбираем подходящий делитель
+    random_divisor = rng.choice(number)
+    if random_divisor == 0 or (random_divisor > random_part and random_divisor != 1):
+        random_divisor = max([x for x in number if x <= random_part])
+
+    result = (random_part // random_divisor)
+
+    seed_num = int((seed_trimmed), 16) if isinstance(seed_trimmed, str) else seed_trimmed
+
+    predictable_num = mod_factorial(seed_num + result + 1, num_tracks)
+
+    print(f"[DEBUG] ГЕНЕРАЦИЯ ТЕНЕВОГО СИДА \n=================================================================== \n Количество треков = {num_tracks} \n Случайное число = {random_part} \n Делитель = {random_divisor} \n Разность = {result} \n Основной сид = {seed_num} \n Результат = {predictable_num}")
+    return predictable_num
@@ -0,0 +1,238 @@
+import hashlib
+import importlib.util
+import math
+import random
+import string
+import sys
+from array import array
+
+from LazyPermutation import FeistelPermutation
+from Permutation import unrank_permutation
+from SeedEngine import mod_factorial
+
+
+# NumPy необязателен (без него нет pcg64) и загружается при первом использовании —
+# импорт занимает ~0.1 с, а консольный генератор должен стартовать мгновенно
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+# Меньшие пачки быстрее обработать без NumPy, чем загружать его
+NUMPY_MIN_ITEMS = 4096
+_np = None
+
+
+def _numpy():
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+
+# Алгоритмы перемешивания; ID записывается в заголовок плейлиста (#ALGORITHM)
+LEGACY = "legacy"  # Random(stable_hash(сид)).shuffle — все старые плейлисты
+EXACT = "exact"    # Сид — номер перестановки в факториальной системе (доступны все n! порядков)
+PCG64 = "pcg64-v1"  # Перестановка индексов из сырого потока numpy PCG64 (нужен NumPy)
+FEISTEL = "feistel-v1"  # Ленивая перестановка на сети Фейстеля — порядок не хранится целиком
+ALGORITHMS = (LEGACY, EXACT, PCG64, FEISTEL)
+
+
+# Режим перестановок пар (#SWAP_MODE); compat повторяет прежнюю последовательность для старых сидов
+SWAP_COMPAT = "compat"  # По одной паре через Random.sample
+SWAP_BATCH = "batch"    # Все пары одним вызовом Random.randbytes
+SWAP_MODES = (SWAP_COMPAT, SWAP_BATCH)
+# Пары в batch тянутся кусками по столько штук (одна пара — 16 байт потока)
+SWAP_CHUNK = 65536
+
+
+def normalize_swap_mode(swap_mode):
+    """Режим перестановок из настроек или заголовка; неизвестные и пустые значения — compat"""
+    swap_mode = (swap_mode or "").strip().lower()
+    return swap_mode if swap_mode in SWAP_MODES else SWAP_COMPAT
+
+
+def available_algorithms():
+    """Алгоритмы, доступные в текущем окружении"""
+    return tuple(algorithm for algorithm in ALGORITHMS if algorithm != PCG64 or HAS_NUMPY)
+
+
+def normalize_algorithm(algorithm):
+    """ID алгоритма из настроек или заголовка; неизвестные и пустые значения — legacy"""
+    algorithm = (algorithm or "").strip().lower()
+    return algorithm if algorithm in ALGORITHMS else LEGACY
+
+
+def stable_hash(s):
+    """Детерминированная замена hash() с использованием hashlib"""
+    return int(hashlib.md5(str(s).encode()).hexdigest(), 16) % (10**12)
+
+
+def intensity_swaps(seed, intensity, num_tracks):
+    """Число перестановок по интенсивности, как в legacy: 1 — 60-100% треков из хеша сида"""
+    if not intensity:
+        return 0
+    if intensity == 1:
+        hash_val = (abs(stable_hash(seed)) % 10_000_000_000) / 10_000_000_000
+        return min(int(num_tracks * (0.6 + 0.4 * hash_val) * 1.07), num_tracks)
+    return int(intensity)
+
+
+def seed_to_int(seed):
+    """Число из строки сида: десятичные цифры, иначе шестнадцатеричная запись, иначе байты UTF-8"""
+    seed = str(seed).strip()
+    if seed.isdecimal():
+        return int(seed)
+    if seed and all(ch in string.hexdigits for ch in seed):
+        return int(seed, 16)
+    return int.from_bytes(seed.encode('utf-8'), 'big')
+
+
+def expand_seed(seed, num_tracks):
+    """Растягивает короткий автоматический сид на весь диапазон 0..n!-1.
+
+    Без этого маленький номер меняет только последние треки, а начало списка
+    остается отсортированным. Результат — число; для сида его переводят в строку
+    через Permutation.to_decimal (str на сотнях тысяч цифр работает десятки секунд).
+    """
+    num_bytes = math.ceil(math.lgamma(num_tracks + 1) / math.log(256)) + 16
+    digest = hashlib.shake_256(str(seed).encode()).digest(num_bytes)
+    return mod_factorial(int.from_bytes(digest, 'big'), num_tracks)
+
+
+def exact_permutation(seed, num_tracks):
+    """Перестановка индексов 0..n-1 для сида в режиме exact"""
+    return unrank_permutation(seed_to_int(seed), num_tracks)
+
+
+def pcg64_permutation(seed, num_tracks, num_swaps=0):
+    """Перестановка индексов 0..n-1 (int32) для сида в режиме pcg64-v1.
+
+    Берется только сырой поток PCG64 (random_raw): он зафиксирован в NumPy,
+    а методы Generator (permutation, shuffle) могут меняться между версиями.
+    Порядок — argsort 64-битных ключей, затем num_swaps перестановок пар.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("NumPy не установлен: алгоритм pcg64 недоступен")
+    np = _numpy()
+    rng = np.random.Generator(np.random.PCG64(seed_to_int(seed)))
+    raw = rng.bit_generator.random_raw
+    permutation = np.argsort(raw(num_tracks), kind='stable').astype(np.int32)
+    if num_swaps and num_tracks > 1:
+        pairs = raw(2 * num_swaps).reshape(-1, 2)
+        # Второй индекс всегда отличается от первого, как у random.sample
+        # (uint64 со скаляром того же типа — без перехода во float в старых NumPy)
+        n = np.uint64(num_tracks)
+        first = pairs[:, 0] % n
+        second = (first + np.uint64(1) + pairs[:, 1] % (n - np.uint64(1))) % n
+        swapped = permutation.tolist()
+        _apply_swaps(swapped, first.tolist(), second.tolist())
+        permutation = np.array(swapped, dtype=np.int32)
+    return permutation
+
+
+def _apply_swaps(permutation, first, second):
+    """Применяет перестановки пар (first[k], second[k]) по порядку"""
+    for i, j in zip(first, second):
+        permutation[i], permutation[j] = permutation[j], permutation[i]
+
+
+def batch_swap_pairs(num_swaps, num_tracks, rng):
+    """Генератор пачек пар (first, second) из засеянного rng, по SWAP_CHUNK пар за вызов.
+
+    Каждая пара — два 64-битных числа из rng.randbytes; второй индекс
+    всегда отличается от первого, как у random.sample.
+    """
+    for start in range(0, num_swaps, SWAP_CHUNK):
+        count = min(SWAP_CHUNK, num_swaps - start)
+        data = rng.randbytes(16 * count)
+        if HAS_NUMPY and count >= NUMPY_MIN_ITEMS:
+            np = _numpy()
+            words = np.frombuffer(data, dtype='<u8').reshape(-1, 2)
+            n = np.uint64(num_tracks)
+            first = words[:, 0] % n
+            second = (first + np.uint64(1) + words[:, 1] % (n - np.uint64(1))) % n
+            yield first.tolist(), second.tolist()
+            continue
+        words = array('Q', data)
+        if sys.byteorder != 'little':
+            words.byteswap()
+        first = [word % num_tracks for word in words[0::2]]
+        second = [(i + 1 + word % (num_tracks - 1)) % num_tracks for i, word in zip(first, words[1::2])]
+        yield first, second
+
+
+def legacy_permutation(seed, num_tracks, intensity=0, swap_mode=SWAP_COMPAT, rng=None):
+    """Перестановка позиций в режиме legacy: shuffle и перестановки пар на random.Random.
+
+    Повторяет прежний soft_shuffle, но над индексами и без глобального random:
+    последовательность экземпляра, засеянного тем же числом, та же, поэтому
+    порядки совпадают. Переданный rng остается засеянным сидом — редактор берет
+    из него случайный шаг реверса сразу после перемешивания. В режиме batch
+    пары берутся пачками из того же rng и без лога по каждой паре.
+    """
+    if rng is None:
+        rng = random.Random()
+    rng.seed(abs(stable_hash(seed)))
+    permutation = array('I', range(num_tracks))
+    rng.shuffle(permutation)
+    num_swaps = intensity_swaps(seed, intensity, num_tracks) if num_tracks > 1 else 0
+    print(f"[DEBUG] Количество перестановок = {num_swaps}")
+    if swap_mode == SWAP_BATCH:
+        for first, second in batch_swap_pairs(num_swaps, num_tracks, rng):
+            _apply_swaps(permutation, first, second)
+        return permutation, num_swaps
+    for _ in range(num_swaps):
+        i, j = rng.sample(range(num_tracks), 2)
+        permutation[i], permutation[j] = permutation[j], permutation[i]
+        print(f"[DEBUG] Перемешано {i}<->{j}")
+    return permutation, num_swaps
+
+
+def shuffle_permutation(seed, num_tracks, algorithm=LEGACY, intensity=0, swap_mode=SWAP_COMPAT, rng=None):
+    """Перестановка позиций выбранным алгоритмом: (array('I') или FeistelPermutation, число перестановок пар).
+
+    Элемент k — позиция в отсортированном списке, трек которой встанет k-м.
+    swap_mode влияет только на legacy: в pcg64 пары и так берутся одним вызовом.
+    rng — экземпляр random.Random для legacy; глобальное состояние random не меняется,
+    поэтому генерации можно запускать параллельно в разных потоках.
+    """
+    if algorithm == EXACT:
+        # Сид сам задает перестановку — дополнительные перестановки не применяются
+        return exact_permutation(seed, num_tracks), 0
+    if algorithm == FEISTEL:
+        # Перестановки пар потребовали бы хранить весь порядок — в этом режиме их нет
+        return FeistelPermutation(seed, num_tracks), 0
+    if algorithm == PCG64:
+        num_swaps = intensity_swaps(seed, intensity, num_tracks) if num_tracks > 1 else 0
+        print(f"[DEBUG] Количество перестановок = {num_swaps}")
+        permutation = pcg64_permutation(seed, num_tracks, num_swaps)
+        return array('I', permutation.astype(_numpy().uint32).tobytes()), num_swaps
+    return legacy_permutation(seed, num_tracks, intensity, swap_mode, rng)
+
+
+def reverse_blocks(permutation, step):
+    """Реверс блоков по step, собранный в то же отображение индексов (без срезов по блокам)"""
+    if not step or step <= 1:
+        return permutation
+    if isinstance(permutation, FeistelPermutation):
+        return permutation.with_reverse_step(step)
+    num_tracks = len(permutation)
+    return array('I', (
+        permutation[index]
+        for start in range(0, num_tracks, step)
+        for index in range(min(start + step, num_tracks) - 1, start - 1, -1)
+    ))
+
+
+def apply_permutation(items, permutation):
+    """items[permutation] за один проход: для array индексов с NumPy — одной выборкой.
+
+    Ленивую перестановку не материализуем: возвращается представление.
+    """
+    if isinstance(permutation, FeistelPermutation):
+        return permutation.view(items)
+    if isinstance(items, array):
+        if HAS_NUMPY and len(items) >= NUMPY_MIN_ITEMS:
+            np = _numpy()
+            gathered = np.asarray(items, dtype=np.uint32)[np.asarray(permutation, dtype=np.intp)]
+            return array('I', gathered.astype(np.uint32).tobytes())
+        return array('I', (items[i] for i in permutation))
+    return [items[i] for i in permutation]
@@ -0,0 +1,304 @@
+import ctypes
+import json
+import os
+import sys
+import threading
+import time
+
+
+# Интервал фонового опроса памяти процесса (секунды)
+SAMPLE_INTERVAL = 0.01
+
+# Профайлер, чьи счетчики сейчас пополняются, — свой у каждого потока (нет атрибута — профилирование выключено)
+_local = threading.local()
+# Хук аудита снять нельзя: он ставится один раз и без активного профайлера потока ничего не делает
+_hook_installed = False
+_hook_lock = threading.Lock()
+
+
+def count(name, amount=1):
+    """Пополняет счетчик name активного профайлера потока; без профилирования ничего не делает"""
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.counters[name] = profiler.counters.get(name, 0) + amount
+
+
+def _audit(event, args):
+    # Открытия файлов считаются через аудит: open(), os.open и чтение модулей
+    if event == "open":
+        profiler = getattr(_local, "profiler", None)
+        if profiler is not None and profiler.count_opens:
+            profiler.counters["open"] = profiler.counters.get("open", 0) + 1
+
+
+def _install_hook():
+    global _hook_installed
+    with _hook_lock:
+        if not _hook_installed:
+            sys.addaudithook(_audit)
+            _hook_installed = True
+
+
+class _ProcessStats:
+    """Счетчики ввода-вывода и память процесса средствами ОС (None — недоступно)"""
+
+    def __init__(self):
+        self._io_fd = None
+        self._statm_fd = None
+        self._page_size = 4096
+        # Собственные чтения /proc вычитаются из счетчиков, чтобы не засорять этапы
+        self._own_ops = 0
+        self._own_bytes = 0
+        if sys.platform == "win32":
+            self._init_windows()
+        elif os.path.exists("/proc/self/io"):
+            # Файлы /proc открываются один раз: повторные чтения не попадают в счетчик open
+            try:
+                self._io_fd = os.open("/proc/self/io", os.O_RDONLY)
+                self._statm_fd = os.open("/proc/self/statm", os.O_RDONLY)
+                self._page_size = os.sysconf("SC_PAGE_SIZE")
+            except (OSError, ValueError, AttributeError):
+                self.close()
+
+    def _init_windows(self):
+        from ctypes import wintypes
+
+        class IO_COUNTERS(ctypes.Structure):
+            _fields_ = [(name, ctypes.c_ulonglong) for name in (
+                "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+                "ReadTransferCount", "WriteTransferCount", "OtherTransferCount"
+            )]
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        self._kernel32 = ctypes.windll.kernel32
+        self._kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        self._io_counters = IO_COUNTERS()
+        self._memory_counters = PROCESS_MEMORY_COUNTERS()
+        self._memory_counters.cb = ctypes.sizeof(PROCESS_MEMORY_COUNTERS)
+
+    def io(self):
+        """(операций чтения, байт прочитано) с начала процесса"""
+        if sys.platform == "win32":
+            process = self._kernel32.GetCurrentProcess()
+            if self._kernel32.GetProcessIoCounters(process, ctypes.byref(self._io_counters)):
+                return self._io_counters.ReadOperationCount, self._io_counters.ReadTransferCount
+            return None
+        if self._io_fd is None:
+            return None
+        fields = {}
+        for line in self._read(self._io_fd, 4096).decode().splitlines():
+            key, _, value = line.partition(":")
+            fields[key] = int(value)
+        return fields.get("syscr", 0) - self._own_ops, fields.get("rchar", 0) - self._own_bytes
+
+    def rss(self):
+        """Текущий объем памяти процесса (рабочий набор) в байтах"""
+        if sys.platform == "win32":
+            process = self._kernel32.GetCurrentProcess()
+            if self._kernel32.K32GetProcessMemoryInfo(process, ctypes.byref(self._memory_counters),
+                                                      self._memory_counters.cb):
+                return self._memory_counters.WorkingSetSize
+            return None
+        if self._statm_fd is None:
+            return None
+        return int(self._read(self._statm_fd, 256).split()[1]) * self._page_size
+
+    def _read(self, fd, size):
+        data = os.pread(fd, size, 0)
+        self._own_ops += 1
+        self._own_bytes += len(data)
+        return data
+
+    def close(self):
+        for fd in (self._io_fd, self._statm_fd):
+            if fd is not None:
+                os.close(fd)
+        self._io_fd = self._statm_fd = None
+
+
+class _Span:
+    """Один этап: время, приращения счетчиков и пик памяти за время этапа"""
+
+    __slots__ = ("profiler", "stage", "index", "depth", "started", "counters", "io", "peak")
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.depth = len(profiler._open)
+        self.counters = dict(profiler.counters)
+        self.io = profiler._stats.io()
+        self.peak = profiler._stats.rss()
+        with profiler._lock:
+            profiler._open.append(self)
+            # Место в списке занимаем при входе: этапы идут в порядке начала, а не завершения
+            self.index = len(profiler.spans)
+            profiler.spans.append(None)
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter_ns() - self.started
+        profiler = self.profiler
+        stats = profiler._stats
+        with profiler._lock:
+            profiler._open.remove(self)
+        self.sample(stats.rss())
+        record = {"stage": self.stage, "depth": self.depth, "ms": round(elapsed / 1e6, 3)}
+        for name, value in profiler.counters.items():
+            delta = value - self.counters.get(name, 0)
+            if delta:
+                record[name] = delta
+        io = stats.io()
+        if io is not None and self.io is not None:
+            # Опрос памяти из другого потока может сдвинуть вычет на одно чтение
+            record["read_ops"] = max(0, io[0] - self.io[0])
+            record["read_bytes"] = max(0, io[1] - self.io[1])
+        if self.peak is not None:
+            record["peak_rss"] = self.peak
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        profiler.spans[self.index] = record
+        return False
+
+    def sample(self, rss):
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StageProfiler:
+    """Легкое профилирование этапов: with profiler: ... with profiler.span("этап"): ...
+
+    Время — perf_counter_ns, счетчики open/stat/scandir — через аудит и count()
+    в потоке, где профайлер запущен (у каждого потока свой активный профайлер),
+    чтение с диска и память — счетчики процесса (поток опроса раз в
+    SAMPLE_INTERVAL ловит пик между границами этапов). Счетчики процесса общие:
+    работа других потоков во время этапа тоже попадает в них.
+    Выключенный профайлер (enabled=False) не делает ничего. count_opens=False —
+    без счетчика open: хук аудита остается в процессе навсегда, поэтому его
+    ставят только профили, которые сохраняются (--profile, profile_sidecar).
+    """
+
+    def __init__(self, name, enabled=True, count_opens=True):
+        self.name = name
+        self.enabled = enabled
+        self.count_opens = count_opens
+        self.spans = []
+        self.counters = {}
+        self.started = None
+        self._open = []
+        self._lock = threading.Lock()
+        self._stats = None
+        self._previous = None
+        self._stop = None
+        self._sampler = None
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        if self.count_opens:
+            _install_hook()
+        self._stats = _ProcessStats()
+        self.started = time.time()
+        self._previous = getattr(_local, "profiler", None)
+        _local.profiler = self
+        if self._stats.rss() is not None:
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample_memory, daemon=True)
+            self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.enabled:
+            return False
+        _local.profiler = self._previous
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        self._stats.close()
+        self._stats = None
+        return False
+
+    def span(self, stage):
+        """Контекстный менеджер этапа; этапы можно вкладывать"""
+        if not self.enabled or self._stats is None:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def _sample_memory(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            rss = self._stats.rss()
+            with self._lock:
+                for span in self._open:
+                    span.sample(rss)
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "started": self.started,
+            "stages": [span for span in self.spans if span is not None],
+            "counters": dict(self.counters),
+        }
+
+    def report(self):
+        """Печатает таблицу этапов в отладочную консоль"""
+        if not self.enabled or not self.spans:
+            return
+        print(f"[DEBUG] ПРОФИЛЬ: {self.name} \n===================================================================")
+        for span in self.spans:
+            if span is None:
+                continue
+            details = [f"{span['ms']:.3f} мс"]
+            for key in ("open", "stat", "scandir", "read_ops"):
+                if span.get(key):
+                    details.append(f"{key} {span[key]}")
+            if span.get("read_bytes"):
+                details.append(f"прочитано {span['read_bytes'] / 1024:.0f} КБ")
+            if span.get("peak_rss"):
+                details.append(f"пик памяти {span['peak_rss'] / 1048576:.1f} МБ")
+            print(f" {'  ' * span['depth']}{span['stage']}: {', '.join(details)}")
+        print("===================================================================")
+
+    def write_sidecar(self, playlist_path, related=None):
+        """Сохраняет профиль в JSON рядом с плейлистом: <плейлист>.profile.json
+
+        related — профили предыдущих операций (summary()), например загрузки
+        и перемешивания в редакторе перед сохранением.
+        """
+        if not self.enabled:
+            return None
+        path = f"{playlist_path}.profile.json"
+        data = self.summary()
+        if related:
+            data["related"] = list(related)
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"[WARNING] Не удалось сохранить профиль {path}: {e}")
+            return None
+        print(f"[DEBUG] Профиль сохранен: {path}")
+        return path
@@ -0,0 +1,284 @@
+import math
+import os
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+
+# Видео-расширения из общего списка медиафайлов
+VIDEO_EXTENSIONS = {
+    '.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.ts', '.m2ts', '.3gp', '.vob', '.ogv'
+}
+
+# Битовые флаги трека в TrackTable.flags
+FLAG_DURATION = 0x01  # Длительность известна
+FLAG_VIDEO = 0x02     # Видеофайл
+
+
+def split_path(path):
+    """Делит путь на папку (с разделителем на конце) и имя файла; склейка дает исходную строку"""
+    cut = max(path.rfind('/'), path.rfind('\\')) + 1
+    return path[:cut], path[cut:]
+
+
+class TrackTable:
+    """Компактная таблица треков на параллельных массивах.
+
+    Папки хранятся один раз (интернированные префиксы), у трека — номер папки,
+    имя файла (UTF-8 в общем буфере), размер, длительность и флаги. Перемешивание
+    и запись работают с целочисленными индексами строк, полный путь собирается
+    только при выводе.
+    """
+
+    # surrogatepass сохраняет недекодируемые байты имен (surrogateescape) без потерь
+    _ENCODING = ('utf-8', 'surrogatepass')
+
+    def __init__(self):
+        self.dirs = []
+        self._dir_ids = {}
+        self.dir_ids = array('I')
+        self.name_data = bytearray()
+        self.name_offsets = array('Q', [0])
+        self.sizes = array('q')
+        self.durations = array('d')
+        self.flags = bytearray()
+        self.total_size = 0
+        # Сколько треков с известной длительностью: без них запись обходится без длительностей
+        self.duration_count = 0
+
+    @classmethod
+    def from_records(cls, records):
+        """Строит таблицу из TrackRecord (или кортежей путь, размер, mtime, длительность)"""
+        table = cls()
+        for record in records:
+            table.append(record[0], record[1], record[3])
+        return table
+
+    def __len__(self):
+        return len(self.dir_ids)
+
+    def append(self, path, size=0, duration=None):
+        """Добавляет трек и возвращает его индекс"""
+        prefix, name = split_path(path)
+        dir_id = self._dir_ids.get(prefix)
+        if dir_id is None:
+            dir_id = len(self.dirs)
+            self._dir_ids[prefix] = dir_id
+            self.dirs.append(sys.intern(prefix))
+
+        flags = 0
+        if duration is not None:
+            flags |= FLAG_DURATION
+            self.duration_count += 1
+        if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS:
+            flags |= FLAG_VIDEO
+
+        self.dir_ids.append(dir_id)
+        self.name_data += name.encode(*self._ENCODING)
+        self.name_offsets.append(len(self.name_data))
+        self.sizes.append(size)
+        self.durations.append(duration if duration is not None else math.nan)
+        self.flags.append(flags)
+        self.total_size += size
+        return len(self.dir_ids) - 1
+
+    def path(self, index):
+        return self.dirs[self.dir_ids[index]] + self.name(index)
+
+    def name(self, index):
+        start, end = self.name_offsets[index], self.name_offsets[index + 1]
+        return self.name_data[start:end].decode(*self._ENCODING)
+
+    def duration(self, index):
+        """Длительность в секундах или None, если неизвестна"""
+        if self.flags[index] & FLAG_DURATION:
+            return self.durations[index]
+        return None
+
+    def is_video(self, index):
+        return bool(self.flags[index] & FLAG_VIDEO)
+
+    def paths(self, order=None):
+        """Генератор полных путей в порядке order (по умолчанию — порядок добавления)"""
+        if order is None:
+            order = range(len(self))
+        for index in order:
+            yield self.dirs[self.dir_ids[index]] + self.name(index)
+
+    def track_durations(self, order=None):
+        """Генератор длительностей (секунды или None) в порядке order — пара к paths()"""
+        if order is None:
+            order = range(len(self))
+        durations, flags = self.durations, self.flags
+        for index in order:
+            yield durations[index] if flags[index] & FLAG_DURATION else None
+
+    def sort_key(self, index):
+        """Ключ сортировки генератора: сначала ASCII символы, затем A-Z.
+
+        Одинаковые имена из разных папок упорядочены по папке, а не по порядку
+        обхода диска — так редактор восстанавливает тот же порядок по путям.
+        """
+        name = self.name(index)
+        return (not name[0].isalpha(), name.lower(), self.dirs[self.dir_ids[index]])
+
+    def sorted_order(self):
+        """Индексы строк в порядке сортировки генератора"""
+        return array('I', sorted(range(len(self)), key=self.sort_key))
+
+
+# Нет значения (ключ отсутствует)
+_MISSING = object()
+# Имя совпадает с именем файла из пути / оригинальный путь совпадает с путем
+_SAME = object()
+
+# Логические поля записи редактора: каждое занимает 2 бита (есть ключ, значение)
+_FLAG_KEYS = (
+    "was_modified", "was_moved", "was_name_modified", "was_restored", "was_added", "found",
+    "added", "modified", "moved", "name_modified", "restored"
+)
+_FLAG_BITS = {key: 2 * bit for bit, key in enumerate(_FLAG_KEYS)}
+_CORE_KEYS = ("path", "name", "num", "source", "original_path", "track_id")
+
+
+class TrackEntry(MutableMapping):
+    """Запись трека редактора с интерфейсом словаря, но на __slots__.
+
+    Путь хранится как интернированная папка + имя файла, name и original_path
+    не занимают памяти, пока совпадают с путем, логические поля упакованы в
+    битовое поле. Редкие ключи уходят в небольшой словарь _extra.
+    """
+
+    __slots__ = ("_dir", "_file", "_name", "_original", "_num", "_source", "_track_id", "_flags", "_extra")
+
+    def __init__(self, data=None, **kwargs):
+        self._dir = ""
+        self._file = ""
+        self._name = _MISSING
+        self._original = _MISSING
+        self._num = _MISSING
+        self._source = _MISSING
+        self._track_id = _MISSING
+        self._flags = 0
+        self._extra = None
+        if data is not None:
+            if "path" in data:
+                self["path"] = data["path"]  # Путь первым: от него зависят name и original_path
+            self.update(data)
+        self.update(kwargs)
+
+    def __getitem__(self, key):
+        if key == "path":
+            return self._dir + self._file
+        if key == "name":
+            value = self._file if self._name is _SAME else self._name
+        elif key == "original_path":
+            value = self._dir + self._file if self._original is _SAME else self._original
+        elif key == "num":
+            value = self._num
+        elif key == "source":
+            value = self._source
+        elif key == "track_id":
+            value = self._track_id
+        elif key in _FLAG_BITS and self._flags >> _FLAG_BITS[key] & 1:
+            return bool(self._flags >> _FLAG_BITS[key] & 2)
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        else:
+            raise KeyError(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key == "path":
+            # name и original_path, привязанные к старому пути, фиксируем строками
+            old_path = self._dir + self._file
+            if self._name is _SAME:
+                self._name = self._file
+            if self._original is _SAME:
+                self._original = old_path
+            prefix, self._file = split_path(value)
+            self._dir = sys.intern(prefix)
+            if self._name == self._file:
+                self._name = _SAME
+            if self._original == value:
+                self._original = _SAME
+        elif key == "name":
+            self._name = _SAME if value == self._file and isinstance(value, str) else value
+        elif key == "original_path":
+            self._original = _SAME if value == self._dir + self._file and isinstance(value, str) else value
+        elif key == "num":
+            self._num = value
+        elif key == "source":
+            self._source = sys.intern(value) if isinstance(value, str) else value
+        elif key == "track_id":
+            self._track_id = value
+        elif key in _FLAG_BITS and isinstance(value, bool):
+            shift = _FLAG_BITS[key]
+            self._flags = self._flags & ~(3 << shift) | (1 | 2 * value) << shift
+            if self._extra is not None:
+                self._extra.pop(key, None)
+        else:
+            if key in _FLAG_BITS:
+                self._flags &= ~(3 << _FLAG_BITS[key])
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key == "path":
+            raise KeyError("path is required")
+        if key == "name":
+            self._name = _MISSING
+        elif key == "original_path":
+            self._original = _MISSING
+        elif key == "num":
+            self._num = _MISSING
+        elif key == "source":
+            self._source = _MISSING
+        elif key == "track_id":
+            self._track_id = _MISSING
+        elif key in _FLAG_BITS and self._flags >> _FLAG_BITS[key] & 1:
+            self._flags &= ~(3 << _FLAG_BITS[key])
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        yield "path"
+        for key in _CORE_KEYS[1:]:
+            if key in self:
+                yield key
+        for key in _FLAG_KEYS:
+            if self._flags >> _FLAG_BITS[key] & 1:
+                yield key
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"TrackEntry({dict(self)!r})"
+
+    def __reduce__(self):
+        # Метки _MISSING и _SAME — объекты этого процесса: pickle и deepcopy идут через словарь
+        return TrackEntry, (dict(self),)
+
+    def copy(self):
+        """Поверхностная копия, как dict.copy()"""
+        clone = TrackEntry.__new__(TrackEntry)
+        for slot in TrackEntry.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        if self._extra is not None:
+            clone._extra = dict(self._extra)
+        return clone
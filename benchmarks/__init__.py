@@ -0,0 +1 @@
+"""Бенчмарки Playlist Generator (запуск: python -m benchmarks.<имя>)"""
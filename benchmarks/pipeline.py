@@ -0,0 +1,258 @@
+"""Время этапов генерации и редактора на синтетической медиатеке, результат — JSON.
+
+    python -m benchmarks.pipeline --files 20000 --output run.json
+    python -m benchmarks.pipeline --files 20000 --compare run.json
+
+Этапы окна генератора замеряются через модули, которым оно их поручает:
+сканирование (get_audio_files/get_track_table) и time_count — LibraryScanner,
+сиды — SeedEngine, перемешивание и реверс — ShuffleEngine (через
+PlaylistCore.plan_playlist), запись (write_plan) — PlaylistWriter, разбор
+плейлистов load_playlist — PlaylistReader. Каждый этап повторяется --repeat раз, в JSON — лучшее и
+медианное время в секундах.
+"""
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_library import EXTENSIONS, build_library
+from DurationCache import DurationCache
+from LibraryIndex import LibraryIndex
+from LibraryScanner import LibraryScanner
+from PlaylistReader import read_playlist
+from PlaylistWriter import PLAYLIST_FORMATS, format_duration, write_playlist
+from SeedEngine import date_seed_value, factorial_digits, format_seed, shadow_seed_value
+from ShuffleEngine import (
+    LEGACY, SWAP_BATCH, SWAP_COMPAT, apply_permutation, available_algorithms, reverse_blocks, shuffle_permutation
+)
+from TrackTable import TrackTable
+
+
+def timed(function, repeat):
+    """Запускает function repeat раз; (лучшее, медиана, последний результат)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - started)
+    return min(times), statistics.median(times), result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PipelineBenchmark:
+    """Прогон всех этапов на одной синтетической медиатеке"""
+
+    def __init__(self, workdir, files, repeat, seed_length_limit):
+        self.workdir = workdir
+        self.library = os.path.join(workdir, "library")
+        self.playlists = os.path.join(workdir, "playlists")
+        self.files = files
+        self.repeat = repeat
+        self.seed_length_limit = seed_length_limit
+        self.results = {}
+        self.date = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+    def record(self, stage, best, median, **extra):
+        self.results[stage] = {"best": round(best, 6), "median": round(median, 6), **extra}
+
+    def scanner(self, name):
+        return LibraryScanner(
+            LibraryIndex(os.path.join(self.workdir, f"{name}_index.db")),
+            DurationCache(os.path.join(self.workdir, f"{name}_durations.db"))
+        )
+
+    def run(self):
+        started = time.perf_counter()
+        size = build_library(self.library, self.files)
+        self.record("build_library", time.perf_counter() - started, time.perf_counter() - started, bytes=size)
+        os.makedirs(self.playlists, exist_ok=True)
+
+        table = self.bench_scan()
+        self.bench_time_count()
+        seed = self.bench_seed(table)
+        order = table.sorted_order()
+        permutation = self.bench_shuffle(seed, len(table))
+        paths = self.bench_reverse(table, order, permutation)
+        written = self.bench_write(paths, seed, len(table))
+        self.bench_read(written)
+        return self.results
+
+    def bench_scan(self):
+        # Холодный проход — новый индекс каждый раз, теплый — тот же индекс без изменений на диске
+        counter = iter(range(self.repeat + 1))
+        best, median, table = timed(
+            lambda: TrackTable.from_records(self.scanner(f"cold{next(counter)}").scan([self.library])), self.repeat
+        )
+        self.record("scan_cold", best, median, tracks=len(table))
+        warm = self.scanner("warm")
+        list(warm.scan([self.library]))
+        best, median, table = timed(lambda: TrackTable.from_records(warm.scan([self.library])), self.repeat)
+        self.record("scan_warm", best, median, tracks=len(table))
+        return table
+
+    def bench_time_count(self):
+        if importlib.util.find_spec("mutagen") is None:
+            self.results["time_count_cold"] = self.results["time_count_warm"] = {"skipped": "mutagen is not installed"}
+            return
+
+        def time_count(scanner):
+            return sum(record.duration or 0 for record in scanner.scan([self.library], with_durations=True))
+
+        counter = iter(range(self.repeat + 1))
+        best, median, total = timed(lambda: time_count(self.scanner(f"probe{next(counter)}")), self.repeat)
+        self.record("time_count_cold", best, median, duration=format_duration(total))
+        warm = self.scanner("probe_warm")
+        time_count(warm)
+        best, median, total = timed(lambda: time_count(warm), self.repeat)
+        self.record("time_count_warm", best, median, duration=format_duration(total))
+
+    def bench_seed(self, table):
+        num_tracks = len(table)
+
+        def main_seed():
+            value = date_seed_value(num_tracks, self.date, table.total_size)
+            return format_seed(value, num_tracks, True)
+
+        best, median, seed = timed(main_seed, self.repeat)
+        self.record("generate_seed", best, median, digits=factorial_digits(num_tracks))
+        best, median, _ = timed(
+            lambda: format_seed(date_seed_value(num_tracks, self.date, table.total_size), num_tracks, False),
+            self.repeat
+        )
+        self.record("generate_seed_hex", best, median)
+        seed_trimmed = seed.lstrip('0') or '0'
+        if len(seed_trimmed) <= self.seed_length_limit:
+            rng = random.Random(0)
+            best, median, _ = timed(lambda: shadow_seed_value(num_tracks, seed_trimmed, rng), self.repeat)
+            self.record("shadow_seed", best, median)
+        else:
+            self.results["shadow_seed"] = {"skipped": f"seed longer than {self.seed_length_limit} digits"}
+        return seed_trimmed
+
+    def bench_shuffle(self, seed, num_tracks):
+        permutation = None
+        for algorithm in available_algorithms():
+            modes = [(0, SWAP_COMPAT), (1, SWAP_COMPAT), (1, SWAP_BATCH)] if algorithm == LEGACY else [(0, SWAP_COMPAT)]
+            for intensity, swap_mode in modes:
+                stage = f"shuffle_{algorithm}" + (f"_swaps_{swap_mode}" if intensity else "")
+                best, median, result = timed(
+                    lambda: shuffle_permutation(seed, num_tracks, algorithm, intensity, swap_mode, random.Random(0)),
+                    self.repeat
+                )
+                self.record(stage, best, median, swaps=result[1])
+                if algorithm == LEGACY and not intensity:
+                    permutation = result[0]
+        return permutation
+
+    def bench_reverse(self, table, order, permutation):
+        best, median, reversed_permutation = timed(lambda: reverse_blocks(permutation, 7), self.repeat)
+        self.record("reverse_step", best, median)
+        best, median, shuffled = timed(lambda: apply_permutation(order, reversed_permutation), self.repeat)
+        self.record("apply_permutation", best, median)
+        best, median, paths = timed(lambda: list(table.paths(shuffled)), self.repeat)
+        self.record("table_paths", best, median)
+        return paths
+
+    def bench_write(self, paths, seed, num_tracks):
+        written = {}
+        for playlist_format in PLAYLIST_FORMATS:
+            extension = "xspf" if playlist_format == "xspf+url" else playlist_format
+            name = f"bench_{playlist_format.replace('+', '_')}"
+            path = os.path.join(self.playlists, f"{name}.{extension}")
+            best, median, _ = timed(
+                lambda: write_playlist(
+                    path, paths, name, seed, None, num_tracks, self.date,
+                    reverse_step=7, num_swaps=0, playlist_format=playlist_format, algorithm=LEGACY,
+                    duration="01:00:00.00"
+                ),
+                self.repeat
+            )
+            self.record(f"write_{playlist_format}", best, median, bytes=os.path.getsize(path))
+            written[playlist_format] = path
+        return written
+
+    def bench_read(self, written):
+        for playlist_format, path in written.items():
+            best, median, tracks = timed(lambda: read_playlist(path, "original_temp_list_1"), self.repeat)
+            self.record(f"read_{playlist_format}", best, median, tracks=len(tracks) if tracks is not None else None)
+
+
+def compare(results, baseline):
+    """Печатает отношение лучшего времени к базовому прогону (меньше 1 — быстрее)"""
+    print(f"{'этап':<32}{'база, с':>12}{'сейчас, с':>12}{'отношение':>12}")
+    for stage, current in results.items():
+        previous = baseline.get(stage, {})
+        if "best" not in current or "best" not in previous:
+            continue
+        ratio = current["best"] / previous["best"] if previous["best"] else float("inf")
+        print(f"{stage:<32}{previous['best']:>12.4f}{current['best']:>12.4f}{ratio:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000, help="число файлов синтетической медиатеки")
+    parser.add_argument("--repeat", type=int, default=3, help="повторов каждого этапа")
+    parser.add_argument("--seed-limit", type=int, default=200_000,
+                        help="теневой сид не замеряется для сидов длиннее (цифр)")
+    parser.add_argument("--workdir", default=None, help="рабочая папка (по умолчанию — временная, удаляется)")
+    parser.add_argument("--output", default=None, help="файл для JSON (по умолчанию — stdout)")
+    parser.add_argument("--compare", default=None, help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="playlist_bench_")
+    try:
+        benchmark = PipelineBenchmark(workdir, args.files, max(1, args.repeat), args.seed_limit)
+        # Отладочный вывод этапов не мешает замерам и JSON в stdout
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = benchmark.run()
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "files": args.files,
+            "extensions": list(EXTENSIONS),
+            "repeat": args.repeat,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f)["results"])
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
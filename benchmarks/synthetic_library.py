@@ -0,0 +1,119 @@
+"""Синтетическая медиатека: дерево папок с крошечными, но валидными MP3/FLAC/WAV.
+
+    python -m benchmarks.synthetic_library /tmp/library --files 10000 --depth 3
+
+Длительность в заголовках — от 2 до 6 минут (детерминированно по номеру файла),
+сами файлы занимают от сотен байт до пары килобайт.
+"""
+import argparse
+import os
+import struct
+
+
+EXTENSIONS = ("mp3", "flac", "wav")
+
+# MPEG-1 Layer III, 128 кбит/с, 44100 Гц, стерео, без CRC
+_MP3_HEADER = b"\xff\xfb\x90\x64"
+_MP3_FRAME_SIZE = 417
+_MP3_SAMPLES = 1152
+_MP3_SIDE_INFO = 32
+
+_SAMPLE_RATE = 44100
+# WAV пишется с настоящими отсчетами: 8 кГц, 8 бит, моно — четверть секунды
+_WAV_RATE = 8000
+_WAV_SECONDS = 0.25
+
+
+def track_seconds(index):
+    """Длительность трека для заголовков: 120-359 с"""
+    return 120 + index * 7919 % 240
+
+
+def mp3_bytes(seconds):
+    """Первый кадр с заголовком Xing (число кадров задает длительность) и один пустой кадр"""
+    frames = int(seconds * _SAMPLE_RATE / _MP3_SAMPLES)
+    xing = b"Xing" + struct.pack(">II", 0x0001, frames)
+    first = _MP3_HEADER + bytes(_MP3_SIDE_INFO) + xing
+    first += bytes(_MP3_FRAME_SIZE - len(first))
+    second = _MP3_HEADER + bytes(_MP3_FRAME_SIZE - 4)
+    return first + second
+
+
+def flac_bytes(seconds):
+    """Сигнатура fLaC и блок STREAMINFO: длительность = число отсчетов / частота"""
+    total_samples = int(seconds * _SAMPLE_RATE)
+    # Частота (20 бит), каналы - 1 (3 бита), бит на отсчет - 1 (5 бит), число отсчетов (36 бит)
+    packed = (_SAMPLE_RATE << 44) | (1 << 41) | (15 << 36) | total_samples
+    streaminfo = struct.pack(">HH", 4096, 4096) + bytes(6) + packed.to_bytes(8, 'big') + bytes(16)
+    block_header = bytes([0x80]) + len(streaminfo).to_bytes(3, 'big')
+    return b"fLaC" + block_header + streaminfo
+
+
+def wav_bytes():
+    """RIFF/WAVE с PCM-отсчетами тишины"""
+    data = bytes([128]) * int(_WAV_RATE * _WAV_SECONDS)
+    fmt = struct.pack("<HHIIHH", 1, 1, _WAV_RATE, _WAV_RATE, 1, 8)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def file_bytes(extension, index):
+    if extension == "mp3":
+        return mp3_bytes(track_seconds(index))
+    if extension == "flac":
+        return flac_bytes(track_seconds(index))
+    if extension == "wav":
+        return wav_bytes()
+    # Прочие расширения — пустые файлы: сканер смотрит только на имя
+    return b""
+
+
+def library_paths(root, num_files, depth=2, fanout=10, files_per_dir=12, extensions=EXTENSIONS):
+    """Пути синтетической медиатеки: depth уровней папок по fanout в каждой"""
+    for index in range(num_files):
+        folder = index // files_per_dir
+        parts = []
+        for level in range(depth):
+            parts.append(f"Level{level} {folder % fanout:03d}")
+            folder //= fanout
+        # Номер папки, не уместившийся в fanout^depth, уходит в имя верхнего уровня
+        if folder and parts:
+            parts[-1] += f" {folder}"
+        extension = extensions[index % len(extensions)]
+        name = f"{index % files_per_dir:02d} - Track {index:07d}.{extension}"
+        yield index, os.path.join(root, *reversed(parts), name)
+
+
+def build_library(root, num_files, depth=2, fanout=10, files_per_dir=12, extensions=EXTENSIONS):
+    """Создает медиатеку в root и возвращает число записанных байт"""
+    total = 0
+    created = set()
+    for index, path in library_paths(root, num_files, depth, fanout, files_per_dir, extensions):
+        folder = os.path.dirname(path)
+        if folder not in created:
+            os.makedirs(folder, exist_ok=True)
+            created.add(folder)
+        data = file_bytes(os.path.splitext(path)[1][1:].lower(), index)
+        with open(path, 'wb') as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root", help="папка для медиатеки")
+    parser.add_argument("--files", type=int, default=1000, help="число файлов")
+    parser.add_argument("--depth", type=int, default=2, help="уровней вложенности папок")
+    parser.add_argument("--fanout", type=int, default=10, help="подпапок на уровень")
+    parser.add_argument("--files-per-dir", type=int, default=12, help="файлов в одной папке")
+    parser.add_argument("--extensions", default=",".join(EXTENSIONS), help="расширения через запятую")
+    args = parser.parse_args()
+
+    extensions = tuple(ext.strip().lstrip('.') for ext in args.extensions.split(",") if ext.strip())
+    total = build_library(args.root, args.files, args.depth, args.fanout, args.files_per_dir, extensions)
+    print(f"Файлов: {args.files}, байт: {total}")
+
+
+if __name__ == "__main__":
+    main()
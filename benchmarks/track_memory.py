@@ -0,0 +1,86 @@
+"""Память на один трек: списки строк и словари против TrackTable и TrackEntry.
+
+    python -m benchmarks.track_memory --tracks 200000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TrackTable import TrackEntry, TrackTable
+
+
+def synthetic_paths(num_tracks, files_per_dir=12):
+    """Пути вида /music/Artist NNN/Album N/NN - Track NNNNNN.flac"""
+    for i in range(num_tracks):
+        album = i // files_per_dir
+        folder = f"/music/Artist {album // 10:04d}/Album {album % 10}"
+        yield os.path.join(folder, f"{i % files_per_dir:02d} - Track {i:06d}.flac")
+
+
+def measure(build, num_tracks):
+    """Возвращает число байт на трек для структуры, построенной build(paths)"""
+    gc.collect()
+    tracemalloc.start()
+    data = build(synthetic_paths(num_tracks))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current / num_tracks
+
+
+def build_path_list(paths):
+    # Генератор до TrackTable: список полных путей
+    return list(paths)
+
+
+def build_track_table(paths):
+    table = TrackTable()
+    for path in paths:
+        table.append(path, 4_000_000, 215.5)
+    return table
+
+
+def editor_record(path, num):
+    return {
+        "path": path,
+        "name": os.path.basename(path),
+        "num": num,
+        "source": "original_temp_list_0",
+        "original_path": path,
+        "was_modified": False,
+        "track_id": None
+    }
+
+
+def build_dict_records(paths):
+    # Редактор до TrackEntry: словарь на трек
+    return [editor_record(path, num) for num, path in enumerate(paths, 1)]
+
+
+def build_track_entries(paths):
+    return [TrackEntry(editor_record(path, num)) for num, path in enumerate(paths, 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=200_000, help="число синтетических треков")
+    args = parser.parse_args()
+
+    print(f"Треков: {args.tracks}")
+    rows = [
+        ("Генератор: list[str]", build_path_list),
+        ("Генератор: TrackTable", build_track_table),
+        ("Редактор: list[dict]", build_dict_records),
+        ("Редактор: list[TrackEntry]", build_track_entries),
+    ]
+    for title, build in rows:
+        per_track = measure(build, args.tracks)
+        print(f"{title:<28} {per_track:8.1f} байт/трек  ~{per_track * 1_000_000 / 2**20:8.1f} МиБ на 1M треков")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Скорость записи плейлистов каждого формата на синтетических путях, результат — JSON.
+
+    python -m benchmarks.writer --tracks 1000000 --output writer.json
+    python -m benchmarks.writer --tracks 1000000 --compare writer.json
+
+Пути строятся как у synthetic_library (файлы на диск не пишутся), порядок
+перемешан, запись — через PlaylistWriter.write_playlist в файлы во временной
+папке. В JSON — лучшее и медианное время в секундах, треков в секунду и
+размер файла. write_together — все форматы за один проход write_playlists
+(из форматов, пишущих один файл, берется первый); рядом — сумма отдельных
+записей и самая медленная из них. --durations добавляет длительности треков
+(как в заголовках synthetic_library), --relative пишет пути относительно
+корня синтетической медиатеки.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.pipeline import compare, git_commit, timed
+from benchmarks.synthetic_library import library_paths, track_seconds
+from PlaylistWriter import (
+    DURABILITY_FILE, DURABILITY_LEVELS, PLAYLIST_BACKENDS, PLAYLIST_FORMATS, playlist_extension, write_playlist,
+    write_playlists
+)
+from ShuffleEngine import LEGACY
+
+LIBRARY_ROOT = os.path.join(os.sep, "media", "library")
+
+
+def bench_formats(paths, formats, workdir, repeat, durability, durations, relative_to):
+    date = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    results = {}
+    for playlist_format in formats:
+        name = f"bench_{playlist_format.replace('+', '_')}"
+        path = playlist_extension(os.path.join(workdir, f"{name}.{playlist_format}"), playlist_format)
+        best, median, _ = timed(
+            lambda: write_playlist(
+                path, paths, name, "1234567890", None, len(paths), date,
+                reverse_step=7, num_swaps=0, playlist_format=playlist_format, algorithm=LEGACY,
+                duration="01:00:00.00", durability=durability, durations=durations, relative_to=relative_to
+            ),
+            repeat
+        )
+        results[f"write_{playlist_format}"] = {
+            "best": round(best, 6),
+            "median": round(median, 6),
+            "tracks_per_second": round(len(paths) / best) if best else None,
+            "bytes": os.path.getsize(path),
+        }
+        os.remove(path)
+    return results
+
+
+def bench_together(paths, formats, workdir, repeat, durability, durations, relative_to, separate):
+    # Из форматов, пишущих один файл (xspf и xspf+url), остается первый
+    together = list({PLAYLIST_BACKENDS[name].extension: name for name in reversed(formats)}.values())[::-1]
+    if len(together) < 2:
+        return {}
+    date = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    best, median, written = timed(
+        lambda: write_playlists(
+            os.path.join(workdir, "bench_together"), paths, "bench_together", "1234567890", None, len(paths), date,
+            reverse_step=7, num_swaps=0, playlist_formats=together, algorithm=LEGACY, duration="01:00:00.00",
+            durability=durability, durations=durations, relative_to=relative_to
+        ),
+        repeat
+    )
+    for path in written:
+        os.remove(path)
+    singles = [separate[f"write_{name}"]["best"] for name in together]
+    return {"write_together": {
+        "best": round(best, 6),
+        "median": round(median, 6),
+        "formats": together,
+        "separate_sum": round(sum(singles), 6),
+        "slowest_single": round(max(singles), 6),
+    }}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tracks", type=int, default=1_000_000, help="треков в плейлисте")
+    parser.add_argument("--formats", default=",".join(PLAYLIST_FORMATS), help="форматы через запятую")
+    parser.add_argument("--repeat", type=int, default=1, help="повторов каждого формата")
+    parser.add_argument("--durability", default=DURABILITY_FILE, choices=DURABILITY_LEVELS,
+                        help="уровень fsync атомарной записи")
+    parser.add_argument("--durations", action="store_true", help="писать длительности треков")
+    parser.add_argument("--relative", action="store_true", help="пути относительно корня медиатеки")
+    parser.add_argument("--workdir", default=None, help="папка для плейлистов (по умолчанию — временная)")
+    parser.add_argument("--output", default=None, help="файл для JSON (по умолчанию — stdout)")
+    parser.add_argument("--compare", default=None, help="JSON прошлого прогона для сравнения")
+    args = parser.parse_args()
+
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    unknown = [name for name in formats if name not in PLAYLIST_FORMATS]
+    if unknown:
+        parser.error(f"неизвестные форматы: {', '.join(unknown)}")
+
+    # Путь с глубиной 3 и библиотечным корнем — типичные 70-80 байт
+    tracks = list(library_paths(LIBRARY_ROOT, args.tracks, depth=3))
+    random.Random(0).shuffle(tracks)
+    paths = [path for _, path in tracks]
+    durations = [float(track_seconds(index)) for index, _ in tracks] if args.durations else None
+    del tracks
+    relative_to = LIBRARY_ROOT if args.relative else None
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="playlist_writer_bench_")
+    try:
+        # Отладочные сообщения записи не мешают JSON в stdout
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            repeat = max(1, args.repeat)
+            results = bench_formats(paths, formats, workdir, repeat, args.durability, durations, relative_to)
+            results.update(
+                bench_together(paths, formats, workdir, repeat, args.durability, durations, relative_to, results)
+            )
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tracks": args.tracks,
+            "repeat": args.repeat,
+            "durability": args.durability,
+            "durations": args.durations,
+            "relative": args.relative,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f)["results"])
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from CacheDir import APP_FOLDER, cache_path
+from DurationCache import DurationCache
+from LibraryIndex import LibraryIndex
+
+
+@unittest.skipIf(sys.platform in ("win32", "darwin"), "XDG_CACHE_HOME is used on Linux only")
+class CachePathTest(unittest.TestCase):
+    """Базы индекса и длительностей по умолчанию лежат в каталоге кэша пользователя, а не в текущей папке"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        self.work = os.path.join(self.folder.name, "work")
+        os.mkdir(self.work)
+        os.chdir(self.work)
+        self.env = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": os.path.join(self.folder.name, "cache")})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        os.chdir(self.cwd)
+        self.folder.cleanup()
+
+    def test_default_databases(self):
+        expected = os.path.join(self.folder.name, "cache", APP_FOLDER)
+        self.assertEqual(LibraryIndex().db_path, os.path.join(expected, "library_index.db"))
+        self.assertEqual(DurationCache().db_path, os.path.join(expected, "duration_cache.db"))
+        self.assertEqual(sorted(os.listdir(expected)), ["duration_cache.db", "library_index.db"])
+        self.assertEqual(os.listdir(self.work), [])
+
+    def test_unwritable_cache_falls_back_to_cwd(self):
+        with mock.patch("os.makedirs", side_effect=PermissionError("denied")), \
+                mock.patch("sys.stdout"):
+            self.assertEqual(cache_path("library_index.db"), "library_index.db")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from DurationCache import DurationCache
+from LibraryIndex import LibraryIndex
+from LibraryScanner import LibraryScanner
+from tests.test_metadata_probe import mutagen, wav_bytes
+
+
+@unittest.skipIf(mutagen is None, "mutagen is not installed")
+class RewrittenFileTest(unittest.TestCase):
+    """Файл перекодирован на месте: mtime папки тот же, длительность должна обновиться"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.library = os.path.join(self.folder.name, "library")
+        os.mkdir(self.library)
+        self.path = os.path.join(self.library, "track.wav")
+        self.write(0.5)
+        self.scanner = LibraryScanner(
+            LibraryIndex(os.path.join(self.folder.name, "index.db")),
+            DurationCache(os.path.join(self.folder.name, "durations.db")),
+            probe_workers=1,
+            probe_executor="thread"
+        )
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, seconds):
+        folder_stat = os.stat(self.library)
+        with open(self.path, 'wb') as f:
+            f.write(wav_bytes(seconds))
+        os.utime(self.library, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+
+    def durations(self, probe=True):
+        return [record.duration for record in self.scanner.scan([self.library], with_durations=True, probe=probe)]
+
+    def test_duration_follows_file(self):
+        self.assertAlmostEqual(self.durations()[0], 0.5, places=3)
+        self.write(1.0)
+        self.assertAlmostEqual(self.durations()[0], 1.0, places=3)
+
+    def test_cache_only_scan_skips_stale_entry(self):
+        self.durations()
+        self.write(1.0)
+        self.assertEqual(self.durations(probe=False), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
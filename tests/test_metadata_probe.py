@@ -0,0 +1,55 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from MetadataProbe import probe_duration, probe_durations
+
+try:
+    import mutagen
+except ImportError:
+    mutagen = None
+
+
+def wav_bytes(seconds, rate=8000):
+    """RIFF/WAVE без тегов: 8 бит, моно, тишина"""
+    data = bytes([128]) * int(rate * seconds)
+    fmt = struct.pack("<HHIIHH", 1, 1, rate, rate, 1, 8)
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@unittest.skipIf(mutagen is None, "mutagen is not installed")
+class ProbeUntaggedTest(unittest.TestCase):
+    """Файл без тегов mutagen возвращает пустым (ложным) объектом — длительность терять нельзя"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "untagged.wav")
+        with open(self.path, 'wb') as f:
+            f.write(wav_bytes(0.5))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_untagged_file_is_falsy_for_mutagen(self):
+        self.assertFalse(mutagen.File(self.path))
+
+    def test_probe_duration(self):
+        self.assertAlmostEqual(probe_duration(self.path), 0.5, places=3)
+
+    def test_probe_durations(self):
+        durations, total = probe_durations([self.path], workers=1)
+        self.assertEqual(len(durations), 1)
+        self.assertAlmostEqual(durations[0], 0.5, places=3)
+        self.assertAlmostEqual(total, 0.5, places=3)
+
+    def test_unreadable_file(self):
+        path = os.path.join(self.folder.name, "broken.mp3")
+        with open(path, 'wb') as f:
+            f.write(b"not audio")
+        self.assertIsNone(probe_duration(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
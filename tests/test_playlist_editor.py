@@ -0,0 +1,82 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+try:
+    with contextlib.redirect_stdout(io.StringIO()):
+        import PlaylistEditor
+except (ImportError, SyntaxError):
+    # Без tkinter (или на Python старше 3.12) редактор не импортируется
+    PlaylistEditor = None
+
+from StageProfiler import StageProfiler
+
+
+class Widget:
+    """Заглушка виджета: пустое выделение, имя плейлиста, строка сообщения"""
+
+    def __init__(self, text=""):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+    def selection(self):
+        return ()
+
+    def config(self, **options):
+        self.text = options.get("text", self.text)
+
+
+@unittest.skipIf(PlaylistEditor is None, "tkinter is not available")
+class ManualSeedTest(unittest.TestCase):
+    """Сид ручной расстановки пишется только после правок порядка"""
+
+    def setUp(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            editor = PlaylistEditor.PlaylistEditor.__new__(PlaylistEditor.PlaylistEditor)
+            editor.localization = PlaylistEditor.Localization()
+        editor.original_list = [
+            {"path": f"/music/{name}.mp3", "name": name, "num": num, "track_id": None}
+            for num, name in enumerate(("c", "a", "b"), 1)
+        ]
+        editor.display_tracks = editor.original_list.copy()
+        editor.temp_list = None
+        editor.shuffled_list = None
+        editor.manually_edited = False
+        editor.current_seed = None
+        editor.current_algorithm = None
+        editor.current_swap_mode = None
+        editor.current_swaps = None
+        editor.current_reverse_step = None
+        editor.tree = Widget()
+        editor.name_entry = Widget("list")
+        editor.seed_info = Widget()
+        editor.format_m3u8 = "m3u8"
+        editor.export_formats = []
+        editor.durability = None
+        editor.relative_paths = None
+        editor.update_display = lambda: None
+        self.editor = editor
+
+    def save(self):
+        """Сохраняет плейлист и возвращает записанный сид"""
+        with mock.patch.object(PlaylistEditor, "write_playlists", return_value=["list.m3u8"]) as write:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.editor._save_playlist(StageProfiler("save", enabled=False))
+        return write.call_args.args[3]
+
+    def test_untouched_playlist_saved_twice(self):
+        self.assertIsNone(self.save())
+        self.assertIsNone(self.save())
+
+    def test_moved_track_gets_seed(self):
+        self.editor.temp_list = [self.editor.original_list[i] for i in (1, 0, 2)]
+        self.editor.manually_edited = True
+        self.assertEqual(self.save(), self.save())
+        self.assertIsNotNone(self.editor.current_seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
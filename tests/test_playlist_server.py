@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from PlaylistServer import PlaylistService, RequestError, create_server, request_playlist
+
+
+class ServerSeedTest(unittest.TestCase):
+    """Сид из запроса уходит в заголовки ответа и в сам плейлист"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.library = os.path.join(self.folder.name, "library")
+        os.mkdir(self.library)
+        for name in ("a.mp3", "b.mp3", "c.mp3"):
+            with open(os.path.join(self.library, name), 'wb') as f:
+                f.write(b"\0" * 16)
+        self.output = os.path.join(self.folder.name, "out.m3u8")
+        self.server = create_server(port=0, workers=1)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.service.shutdown()
+        self.folder.cleanup()
+
+    def request(self, **params):
+        return request_playlist(dict(folders=[self.library], **params), self.output, port=self.port, timeout=30)
+
+    def test_control_characters_are_rejected(self):
+        for seed in ("abc\r\nX-Evil: 1", "1\n#EXTINF:0,evil", "1\u2028"):
+            with self.assertRaises(RequestError) as error:
+                self.request(seed=seed)
+            self.assertEqual(error.exception.status, 400)
+        with self.assertRaises(RequestError):
+            self.request(seed="1", name="list\r\nX-Evil: 1")
+
+    def test_field_types_are_checked(self):
+        for params in ({"algorithm": 5}, {"swap_mode": ["batch"]}, {"digits_only": 1}, {"shadow_seed": "yes"},
+                       {"intensity": True}, {"reverse_step": False}, {"intensity": "2"}):
+            with self.subTest(params=params):
+                with self.assertRaises(RequestError) as error:
+                    self.request(seed="1", **params)
+                self.assertEqual(error.exception.status, 400)
+        headers = self.request(seed="1", algorithm="exact", swap_mode=None, digits_only=False, shadow_seed=False)
+        self.assertEqual(headers["X-Seed"], "1")
+
+    def test_ascii_seed_in_header(self):
+        headers = self.request(seed="12345")
+        self.assertEqual(headers["X-Seed"], "12345")
+        self.assertNotIn("X-Evil", headers)
+
+    def test_number_seed(self):
+        self.assertEqual(self.request(seed=42)["X-Seed"], "42")
+
+    def test_unicode_seed_only_in_playlist(self):
+        headers = self.request(seed="привет")
+        self.assertNotIn("X-Seed", headers)
+        with open(self.output, encoding='utf-8') as f:
+            self.assertIn("привет", f.read())
+
+
+class ServiceQueueTest(unittest.TestCase):
+    """Запрос, не принятый остановленным пулом, не занимает место в очереди"""
+
+    def test_submit_after_shutdown(self):
+        service = PlaylistService(workers=1, max_queue=1)
+        service.shutdown()
+        with tempfile.TemporaryDirectory() as folder:
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    service.handle(None, {"folders": [folder]})
+        self.assertEqual(service.stats.snapshot()["queue_depth"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
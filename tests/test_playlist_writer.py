@@ -0,0 +1,116 @@
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from PlaylistReader import read_header
+from PlaylistWriter import PLAYLIST_FORMATS, merge_formats, write_playlist
+
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+FILES = ["/music/A & B/01 Intro.mp3", "/music/A & B/02 <Bonus> Müller.flac", "/music/video/clip #1.mp4"]
+DATE = datetime.datetime(2024, 5, 6, 7, 8, 9)
+
+# Заголовок с сидом и длительностями треков / без сида (сохранение без перемешивания)
+SCENARIOS = {
+    "shuffled": dict(
+        seed="12345", shadow_seed="678", reverse_step=2, num_swaps=1, algorithm="exact",
+        duration="00:04:02", durations=[61.5, None, 180.2]
+    ),
+    "plain": dict(seed=None, shadow_seed=None),
+}
+
+
+def golden_path(scenario, playlist_format):
+    return os.path.join(GOLDEN, f"{scenario}.{playlist_format.replace('+', '_')}")
+
+
+class GoldenFileTest(unittest.TestCase):
+    """Вывод каждого формата совпадает с эталоном в tests/golden"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_formats(self):
+        for scenario, params in SCENARIOS.items():
+            for playlist_format in PLAYLIST_FORMATS:
+                with self.subTest(scenario=scenario, playlist_format=playlist_format):
+                    path = write_playlist(
+                        os.path.join(self.folder.name, f"{scenario} list"), FILES, "Test list",
+                        num_tracks=len(FILES), date=DATE, playlist_format=playlist_format, **params
+                    )
+                    with open(path, encoding='utf-8') as f:
+                        written = f.read()
+                    with open(golden_path(scenario, playlist_format), encoding='utf-8') as f:
+                        self.assertEqual(written, f.read())
+
+
+class HeaderTest(unittest.TestCase):
+    """Алгоритм и режим перестановок читаются обратно из заголовка каждого формата"""
+
+    CASES = [
+        (dict(algorithm="feistel-v1"), {"algorithm": "feistel-v1"}),
+        (dict(algorithm="legacy", swap_mode="batch", num_swaps=3), {"swap_mode": "batch"}),
+        (dict(algorithm="legacy", swap_mode="compat", num_swaps=3), {}),
+    ]
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_round_trip(self):
+        for params, expected in self.CASES:
+            for playlist_format in PLAYLIST_FORMATS:
+                with self.subTest(params=params, playlist_format=playlist_format):
+                    path = write_playlist(
+                        os.path.join(self.folder.name, "list"), FILES, "list", "12345", None, len(FILES), DATE,
+                        playlist_format=playlist_format, **params
+                    )
+                    self.assertEqual(read_header(path), expected)
+
+
+class RelativePathsTest(unittest.TestCase):
+    """Пути относительно папки плейлиста; общий с ней только корень — путь остается абсолютным"""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.playlists = os.path.join(self.folder.name, "playlists")
+        os.mkdir(self.playlists)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_relative_paths(self):
+        root_only = os.path.join(os.path.abspath(os.sep), "elsewhere", "z.mp3")
+        files = [
+            os.path.join(self.playlists, "a.mp3"),
+            os.path.join(self.folder.name, "music", "b.mp3"),
+            root_only
+        ]
+        path = write_playlist(
+            os.path.join(self.playlists, "list"), files, "list", None, None, len(files), DATE,
+            playlist_format="txt", relative_to=True
+        )
+        with open(path, encoding='utf-8') as f:
+            written = f.read().splitlines()[-3:]
+        self.assertEqual(written, ["a.mp3", os.path.join(os.pardir, "music", "b.mp3"), root_only])
+
+
+class MergeFormatsTest(unittest.TestCase):
+    """Конфликтующий дополнительный формат отбрасывается один, остальные остаются"""
+
+    def test_conflict_keeps_other_extras(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            formats = merge_formats("xspf", ["pls", "xspf+url", "json", "unknown", "pls"])
+        self.assertEqual(formats, ["xspf", "pls", "json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
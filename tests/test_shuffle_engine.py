@@ -0,0 +1,172 @@
+import contextlib
+import hashlib
+import io
+import math
+import random
+import sys
+import unittest
+
+from LazyPermutation import FeistelPermutation
+from Permutation import big_divmod, rank_permutation, to_decimal, unrank_permutation
+from ShuffleEngine import (
+    EXACT, FEISTEL, LEGACY, apply_permutation, expand_seed, reverse_blocks, seed_to_int, shuffle_permutation
+)
+
+
+# Перемешивание и реверс в том виде, в каком они были в генераторе до ShuffleEngine
+# (soft_shuffle и apply_reverse_step): сиды старых плейлистов должны давать тот же порядок
+
+def stable_hash(s):
+    return int(hashlib.md5(str(s).encode()).hexdigest(), 16) % (10**12)
+
+
+def soft_shuffle(files, seed_value, intensity):
+    seed_hash = abs(stable_hash(str(seed_value)))
+    random.seed(seed_hash)
+    files = files.copy()
+    random.shuffle(files)
+    if intensity == 1:
+        hash_val = (seed_hash % 10_000_000_000) / 10_000_000_000
+        intensity = 0.6 + 0.4 * hash_val
+        num_swaps = min(int(len(files) * intensity * 1.07), int(len(files)))
+    else:
+        num_swaps = int(intensity)
+    for _ in range(num_swaps):
+        i, j = random.sample(range(len(files)), 2)
+        files[i], files[j] = files[j], files[i]
+    return files, num_swaps
+
+
+def apply_reverse_step(files, step):
+    reversed_files = files.copy()
+    for i in range(0, len(reversed_files), step):
+        reversed_files[i:i+step] = reversed(reversed_files[i:i+step])
+    return reversed_files
+
+
+class LegacyOrderTest(unittest.TestCase):
+    """legacy + compat повторяет прежний порядок треков и число перестановок"""
+
+    def setUp(self):
+        self.state = random.getstate()
+
+    def tearDown(self):
+        random.setstate(self.state)
+
+    def test_same_order_as_before(self):
+        for num_tracks in (2, 7, 50, 333):
+            files = [f"track {i:03}.mp3" for i in range(num_tracks)]
+            for seed in ("1", "98765", "abcdef12"):
+                for intensity in (0, 1, 3, 40):
+                    for step in (0, 2, 5, 21):
+                        with self.subTest(num_tracks=num_tracks, seed=seed, intensity=intensity, step=step):
+                            expected, expected_swaps = soft_shuffle(files, seed, intensity)
+                            if step:
+                                expected = apply_reverse_step(expected, step)
+                            with contextlib.redirect_stdout(io.StringIO()):
+                                permutation, num_swaps = shuffle_permutation(
+                                    seed, num_tracks, LEGACY, intensity, rng=random.Random()
+                                )
+                            permutation = reverse_blocks(permutation, step)
+                            self.assertEqual(list(apply_permutation(files, permutation)), expected)
+                            self.assertEqual(num_swaps, expected_swaps)
+
+
+class RankTest(unittest.TestCase):
+    """Номер перестановки в факториальной системе и обратно"""
+
+    def test_round_trip(self):
+        rng = random.Random(5)
+        for n in (1, 2, 3, 10, 33, 100, 1000, 5000):
+            permutation = list(range(n))
+            rng.shuffle(permutation)
+            with self.subTest(n=n):
+                rank = rank_permutation(permutation)
+                self.assertLess(rank, math.factorial(n))
+                self.assertEqual(list(unrank_permutation(rank, n)), permutation)
+
+    def test_rank_of_unrank(self):
+        rng = random.Random(6)
+        for n in (4, 20, 200, 1500):
+            factorial = math.factorial(n)
+            for rank in (0, 1, factorial - 1, rng.randrange(factorial)):
+                with self.subTest(n=n, rank=rank % 1000):
+                    self.assertEqual(rank_permutation(unrank_permutation(rank, n)), rank)
+
+    def test_edges_and_wrap(self):
+        n = 12
+        self.assertEqual(list(unrank_permutation(0, n)), list(range(n)))
+        self.assertEqual(list(unrank_permutation(math.factorial(n) - 1, n)), list(range(n - 1, -1, -1)))
+        self.assertEqual(list(unrank_permutation(math.factorial(n) + 7, n)), list(unrank_permutation(7, n)))
+
+    def test_exact_seed(self):
+        permutation, num_swaps = shuffle_permutation("12345", 40, EXACT)
+        self.assertEqual(list(permutation), list(unrank_permutation(12345, 40)))
+        self.assertEqual(num_swaps, 0)
+
+    def test_expand_seed(self):
+        for n in (1, 5, 50, 1500):
+            with self.subTest(n=n):
+                self.assertLess(expand_seed("7", n), math.factorial(n))
+        self.assertNotEqual(expand_seed("7", 50), expand_seed("8", 50))
+
+    def test_seed_to_int(self):
+        self.assertEqual(seed_to_int("0123"), 123)
+        self.assertEqual(seed_to_int("ff"), 255)
+        self.assertEqual(seed_to_int("²"), int.from_bytes("²".encode('utf-8'), 'big'))
+
+
+class BigArithmeticTest(unittest.TestCase):
+    """Деление и перевод в строку длинных чисел совпадают со встроенными"""
+
+    def setUp(self):
+        # Снимаем ограничение str() на длину числа только для сравнения с эталоном
+        self.max_str_digits = sys.get_int_max_str_digits()
+        sys.set_int_max_str_digits(0)
+
+    def tearDown(self):
+        sys.set_int_max_str_digits(self.max_str_digits)
+
+    def test_big_divmod(self):
+        rng = random.Random(7)
+        for a_bits, b_bits in ((100, 50), (9000, 4100), (50_000, 5000), (50_000, 20_000), (80_000, 40_001),
+                               (5000, 6000), (100_000, 1)):
+            a = rng.getrandbits(a_bits) | 1 << (a_bits - 1)
+            b = rng.getrandbits(b_bits) | 1 << (b_bits - 1)
+            with self.subTest(a_bits=a_bits, b_bits=b_bits):
+                self.assertEqual(big_divmod(a, b), divmod(a, b))
+        b = 1 << 10_000
+        self.assertEqual(big_divmod(b * 3 + 5, b), (3, 5))
+        self.assertEqual(big_divmod(b - 1, b), (0, b - 1))
+
+    def test_to_decimal(self):
+        rng = random.Random(8)
+        for bits in (10, 12_000, 13_000, 70_000):
+            value = rng.getrandbits(bits)
+            with self.subTest(bits=bits):
+                self.assertEqual(to_decimal(value), str(value))
+                self.assertEqual(to_decimal(value, len(str(value)) + 5), str(value).zfill(len(str(value)) + 5))
+        self.assertEqual(to_decimal(10 ** 5000), "1" + "0" * 5000)
+
+
+class FeistelTest(unittest.TestCase):
+    """Ленивая перестановка: биекция, index — обратная функция, реверс — как у списков"""
+
+    def test_inverse(self):
+        for size in (1, 2, 3, 17, 256, 1000):
+            for reverse_step in (None, 4):
+                with self.subTest(size=size, reverse_step=reverse_step):
+                    permutation = FeistelPermutation("seed", size, reverse_step)
+                    order = list(permutation)
+                    self.assertEqual(sorted(order), list(range(size)))
+                    for position, track in enumerate(order):
+                        self.assertEqual(permutation.index(track), position)
+
+    def test_reverse_matches_blocks(self):
+        permutation, _ = shuffle_permutation("42", 50, FEISTEL)
+        expected = apply_reverse_step(list(permutation), 7)
+        self.assertEqual(list(reverse_blocks(permutation, 7)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
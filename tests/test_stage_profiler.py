@@ -0,0 +1,75 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from StageProfiler import StageProfiler, count
+
+
+class ThreadProfilersTest(unittest.TestCase):
+    """Профайлеры в разных потоках завершаются в любом порядке и не считают чужое"""
+
+    def test_out_of_order_exit(self):
+        first = StageProfiler("first")
+        second = StageProfiler("second")
+        first_entered = threading.Event()
+        second_entered = threading.Event()
+        first_exited = threading.Event()
+
+        def run_first():
+            with first:
+                count("first")
+                first_entered.set()
+                second_entered.wait(10)
+            first_exited.set()
+
+        def run_second():
+            first_entered.wait(10)
+            with second:
+                second_entered.set()
+                first_exited.wait(10)
+                count("second")
+
+        threads = [threading.Thread(target=run_first), threading.Thread(target=run_second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        count("after")
+        self.assertEqual(first.counters.get("first"), 1)
+        self.assertEqual(second.counters.get("second"), 1)
+        self.assertNotIn("second", first.counters)
+        self.assertNotIn("after", first.counters)
+        self.assertNotIn("after", second.counters)
+
+    def test_nested_in_one_thread(self):
+        outer = StageProfiler("outer")
+        inner = StageProfiler("inner")
+        with outer:
+            with inner:
+                count("inner")
+            count("outer")
+        self.assertEqual(inner.counters, {"inner": 1})
+        self.assertEqual(outer.counters.get("outer"), 1)
+        self.assertNotIn("inner", outer.counters)
+
+
+class OpenCounterTest(unittest.TestCase):
+    """Открытия файлов считает только профайлер с count_opens, даже если хук уже стоит"""
+
+    def test_count_opens(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "a.txt")
+            counting = StageProfiler("counting")
+            quiet = StageProfiler("quiet", count_opens=False)
+            with counting:
+                open(path, 'w').close()
+            with quiet:
+                open(path).close()
+        self.assertGreaterEqual(counting.counters.get("open", 0), 1)
+        self.assertNotIn("open", quiet.counters)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import copy
+import datetime
+import pickle
+import random
+import unittest
+
+from PlaylistCore import PlaylistJob, plan_playlist, rank_order
+from ShuffleEngine import EXACT
+from TrackTable import TrackEntry, TrackTable
+
+
+class TrackEntryCopyTest(unittest.TestCase):
+    """Метки отсутствующего и совпадающего с путем значения не переживают копирование как объекты"""
+
+    def setUp(self):
+        self.entry = TrackEntry(path="/music/a.mp3", name="a.mp3", num=1, was_moved=True, rating=5)
+        self.renamed = TrackEntry(path="/music/b.mp3", name="Song", original_path="/old/b.mp3")
+
+    def check(self, clone, entry):
+        self.assertIsInstance(clone, TrackEntry)
+        self.assertEqual(dict(clone), dict(entry))
+        self.assertNotIn("source", clone)
+        clone["path"] = "/other/c.mp3"
+        self.assertEqual(clone["name"], entry["name"])
+
+    def test_deepcopy(self):
+        for entry in (self.entry, self.renamed):
+            self.check(copy.deepcopy(entry), entry)
+
+    def test_pickle(self):
+        for entry in (self.entry, self.renamed):
+            self.check(pickle.loads(pickle.dumps(entry)), entry)
+
+    def test_copy(self):
+        clone = copy.copy(self.entry)
+        clone["num"] = 2
+        self.assertEqual(self.entry["num"], 1)
+
+
+class RankOrderTest(unittest.TestCase):
+    """Сид ручной расстановки в режиме exact восстанавливает тот же порядок в генераторе"""
+
+    # Порядок обхода диска: одинаковые имена в разных папках, цифры, регистр
+    SCANNED = ["/music/b/Song.mp3", "/music/a/song.mp3", "/music/02 intro.mp3", "/music/a/Zed.flac",
+               "/music/b/_hidden.mp3", "/music/alpha.mp3", "/music/a/01.mp3", "/music/c/Song.mp3"]
+
+    def test_round_trip(self):
+        table = TrackTable()
+        for path in self.SCANNED:
+            table.append(path, 1)
+        rng = random.Random(3)
+        for _ in range(20):
+            edited = self.SCANNED.copy()
+            rng.shuffle(edited)
+            with self.subTest(edited=edited):
+                job = PlaylistJob("list", seed=rank_order(edited), algorithm=EXACT)
+                plan = plan_playlist(table, table.sorted_order(), job, datetime.datetime(2024, 5, 6))
+                self.assertEqual(list(table.paths(plan.order)), edited)
+
+    def test_sorted_order_is_zero(self):
+        table = TrackTable()
+        for path in self.SCANNED:
+            table.append(path)
+        self.assertEqual(rank_order(table.paths(table.sorted_order())), "0")
+
+
+if __name__ == "__main__":
+    unittest.main()